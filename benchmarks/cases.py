@@ -0,0 +1,184 @@
+# benchmarks/cases.py
+"""대시보드 계산 경로 벤치마크 케이스
+
+각 케이스는 준비된 데이터셋(BenchmarkData)을 받아 render_* 함수를 실행합니다.
+- 대시보드 탭 섹션(논문/특허 지표, 비교, 기술 분류): 캐시된 집계 함수만 지문 없이 호출해 계산 부분만 측정
+- 그 밖의 컴포넌트: 집계와 차트 생성이 섞여 있어 render_* 함수 전체를 실행
+  (스크립트 실행 컨텍스트 없이 실행하므로 Streamlit 출력은 버려지고 계산과 figure 생성 시간만 측정)
+
+측정하지 않는 render_* 함수:
+- productivity.render_productivity_analysis: 합성 데이터에 생산성 점수 컬럼이 없어 안내 문구만 출력
+"""
+from utils.data_loader import preprocess_data
+from utils.helpers import get_available_metrics, compute_country_means
+from utils.synthetic import generate_synthetic_data
+from components import paper_metrics, patent_metrics
+from components.tech_analysis import compute_tech_counts, compute_country_tech
+from components import (
+    bradford, citation, collaboration, country, country_citation, country_collaboration,
+    country_comparison, country_patent, country_technology, country_trends, impact, metrics,
+    patent, publication, research_front
+)
+
+# 데이터 규모별 합성 데이터 설정 (셀 수 = 국가 × 연도 × 82 × 2)
+SCALES = {
+    '10k': dict(n_rows=10_000, countries=20, years=(2021, 2023)),
+    '1M': dict(n_rows=1_000_000, countries=100, years=(2012, 2024)),
+    '10M': dict(n_rows=10_000_000, countries=200, years=(2012, 2024))
+}
+
+# 기술 분류 레벨 (82대 분류가 가장 무거움)
+TECH_COL = 'label_s'
+TITLE_COL = 'label_s_title'
+
+# 컬럼 매핑(col_mapping)을 받는 컴포넌트용 논문 컬럼 매핑 (합성 데이터 컬럼명)
+PAPER_COL_MAPPING = {
+    'total_papers': 'Total_Papers',
+    'h_index': 'H_Index',
+    'top10_ratio': 'Top10_Ratio(%)',
+    'q1_ratio': 'Q1_Ratio(%)',
+    'collaboration_ratio': 'Collaboration_Ratio(%)'
+}
+
+
+class BenchmarkData:
+    """규모 하나의 벤치마크 입력 (원본, 전처리 결과, 상위 국가)"""
+
+    def __init__(self, scale, seed=0):
+        self.scale = scale
+        self.df = generate_synthetic_data(seed=seed, **SCALES[scale])
+        self.paper_df, self.patent_df = preprocess_data(self.df)
+        self.countries = tuple(sorted(
+            self.paper_df.groupby('Country', observed=True)['Total_Papers'].sum().nlargest(20).index
+        ))
+        # 값이 있는 컬럼만 남긴 논문/특허 데이터 (전처리 결과에는 다른 종류의 빈 지표 컬럼도 있어
+        # 컬럼 이름으로 필드를 찾는 컴포넌트가 특허 데이터에서 논문 인용 컬럼을 고르지 않도록)
+        self.paper_view = self.paper_df.dropna(axis=1, how='all')
+        self.patent_view = self.patent_df.dropna(axis=1, how='all')
+
+    @property
+    def rows(self):
+        return len(self.df)
+
+
+def _metric_cols(df, metric_lists):
+    """섹션의 지표 목록 중 데이터에 있는 컬럼"""
+    return tuple(metric for metrics in metric_lists for metric, _ in get_available_metrics(df, metrics))
+
+
+def bench_preprocess_data(data):
+    preprocess_data(data.df)
+
+
+def bench_get_top20_countries(data):
+    # main.py는 streamlit 페이지 설정을 실행하므로 케이스 실행 시점에 가져옴
+    from main import get_top20_countries
+    get_top20_countries(data.paper_df, data.patent_df)
+
+
+def bench_get_tech_categories(data):
+    from main import get_tech_categories
+    get_tech_categories(data.paper_df, TECH_COL, TITLE_COL)
+    get_tech_categories(data.patent_df, TECH_COL, TITLE_COL)
+
+
+def bench_render_paper_metrics(data):
+    metrics = _metric_cols(data.paper_df, [
+        paper_metrics.PAPER_VOLUME_METRICS, paper_metrics.PAPER_IMPACT_METRICS, paper_metrics.PAPER_QUALITY_METRICS
+    ])
+    compute_country_means(data.paper_df, data.countries, metrics)
+
+
+def bench_render_patent_metrics(data):
+    metrics = _metric_cols(data.patent_df, [
+        patent_metrics.PATENT_VOLUME_METRICS, patent_metrics.PATENT_IMPACT_METRICS,
+        patent_metrics.PATENT_QUALITY_METRICS
+    ])
+    compute_country_means(data.patent_df, data.countries, metrics)
+
+
+def bench_render_comparison_chart(data):
+    compute_country_means(data.paper_df, data.countries, ('Total_Papers',))
+    compute_country_means(data.patent_df, data.countries, ('total_papers_granted',))
+
+
+def bench_render_technology_distribution(data):
+    compute_tech_counts(data.paper_df, TECH_COL, TITLE_COL)
+    compute_tech_counts(data.patent_df, TECH_COL, TITLE_COL)
+
+
+def bench_render_country_tech_heatmap(data):
+    compute_country_tech(data.paper_df, data.countries, TECH_COL)
+    compute_country_tech(data.patent_df, data.countries, TECH_COL)
+
+
+def bench_render_citation_analysis(data):
+    citation.render_citation_analysis(data.paper_view)
+
+
+def bench_render_country_citation(data):
+    country_citation.render_country_citation(data.paper_view)
+
+
+def bench_render_country_collaboration(data):
+    country_collaboration.render_country_collaboration(data.paper_view)
+
+
+def bench_render_country_comparison(data):
+    country_comparison.render_country_comparison(data.paper_view, data.patent_view)
+
+
+def bench_render_country_patent(data):
+    country_patent.render_country_patent(data.patent_view)
+
+
+def bench_render_country_technology(data):
+    country_technology.render_country_technology(data.paper_view, data.patent_view)
+
+
+def bench_render_country_trends(data):
+    country_trends.render_country_trends(data.paper_view, data.patent_view)
+
+
+def bench_render_patent_analysis(data):
+    patent.render_patent_analysis(data.patent_view)
+
+
+def bench_render_publication_analysis(data):
+    publication.render_publication_analysis(data.paper_view)
+
+
+def bench_render_research_front(data):
+    research_front.render_research_front(data.paper_view)
+
+
+def bench_render_bradford_analysis(data):
+    bradford.render_bradford_analysis(data.paper_view)
+
+
+def bench_render_collaboration_analysis(data):
+    collaboration.render_collaboration_analysis(data.paper_view)
+
+
+def bench_render_impact_analysis(data):
+    # render_impact_analysis가 부르지 않는 시계열/국가별 mRNIF도 함께 실행
+    impact.render_impact_analysis(data.paper_view, PAPER_COL_MAPPING)
+    impact.render_hindex_timeline(data.paper_view, PAPER_COL_MAPPING)
+    impact.render_mrnif_by_country(data.paper_view, PAPER_COL_MAPPING)
+
+
+def bench_render_kpi_metrics(data):
+    metrics.render_kpi_metrics(data.paper_view, PAPER_COL_MAPPING)
+
+
+def bench_render_country_bar_charts(data):
+    country.render_country_bar_charts(data.paper_view, PAPER_COL_MAPPING)
+    country.render_country_comparison(data.paper_view, PAPER_COL_MAPPING)
+
+
+# 케이스 이름 → 함수 (실행 순서)
+CASES = {
+    name[len('bench_'):]: func
+    for name, func in list(globals().items())
+    if name.startswith('bench_') and callable(func)
+}
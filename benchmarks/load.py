@@ -0,0 +1,315 @@
+# benchmarks/load.py
+"""동시 세션 재실행 지연 부하 테스트
+
+    python -m benchmarks.load                          # 1, 5, 10, 30 세션
+    python -m benchmarks.load --sessions 30 --steps 20 --rows 200000
+    python -m benchmarks.load --data ./통합평가자료.xlsx --output load.json
+
+Streamlit의 헤드리스 AppTest로 main.py 세션 N개를 스레드에서 동시에 실행합니다.
+세션마다 기술 분류 레벨 전환, 국가 변경, 기술 분야 검색/선택, 탭 전환을 무작위로 반복하고
+재실행 지연(p50/p95/p99), 최대 RSS, 지문/figure 캐시 적중률을 세션 수별로 보고합니다.
+
+한 서버 프로세스처럼 세션들은 프로세스 캐시를 공유하고, 세션 수 단계마다 캐시를 비워
+차가운 상태에서 시작합니다.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+from streamlit import config as st_config
+from streamlit import logger as st_logger
+
+# 스크립트 실행 컨텍스트 없이 streamlit 함수를 부를 때 나오는 경고는 숨김
+# (설정 파일을 처음 읽을 때 로그 레벨이 초기화되므로 설정을 먼저 읽은 뒤 지정)
+st_config.get_config_options()
+st_logger.set_log_level('error')
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from utils.figure_cache import get_figure_cache
+from utils.fingerprint import fingerprint_cache_stats, get_aggregate_store
+from utils.memory import current_rss
+from utils.synthetic import generate_synthetic_data, write_synthetic_dataset
+
+# 대시보드 스크립트와 기본 데이터 파일 이름 (main.py 파일 목록의 첫 항목)
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+DATA_FILE = '_통합평가자료.xlsx'
+
+# 위젯 라벨 (main.py)
+LEVEL_LABEL = "기술 분류 레벨"
+COUNTRY_LABEL = "분석할 국가 선택"
+SEARCH_LABEL = "기술 분야 검색"
+TECH_LABEL = "기술 분야 선택"
+
+# 대시보드 탭 위젯 키 (main.py)
+TAB_KEY = "active_tab"
+
+# RSS 표본 간격 (초)
+RSS_INTERVAL = 0.05
+
+
+class RssSampler:
+    """백그라운드 스레드에서 RSS를 주기적으로 재서 구간 최댓값 기록"""
+
+    def __init__(self, interval=RSS_INTERVAL):
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._sample()
+
+    def _sample(self):
+        # RSS를 잴 수 없는 환경에서는 peak가 None으로 남음
+        rss = current_rss()
+        if rss is not None:
+            self.peak = rss if self.peak is None else max(self.peak, rss)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+def _widget(elements, label):
+    """라벨로 위젯 찾기 (없으면 None)"""
+    return next((element for element in elements if element.label == label), None)
+
+
+def switch_level(at, rng):
+    """기술 분류 레벨 전환"""
+    radio = _widget(at.sidebar.radio, LEVEL_LABEL)
+    if radio is None:
+        return None
+    other = [option for option in radio.options if option != radio.value]
+    return radio.set_value(rng.choice(other)) if other else None
+
+
+def change_countries(at, rng):
+    """분석할 국가를 무작위로 다시 선택"""
+    multiselect = _widget(at.sidebar.multiselect, COUNTRY_LABEL)
+    if multiselect is None or not multiselect.options:
+        return None
+    k = rng.randint(1, len(multiselect.options))
+    return multiselect.set_value(rng.sample(list(multiselect.options), k))
+
+
+def search_techs(at, rng):
+    """기술 분야 검색어 입력 (가끔은 검색어 지우기)"""
+    text_input = _widget(at.sidebar.text_input, SEARCH_LABEL)
+    tech = _widget(at.sidebar.multiselect, TECH_LABEL)
+    if text_input is None or tech is None:
+        return None
+    options = [option for option in tech.options if option != "전체"]
+    if not options or (text_input.value and rng.random() < 0.3):
+        return text_input.input("")
+    # 옵션 "ID: 제목"에서 제목의 앞부분으로 검색
+    title = rng.choice(options).split(": ", 1)[-1]
+    return text_input.input(title[:rng.randint(1, len(title))])
+
+
+def select_techs(at, rng):
+    """검색 결과에서 기술 분야 선택 (가끔은 전체로 되돌림)"""
+    tech = _widget(at.sidebar.multiselect, TECH_LABEL)
+    if tech is None:
+        return None
+    options = [option for option in tech.options if option != "전체"]
+    if not options or rng.random() < 0.25:
+        return tech.set_value(["전체"])
+    return tech.set_value(rng.sample(options, rng.randint(1, min(5, len(options)))))
+
+
+def switch_tab(at, rng):
+    """다른 탭 선택 (탭을 바꾸면 선택한 탭만 다시 계산)"""
+    labels = [tab.label for tab in at.tabs]
+    current = at.session_state[TAB_KEY] if TAB_KEY in at.session_state else (labels[0] if labels else None)
+    other = [label for label in labels if label != current]
+    if not other:
+        return None
+    at.session_state[TAB_KEY] = rng.choice(other)
+    return at
+
+
+# 시나리오 동작 → 가중치
+ACTIONS = {
+    switch_level: 1,
+    change_countries: 2,
+    search_techs: 1,
+    select_techs: 1,
+    switch_tab: 2
+}
+
+
+def run_session(session_id, steps, seed, timeout, results):
+    """세션 하나를 실행하고 재실행 지연 기록 (첫 실행은 따로 기록)"""
+    rng = random.Random(seed + session_id)
+    actions, weights = list(ACTIONS), list(ACTIONS.values())
+    record = {'session': session_id, 'initial': None, 'latencies': [], 'errors': 0}
+
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        start = time.perf_counter()
+        at.run()
+        record['initial'] = time.perf_counter() - start
+        record['errors'] += len(at.exception)
+
+        for _ in range(steps):
+            action = rng.choices(actions, weights)[0]
+            if action(at, rng) is None:
+                continue
+            start = time.perf_counter()
+            at.run()
+            record['latencies'].append(time.perf_counter() - start)
+            record['errors'] += len(at.exception)
+    except Exception as e:  # 한 세션이 실패해도 다른 세션 결과는 보고
+        record['errors'] += 1
+        record['failure'] = repr(e)
+
+    results[session_id] = record
+
+
+def _hit_rate(hits, total):
+    """적중률 (호출이 없으면 None)"""
+    return hits / total if total else None
+
+
+def cache_snapshot():
+    """지문/figure 캐시 누적 호출/적중 횟수"""
+    fingerprint = fingerprint_cache_stats().values()
+    figure = get_figure_cache().stats()
+    return {
+        'fingerprint_calls': sum(s['calls'] for s in fingerprint),
+        'fingerprint_hits': sum(s['calls'] - s['misses'] for s in fingerprint),
+        'figure_calls': figure['hits'] + figure['misses'],
+        'figure_hits': figure['hits']
+    }
+
+
+def run_level(n_sessions, steps, seed=0, timeout=300):
+    """세션 N개를 동시에 실행하고 요약 통계 반환 (캐시를 비운 상태에서 시작)"""
+    st.cache_data.clear()
+    get_figure_cache().clear()
+    store = get_aggregate_store()
+    if store is not None:
+        store.clear()
+    before = cache_snapshot()
+
+    results = [None] * n_sessions
+    threads = [
+        threading.Thread(target=run_session, args=(i, steps, seed, timeout, results), name=f"session-{i}")
+        for i in range(n_sessions)
+    ]
+    start = time.perf_counter()
+    with RssSampler() as sampler:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - start
+
+    after = cache_snapshot()
+    latencies = np.array([t for r in results for t in r['latencies']])
+    initial = np.array([r['initial'] for r in results if r['initial'] is not None])
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies.size else (np.nan,) * 3
+
+    return {
+        'sessions': n_sessions,
+        'reruns': int(latencies.size),
+        'elapsed_s': round(elapsed, 3),
+        'initial_p50_s': round(float(np.median(initial)), 4) if initial.size else None,
+        'p50_s': round(float(p50), 4),
+        'p95_s': round(float(p95), 4),
+        'p99_s': round(float(p99), 4),
+        'max_s': round(float(latencies.max()), 4) if latencies.size else None,
+        'peak_rss_bytes': int(sampler.peak) if sampler.peak is not None else None,
+        'fingerprint_hit_rate': _hit_rate(after['fingerprint_hits'] - before['fingerprint_hits'],
+                                          after['fingerprint_calls'] - before['fingerprint_calls']),
+        'figure_hit_rate': _hit_rate(after['figure_hits'] - before['figure_hits'],
+                                     after['figure_calls'] - before['figure_calls']),
+        'errors': sum(r['errors'] for r in results),
+        'failures': [r['failure'] for r in results if 'failure' in r]
+    }
+
+
+def prepare_data(rows, countries, seed, workdir):
+    """작업 디렉터리에 합성 데이터 엑셀과 컬럼 캐시 저장"""
+    start = time.perf_counter()
+    df = generate_synthetic_data(rows, countries, seed=seed)
+    paths = write_synthetic_dataset(df, os.path.join(workdir, DATA_FILE))
+    print(f"합성 데이터 {len(df):,}행 저장 ({time.perf_counter() - start:.1f}초): {paths['excel']}")
+
+
+def _format_rate(rate):
+    return f"{rate:6.1%}" if rate is not None else f"{'-':>6}"
+
+
+def print_report(summaries):
+    """세션 수별 결과 표 출력"""
+    print(f"\n{'세션':>4} {'재실행':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'첫 실행 ms':>10} "
+          f"{'최대 RSS MB':>11} {'지문 적중':>8} {'figure 적중':>10} {'오류':>4}")
+    for s in summaries:
+        initial = s['initial_p50_s'] * 1000 if s['initial_p50_s'] is not None else float('nan')
+        peak_rss = s['peak_rss_bytes'] / 1e6 if s['peak_rss_bytes'] is not None else float('nan')
+        print(f"{s['sessions']:>4} {s['reruns']:>6} {s['p50_s'] * 1000:9.1f} {s['p95_s'] * 1000:9.1f} "
+              f"{s['p99_s'] * 1000:9.1f} {initial:10.1f} {peak_rss:11.1f} "
+              f"{_format_rate(s['fingerprint_hit_rate']):>8} {_format_rate(s['figure_hit_rate']):>10} "
+              f"{s['errors']:>4}")
+        for failure in s['failures']:
+            print(f"     실패: {failure}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="동시 세션 재실행 지연 부하 테스트")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10, 30], help="동시 세션 수 단계")
+    parser.add_argument('--steps', type=int, default=10, help="세션당 상호작용 횟수")
+    parser.add_argument('--rows', type=int, default=60_000, help="합성 데이터 행 수")
+    parser.add_argument('--countries', type=int, default=30, help="합성 데이터 국가 수")
+    parser.add_argument('--data', help="합성 데이터 대신 사용할 엑셀 파일")
+    parser.add_argument('--timeout', type=float, default=300, help="재실행 한 번의 제한 시간 (초)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일")
+    args = parser.parse_args(argv)
+
+    # main.py는 작업 디렉터리의 기본 파일 이름으로 데이터를 찾으므로 임시 디렉터리에서 실행
+    output = os.path.abspath(args.output) if args.output else None
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='ct_load_')
+    try:
+        if args.data:
+            shutil.copy(args.data, os.path.join(workdir, DATA_FILE))
+        else:
+            prepare_data(args.rows, args.countries, args.seed, workdir)
+        os.chdir(workdir)
+
+        summaries = []
+        for n_sessions in args.sessions:
+            print(f"세션 {n_sessions}개 실행 중...")
+            summaries.append(run_level(n_sessions, args.steps, args.seed, args.timeout))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(summaries)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(summaries, f, ensure_ascii=False, indent=2)
+    return 1 if any(s['errors'] for s in summaries) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
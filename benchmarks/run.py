@@ -0,0 +1,178 @@
+# benchmarks/run.py
+"""벤치마크 실행 CLI
+
+    python -m benchmarks.run                       # 10k, 1M 규모 실행 후 기록과 비교
+    python -m benchmarks.run --scales 10k 1M 10M   # 10M 포함
+    python -m benchmarks.run --cases preprocess_data render_paper_metrics --no-record
+
+케이스마다 벽시계 시간(반복 중 최솟값)과 tracemalloc 최대 메모리를 측정하고,
+기록 파일(JSONL)의 같은 머신/케이스/규모 최근 기록 중앙값보다 threshold 이상 느려지면
+종료 코드 1로 실패합니다.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from streamlit import config as st_config
+from streamlit import logger as st_logger
+
+# 스크립트 실행 컨텍스트 없이 streamlit 함수를 부를 때 나오는 경고는 숨김
+# (설정 파일을 처음 읽을 때 로그 레벨이 초기화되므로 설정을 먼저 읽은 뒤 지정)
+st_config.get_config_options()
+st_logger.set_log_level('error')
+
+from benchmarks.cases import CASES, SCALES, BenchmarkData
+
+# 기본 기록 파일
+HISTORY_PATH = os.path.join('.benchmarks', 'history.jsonl')
+
+# 비교에 쓰는 최근 기록 수
+BASELINE_WINDOW = 5
+
+
+def git_revision():
+    """현재 커밋 해시 (git이 없으면 None)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine_id():
+    """기록 비교 단위 (다른 머신의 기록과는 비교하지 않음)"""
+    return f"{platform.node()}|{platform.machine()}|py{platform.python_version()}|cpu{os.cpu_count()}"
+
+
+def measure(func, data, repeat):
+    """케이스 실행 시간(최솟값, 초)과 최대 메모리(바이트) 측정
+
+    시간은 tracemalloc 없이 재고, 메모리는 별도 실행에서 tracemalloc으로 잽니다.
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(data)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(times), peak
+
+
+def load_history(path):
+    """기록 파일 읽기 (없으면 빈 목록)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(path, records):
+    """기록 파일에 결과 추가"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def baseline(history, record, window=BASELINE_WINDOW):
+    """같은 머신/케이스/규모 최근 기록의 중앙값 (시간, 메모리) - 기록이 없으면 None"""
+    previous = [
+        r for r in history
+        if r['machine'] == record['machine'] and r['case'] == record['case'] and r['scale'] == record['scale']
+    ][-window:]
+    if not previous:
+        return None
+    return (statistics.median(r['time_s'] for r in previous),
+            statistics.median(r['peak_bytes'] for r in previous))
+
+
+def find_regressions(history, records, threshold):
+    """기준보다 threshold 비율 이상 느려지거나 메모리가 늘어난 결과 목록"""
+    regressions = []
+    for record in records:
+        base = baseline(history, record)
+        if base is None:
+            continue
+        base_time, base_peak = base
+        if record['time_s'] > base_time * (1 + threshold):
+            regressions.append((record, 'time_s', base_time))
+        if record['peak_bytes'] > base_peak * (1 + threshold):
+            regressions.append((record, 'peak_bytes', base_peak))
+    return regressions
+
+
+def run(scales, cases, repeat=3, seed=0):
+    """규모별 데이터를 만들고 케이스를 실행해 결과 기록 목록 반환"""
+    revision = git_revision()
+    machine = machine_id()
+    timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+    records = []
+    for scale in scales:
+        start = time.perf_counter()
+        data = BenchmarkData(scale, seed=seed)
+        print(f"[{scale}] 데이터 {data.rows:,}행 준비 ({time.perf_counter() - start:.1f}초)")
+
+        for name in cases:
+            elapsed, peak = measure(CASES[name], data, repeat if scale != '10M' else 1)
+            records.append({
+                'timestamp': timestamp, 'revision': revision, 'machine': machine,
+                'scale': scale, 'rows': data.rows, 'case': name,
+                'time_s': round(elapsed, 6), 'peak_bytes': int(peak)
+            })
+            print(f"  {name:<32} {elapsed * 1000:10.1f} ms {peak / 1e6:10.1f} MB")
+
+        del data
+        gc.collect()
+
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 계산 경로 벤치마크")
+    parser.add_argument('--scales', nargs='+', default=['10k', '1M'], choices=list(SCALES))
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=list(CASES))
+    parser.add_argument('--repeat', type=int, default=3, help="시간 측정 반복 횟수 (10M은 1회)")
+    parser.add_argument('--threshold', type=float, default=0.2, help="실패로 볼 증가 비율 (0.2 = 20%%)")
+    parser.add_argument('--history', default=HISTORY_PATH, help="기록 파일 경로 (JSONL)")
+    parser.add_argument('--no-record', action='store_true', help="결과를 기록 파일에 추가하지 않음")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    history = load_history(args.history)
+    records = run(args.scales, args.cases, args.repeat, args.seed)
+    regressions = find_regressions(history, records, args.threshold)
+
+    if not args.no_record:
+        append_history(args.history, records)
+
+    if regressions:
+        print(f"\n성능 저하 {len(regressions)}건 (기준 대비 {args.threshold:.0%} 초과):")
+        for record, field, base in regressions:
+            print(f"  [{record['scale']}] {record['case']} {field}: {base:.6g} → {record[field]:.6g}")
+        return 1
+
+    print("\n성능 저하 없음")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
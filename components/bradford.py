@@ -4,6 +4,7 @@ Bradford's Law 컴포넌트
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
+from utils.chart_payload import compact_figure
 
 def render_bradford_analysis(paper_filtered):
     """Bradford's Law Analysis 렌더링"""
@@ -38,7 +39,7 @@ def render_bradford_analysis(paper_filtered):
     fig.update_layout(title="Bradford's Law - Journal Distribution",
                      xaxis_title="Journal Rank", 
                      yaxis_title="Cumulative Paper Ratio")
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(compact_figure(fig), use_container_width=True)
     
     # Metrics
     col1, col2, col3 = st.columns(3)
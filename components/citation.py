@@ -4,8 +4,9 @@ Citation Analysis 컴포넌트
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
+from utils.schema import resolve_schema
 
-def render_citation_analysis(paper_filtered):
+def render_citation_analysis(paper_filtered, schema=None):
     """Citation Impact Analysis 렌더링"""
     st.header("🎯 Citation Impact Analysis")
     
@@ -14,17 +15,26 @@ def render_citation_analysis(paper_filtered):
         return
     
     # 컬럼 찾기
-    year_col = [c for c in paper_filtered.columns if c.lower() in ['year', '연도']][0]
-    papers_col = [c for c in paper_filtered.columns if 'total' in c.lower() and 'paper' in c.lower()][0]
-    country_col = [c for c in paper_filtered.columns if c.lower() in ['country', '국가']][0]
+    schema = schema or resolve_schema(paper_filtered)
+    if not schema.has('year', 'papers', 'country'):
+        st.info(f"필요한 컬럼이 없습니다: {', '.join(schema.missing('year', 'papers', 'country'))}")
+        return
+    
+    year_col = schema['year']
+    papers_col = schema['papers']
+    country_col = schema['country']
+    citation_col = schema.get('citations')
+    
+    # 문자열 연도 컬럼은 숫자로 변환해 사용
+    paper_filtered = schema.coerce(paper_filtered, 'year')
     
     col1, col2 = st.columns(2)
     
     with col1:
         # h-index by country
-        h_col = [c for c in paper_filtered.columns if 'h_index' in c.lower()]
+        h_col = schema.get('h_index')
         if h_col:
-            country_h = paper_filtered.groupby(country_col)[h_col[0]].mean().nlargest(10)
+            country_h = paper_filtered.groupby(country_col)[h_col].mean().nlargest(10)
             
             fig = go.Figure()
             fig.add_trace(go.Bar(x=country_h.index, y=country_h.values, name='h-index'))
@@ -34,13 +44,12 @@ def render_citation_analysis(paper_filtered):
     
     with col2:
         # CPP trend
-        citation_cols = [c for c in paper_filtered.columns if 'citation' in c.lower()]
-        if citation_cols:
+        if citation_col:
             yearly_citations = paper_filtered.groupby(year_col).agg({
                 papers_col: 'sum',
-                citation_cols[0]: 'sum'
+                citation_col: 'sum'
             })
-            yearly_citations['CPP'] = yearly_citations[citation_cols[0]] / yearly_citations[papers_col]
+            yearly_citations['CPP'] = yearly_citations[citation_col] / yearly_citations[papers_col]
             
             fig = go.Figure()
             fig.add_trace(go.Scatter(x=yearly_citations.index, 
@@ -53,20 +62,19 @@ def render_citation_analysis(paper_filtered):
     # FWCI
     st.subheader("📊 Field-Weighted Citation Impact")
     
-    tech_col = [c for c in paper_filtered.columns if any(k in c.lower() for k in ['label', 'tech', '기술'])]
-    citation_cols = [c for c in paper_filtered.columns if 'citation' in c.lower()]
+    tech_col = schema.get('tech')
     
-    if tech_col and citation_cols:
-        field_impact = paper_filtered.groupby(tech_col[0]).agg({
-            citation_cols[0]: 'mean',
+    if tech_col and citation_col:
+        field_impact = paper_filtered.groupby(tech_col).agg({
+            citation_col: 'mean',
             papers_col: 'sum'
         }).round(2)
-        field_impact['FWCI'] = field_impact[citation_cols[0]] / field_impact[citation_cols[0]].mean()
+        field_impact['FWCI'] = field_impact[citation_col] / field_impact[citation_col].mean()
         
         fig = px.scatter(field_impact.reset_index(), 
                        x=papers_col, y='FWCI',
-                       size=citation_cols[0], 
-                       hover_name=tech_col[0],
+                       size=citation_col, 
+                       hover_name=tech_col,
                        title="Field-Weighted Citation Impact",
                        labels={'FWCI': 'FWCI (1.0 = average)'})
         fig.add_hline(y=1, line_dash="dash", line_color="red")
@@ -5,8 +5,9 @@ import streamlit as st
 import plotly.express as px
 import networkx as nx
 import numpy as np
+from utils.schema import resolve_schema
 
-def render_collaboration_analysis(paper_filtered):
+def render_collaboration_analysis(paper_filtered, schema=None):
     """협력 네트워크 분석"""
     st.header("🤝 Collaboration Network Analysis")
     
@@ -15,16 +16,24 @@ def render_collaboration_analysis(paper_filtered):
         return
     
     # 컬럼 찾기
-    country_col = [c for c in paper_filtered.columns if c.lower() in ['country', '국가']][0]
-    year_col = [c for c in paper_filtered.columns if c.lower() in ['year', '연도']][0]
+    schema = schema or resolve_schema(paper_filtered)
+    if not schema.has('country', 'year'):
+        st.info(f"필요한 컬럼이 없습니다: {', '.join(schema.missing('country', 'year'))}")
+        return
+    
+    country_col = schema['country']
+    year_col = schema['year']
+    collab_col = schema.get('collab')
+    
+    # 문자열 연도 컬럼은 숫자로 변환해 사용
+    paper_filtered = schema.coerce(paper_filtered, 'year')
     
     col1, col2 = st.columns(2)
     
     with col1:
         # International Collaboration Index
-        collab_cols = [c for c in paper_filtered.columns if 'collab' in c.lower()]
-        if collab_cols:
-            country_collab = paper_filtered.groupby(country_col)[collab_cols[0]].mean().nlargest(15)
+        if collab_col:
+            country_collab = paper_filtered.groupby(country_col)[collab_col].mean().nlargest(15)
             
             fig = px.bar(country_collab, orientation='h',
                        title="International Collaboration Index",
@@ -53,7 +62,7 @@ def render_collaboration_analysis(paper_filtered):
             col2_metric.metric("Clustering Coefficient", f"{clustering:.3f}")
         
         # Collaboration Trend
-        if collab_cols:
-            yearly_collab = paper_filtered.groupby(year_col)[collab_cols[0]].mean()
+        if collab_col:
+            yearly_collab = paper_filtered.groupby(year_col)[collab_col].mean()
             fig = px.area(yearly_collab, title="Collaboration Trend")
             st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
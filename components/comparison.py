@@ -3,14 +3,83 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
+from utils.helpers import compute_country_means
+from utils.figure_cache import cached_figure
+from utils.figure_batch import show_figure
+from utils.instrumentation import traced
+from utils.schema import resolve_schema
 
-def render_comparison_chart(paper_df, patent_df, countries, paper_metric, patent_metric, title):
+# 비교 가능한 지표 (컬럼명 → 표시명)
+PAPER_METRIC_OPTIONS = {
+    '논문 건수': '논문 건수',
+    'Total_Papers': 'Total_Papers',
+    'Total_Citations': 'Total_Citations',
+    'Avg_Citations': 'Avg_Citations',
+    'H_Index': 'H_Index',
+    'H-index': 'H-index',
+    'Top10_Ratio(%)': 'Top10_Ratio(%)',
+    'Q1_Ratio(%)': 'Q1_Ratio(%)'
+}
+
+PATENT_METRIC_OPTIONS = {
+    'total_papers_granted': 'total_papers_granted',
+    'total_citations': 'total_citations',
+    'avg_citations': 'avg_citations',
+    'h_index': 'h_index',
+    'triadic_ratio': 'triadic_ratio',
+    'patent_impact': 'patent_impact'
+}
+
+# 이 섹션이 읽는 컬럼 (로더의 컬럼 프로젝션에 사용)
+REQUIRED_COLUMNS = ['Country'] + list(PAPER_METRIC_OPTIONS) + list(PATENT_METRIC_OPTIONS)
+
+def build_comparison_scatter(comparison_data, title):
+    """정규화한 논문/특허 성과 산점도 생성"""
+    # 크기 계산 (NaN 또는 0 이하는 기본 최소 크기 10)
+    size_values = ((comparison_data['논문_norm'] + comparison_data['특허_norm']) * 50).to_numpy(dtype=float)
+    size_values = np.where(size_values > 0, size_values, 10)
+    
+    # 산점도 생성
+    fig = px.scatter(
+        comparison_data,
+        x='논문_norm',
+        y='특허_norm',
+        text='Country',
+        title=title,
+        labels={'논문_norm': '논문 성과 (정규화)', '특허_norm': '특허 성과 (정규화)'},
+        color='Country',
+        size=size_values,  # 수정된 크기 값 사용
+        hover_data={'Country': True, '논문': True, '특허': True, '논문_norm': False, '특허_norm': False}
+    )
+    
+    # 참조선 추가
+    fig.add_shape(
+        type="line", line=dict(dash="dash", width=1, color="gray"),
+        x0=0, y0=0, x1=1, y1=1
+    )
+    
+    fig.update_traces(
+        textposition='top center',
+        marker=dict(line=dict(width=1, color='DarkSlateGrey'))
+    )
+    
+    fig.update_layout(height=600)
+    return fig
+
+@traced('render')
+def render_comparison_chart(paper_df, patent_df, countries, paper_metric, patent_metric, title,
+                            paper_fingerprint=None, patent_fingerprint=None, paper_schema=None, patent_schema=None):
     """논문/특허 성과 비교 시각화"""
-    if (paper_df is None or paper_df.empty or 'Country' not in paper_df.columns or 
-        patent_df is None or patent_df.empty or 'Country' not in patent_df.columns):
+    if paper_df is None or paper_df.empty or patent_df is None or patent_df.empty:
         st.warning("비교 차트를 위한 데이터가 부족합니다.")
         return
     
+    paper_schema = paper_schema or resolve_schema(paper_df)
+    patent_schema = patent_schema or resolve_schema(patent_df)
+    if not paper_schema.has('country') or not patent_schema.has('country'):
+        st.warning("비교 차트를 위한 국가 컬럼이 없습니다.")
+        return
+    
     # 지표 확인
     if paper_metric not in paper_df.columns:
         st.warning(f"논문 지표 '{paper_metric}'를 찾을 수 없습니다.")
@@ -20,20 +89,21 @@ def render_comparison_chart(paper_df, patent_df, countries, paper_metric, patent
         st.warning(f"특허 지표 '{patent_metric}'를 찾을 수 없습니다.")
         return
     
-    # 선택한 국가만 필터링
-    filtered_paper = paper_df[paper_df['Country'].isin(countries)].copy()
-    filtered_patent = patent_df[patent_df['Country'].isin(countries)].copy()
+    # 선택한 국가의 국가별 평균 계산
+    countries = tuple(sorted(countries))
+    paper_data = compute_country_means(
+        paper_df, countries, (paper_metric,), paper_schema['country'], fingerprint=paper_fingerprint
+    ).set_index('Country')[paper_metric]
+    patent_data = compute_country_means(
+        patent_df, countries, (patent_metric,), patent_schema['country'], fingerprint=patent_fingerprint
+    ).set_index('Country')[patent_metric]
     
-    if filtered_paper.empty or filtered_patent.empty:
+    if paper_data.empty or patent_data.empty:
         st.warning("선택한 국가의 데이터가 부족합니다.")
         return
     
-    # 데이터 준비
-    paper_data = filtered_paper.groupby('Country')[paper_metric].mean()
-    patent_data = filtered_patent.groupby('Country')[patent_metric].mean()
-    
     # 공통 국가만 선택
-    common_countries = list(set(paper_data.index) & set(patent_data.index))
+    common_countries = sorted(set(paper_data.index) & set(patent_data.index))
     
     if not common_countries:
         st.warning("논문과 특허 데이터에 공통된 국가가 없습니다.")
@@ -56,70 +126,26 @@ def render_comparison_chart(paper_df, patent_df, countries, paper_metric, patent
     comparison_data['논문_norm'] = comparison_data['논문_norm'].fillna(0)
     comparison_data['특허_norm'] = comparison_data['특허_norm'].fillna(0)
     
-    # 크기 계산 (NaN 값 방지)
-    size_values = []
-    for x, y in zip(comparison_data['논문_norm'], comparison_data['특허_norm']):
-        size = (x + y) * 50
-        # NaN 체크 및 최소 크기 설정
-        if np.isnan(size) or size <= 0:
-            size = 10  # 기본 최소 크기
-        size_values.append(size)
-    
-    # 산점도 생성
-    fig = px.scatter(
-        comparison_data,
-        x='논문_norm',
-        y='특허_norm',
-        text='Country',
-        title=title,
-        labels={'논문_norm': '논문 성과 (정규화)', '특허_norm': '특허 성과 (정규화)'},
-        color='Country',
-        size=size_values,  # 수정된 크기 값 사용
-        hover_data={'Country': True, '논문': True, '특허': True, '논문_norm': False, '특허_norm': False}
+    # 산점도 생성 (같은 집계/옵션이면 캐시된 figure 재사용)
+    figure_fingerprint = None
+    if paper_fingerprint is not None and patent_fingerprint is not None:
+        figure_fingerprint = (paper_fingerprint, patent_fingerprint)
+    fig = cached_figure(
+        figure_fingerprint, 'comparison_scatter',
+        lambda: build_comparison_scatter(comparison_data, title),
+        countries=countries, paper_metric=paper_metric, patent_metric=patent_metric, title=title
     )
-    
-    # 참조선 추가
-    fig.add_shape(
-        type="line", line=dict(dash="dash", width=1, color="gray"),
-        x0=0, y0=0, x1=1, y1=1
-    )
-    
-    fig.update_traces(
-        textposition='top center',
-        marker=dict(line=dict(width=1, color='DarkSlateGrey'))
-    )
-    
-    fig.update_layout(height=600)
-    st.plotly_chart(fig, use_container_width=True)
+    show_figure(st, fig, 'comparison_scatter')
 
-def comparison_section(paper_df, patent_df, selected_countries):
-    """비교 분석 섹션"""
+@traced('section')
+def comparison_section(paper_df, patent_df, selected_countries, paper_fingerprint=None, patent_fingerprint=None,
+                       paper_schema=None, patent_schema=None):
+    """비교 분석 섹션 (schema는 main에서 한 번 계산한 매핑)"""
     st.header("논문/특허 성과 비교")
     
-    # 비교할 지표 선택
-    paper_metric_options = {
-        '논문 건수': '논문 건수',
-        'Total_Papers': 'Total_Papers',
-        'Total_Citations': 'Total_Citations',
-        'Avg_Citations': 'Avg_Citations',
-        'H_Index': 'H_Index',
-        'H-index': 'H-index',
-        'Top10_Ratio(%)': 'Top10_Ratio(%)',
-        'Q1_Ratio(%)': 'Q1_Ratio(%)'
-    }
-    
-    patent_metric_options = {
-        'total_papers_granted': 'total_papers_granted',
-        'total_citations': 'total_citations',
-        'avg_citations': 'avg_citations',
-        'h_index': 'h_index',
-        'triadic_ratio': 'triadic_ratio',
-        'patent_impact': 'patent_impact'
-    }
-    
     # 사용 가능한 지표만 필터링
-    available_paper_metrics = {k: v for k, v in paper_metric_options.items() if k in paper_df.columns}
-    available_patent_metrics = {k: v for k, v in patent_metric_options.items() if k in patent_df.columns}
+    available_paper_metrics = {k: v for k, v in PAPER_METRIC_OPTIONS.items() if k in paper_df.columns}
+    available_patent_metrics = {k: v for k, v in PATENT_METRIC_OPTIONS.items() if k in patent_df.columns}
     
     if not available_paper_metrics or not available_patent_metrics:
         st.warning("비교할 수 있는 지표가 충분하지 않습니다.")
@@ -131,20 +157,21 @@ def comparison_section(paper_df, patent_df, selected_countries):
             selected_paper_metric = st.selectbox(
                 "논문 지표 선택",
                 options=list(available_paper_metrics.keys()),
-                format_func=lambda x: paper_metric_options[x]
+                format_func=lambda x: PAPER_METRIC_OPTIONS[x]
             )
         
         with col2:
             selected_patent_metric = st.selectbox(
                 "특허 지표 선택",
                 options=list(available_patent_metrics.keys()),
-                format_func=lambda x: patent_metric_options[x]
+                format_func=lambda x: PATENT_METRIC_OPTIONS[x]
             )
         
         # 총량 비교
-        st.subheader(f"{paper_metric_options[selected_paper_metric]} vs {patent_metric_options[selected_patent_metric]}")
+        st.subheader(f"{PAPER_METRIC_OPTIONS[selected_paper_metric]} vs {PATENT_METRIC_OPTIONS[selected_patent_metric]}")
         render_comparison_chart(
             paper_df, patent_df, selected_countries,
             selected_paper_metric, selected_patent_metric,
-            f'국가별 {paper_metric_options[selected_paper_metric]}와 {patent_metric_options[selected_patent_metric]} 비교 (정규화)'
+            f'국가별 {PAPER_METRIC_OPTIONS[selected_paper_metric]}와 {PATENT_METRIC_OPTIONS[selected_patent_metric]} 비교 (정규화)',
+            paper_fingerprint, patent_fingerprint, paper_schema, patent_schema
         )
\ No newline at end of file
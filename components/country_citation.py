@@ -5,8 +5,9 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from utils.schema import resolve_schema
 
-def render_country_citation(paper_filtered):
+def render_country_citation(paper_filtered, schema=None):
     """국가별 인용 영향력 분석"""
     st.header("🎯 국가별 인용 영향력")
     
@@ -14,19 +15,22 @@ def render_country_citation(paper_filtered):
         st.info("데이터가 없습니다.")
         return
     
-    country_col = [c for c in paper_filtered.columns if c.lower() in ['country', '국가']][0]
-    year_col = [c for c in paper_filtered.columns if c.lower() in ['year', '연도']][0]
-    citation_cols = [c for c in paper_filtered.columns if 'citation' in c.lower()]
-    papers_col = [c for c in paper_filtered.columns if 'total' in c.lower() and 'paper' in c.lower()][0]
+    schema = schema or resolve_schema(paper_filtered)
+    if not schema.has('country', 'papers'):
+        st.info(f"필요한 컬럼이 없습니다: {', '.join(schema.missing('country', 'papers'))}")
+        return
+    
+    country_col = schema['country']
+    citation_col = schema.get('citations')
+    papers_col = schema['papers']
     
     col1, col2 = st.columns(2)
     
     with col1:
         # CPP by Country
-        if citation_cols:
-            country_cpp = paper_filtered.groupby(country_col).apply(
-                lambda x: x[citation_cols[0]].sum() / x[papers_col].sum()
-            ).nlargest(15)
+        if citation_col:
+            country_sums = paper_filtered.groupby(country_col)[[citation_col, papers_col]].sum()
+            country_cpp = (country_sums[citation_col] / country_sums[papers_col]).nlargest(15)
             
             fig = px.bar(country_cpp, orientation='h',
                         title="국가별 논문당 인용수 (CPP)",
@@ -35,9 +39,9 @@ def render_country_citation(paper_filtered):
     
     with col2:
         # Top 10% Papers Ratio
-        top10_cols = [c for c in paper_filtered.columns if 'top10' in c.lower()]
-        if top10_cols:
-            country_top10 = paper_filtered.groupby(country_col)[top10_cols[0]].mean().nlargest(15)
+        top10_col = schema.get('top10')
+        if top10_col:
+            country_top10 = paper_filtered.groupby(country_col)[top10_col].mean().nlargest(15)
             
             fig = px.bar(country_top10, orientation='h',
                         title="국가별 Top 10% 논문 비율",
@@ -47,14 +51,14 @@ def render_country_citation(paper_filtered):
     
     # FWCI 국가별 비교
     st.subheader("Field-Weighted Citation Impact")
-    if citation_cols:
+    if citation_col:
         top10 = paper_filtered.groupby(country_col)[papers_col].sum().nlargest(10).index
         fwci_data = []
         
         for country in top10:
             country_data = paper_filtered[paper_filtered[country_col] == country]
-            avg_citation = country_data[citation_cols[0]].mean()
-            global_avg = paper_filtered[citation_cols[0]].mean()
+            avg_citation = country_data[citation_col].mean()
+            global_avg = paper_filtered[citation_col].mean()
             fwci = avg_citation / global_avg if global_avg > 0 else 0
             fwci_data.append({'Country': country, 'FWCI': fwci})
         
@@ -6,8 +6,10 @@ import plotly.express as px
 import plotly.graph_objects as go
 import networkx as nx
 import numpy as np
+from utils.chart_payload import compact_figure
+from utils.schema import resolve_schema
 
-def render_country_collaboration(paper_filtered):
+def render_country_collaboration(paper_filtered, schema=None):
     """국가별 협력 분석"""
     st.header("🤝 국가별 협력 네트워크")
     
@@ -15,16 +17,24 @@ def render_country_collaboration(paper_filtered):
         st.info("데이터가 없습니다.")
         return
     
-    country_col = [c for c in paper_filtered.columns if c.lower() in ['country', '국가']][0]
-    year_col = [c for c in paper_filtered.columns if c.lower() in ['year', '연도']][0]
-    collab_cols = [c for c in paper_filtered.columns if 'collab' in c.lower()]
+    schema = schema or resolve_schema(paper_filtered)
+    if not schema.has('country', 'year'):
+        st.info(f"필요한 컬럼이 없습니다: {', '.join(schema.missing('country', 'year'))}")
+        return
+    
+    country_col = schema['country']
+    year_col = schema['year']
+    collab_col = schema.get('collab')
+    
+    # 문자열 연도 컬럼은 숫자로 변환해 사용
+    paper_filtered = schema.coerce(paper_filtered, 'year')
     
     col1, col2 = st.columns(2)
     
     with col1:
         # 국가별 국제협력 비율
-        if collab_cols:
-            country_collab = paper_filtered.groupby(country_col)[collab_cols[0]].mean().nlargest(15)
+        if collab_col:
+            country_collab = paper_filtered.groupby(country_col)[collab_col].mean().nlargest(15)
             
             fig = px.bar(country_collab, orientation='h',
                         title="국가별 국제협력 비율",
@@ -47,16 +57,16 @@ def render_country_collaboration(paper_filtered):
             colorscale='Viridis'
         ))
         fig.update_layout(title="국가 간 협력 강도")
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(compact_figure(fig), use_container_width=True)
     
     # 시계열 협력 추이
-    if collab_cols:
+    if collab_col:
         st.subheader("주요국 협력 추이")
         top5 = paper_filtered.groupby(country_col).size().nlargest(5).index
         
         collab_trend = paper_filtered[paper_filtered[country_col].isin(top5)].groupby(
-            [year_col, country_col])[collab_cols[0]].mean().reset_index()
+            [year_col, country_col])[collab_col].mean().reset_index()
         
-        fig = px.line(collab_trend, x=year_col, y=collab_cols[0], color=country_col,
+        fig = px.line(collab_trend, x=year_col, y=collab_col, color=country_col,
                      markers=True, title="국가별 협력 비율 변화")
         st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
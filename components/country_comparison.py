@@ -5,8 +5,9 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from utils.schema import resolve_schema
 
-def render_country_comparison(paper_filtered, patent_filtered):
+def render_country_comparison(paper_filtered, patent_filtered, paper_schema=None, patent_schema=None):
     """국가별 종합 비교"""
     st.header("🌍 국가별 종합 비교")
     
@@ -14,32 +15,38 @@ def render_country_comparison(paper_filtered, patent_filtered):
         st.info("데이터가 없습니다.")
         return
     
-    # Top 10 국가 선정
-    country_col_paper = [c for c in paper_filtered.columns if c.lower() in ['country', '국가']][0] if paper_filtered is not None else None
-    country_col_patent = [c for c in patent_filtered.columns if c.lower() in ['country', '국가']][0] if patent_filtered is not None else None
+    # 컬럼 찾기
+    paper_schema = paper_schema or resolve_schema(paper_filtered)
+    patent_schema = patent_schema or resolve_schema(patent_filtered)
+    for schema in [paper_schema, patent_schema]:
+        if schema is not None and not schema.has('country', 'papers'):
+            st.info(f"필요한 컬럼이 없습니다: {', '.join(schema.missing('country', 'papers'))}")
+            return
     
     # 국가별 집계
     if paper_filtered is not None:
-        papers_col = [c for c in paper_filtered.columns if 'total' in c.lower() and 'paper' in c.lower()][0]
-        h_col = [c for c in paper_filtered.columns if 'h_index' in c.lower()]
+        country_col_paper = paper_schema['country']
+        papers_col = paper_schema['papers']
+        h_col = paper_schema.get('h_index')
         
         # agg_dict 구성
         agg_dict = {papers_col: 'sum'}
         if h_col:
-            agg_dict[h_col[0]] = 'mean'
+            agg_dict[h_col] = 'mean'
         
         paper_metrics = paper_filtered.groupby(country_col_paper).agg(agg_dict)
         paper_metrics.columns = ['논문수', 'H-index'] if h_col else ['논문수']
         top_countries = paper_metrics.nlargest(10, '논문수').index
     
     if patent_filtered is not None:
-        patents_col = [c for c in patent_filtered.columns if 'total' in c.lower() and 'paper' in c.lower()][0]
-        triadic_col = [c for c in patent_filtered.columns if 'triadic' in c.lower()]
+        country_col_patent = patent_schema['country']
+        patents_col = patent_schema['papers']
+        triadic_col = patent_schema.get('triadic')
         
         # agg_dict 구성
         agg_dict = {patents_col: 'sum'}
         if triadic_col:
-            agg_dict[triadic_col[0]] = 'mean'
+            agg_dict[triadic_col] = 'mean'
         
         patent_metrics = patent_filtered.groupby(country_col_patent).agg(agg_dict)
         patent_metrics.columns = ['특허수', 'Triadic비율'] if triadic_col else ['특허수']
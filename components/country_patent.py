@@ -4,8 +4,10 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
+from utils.schema import resolve_schema
+from utils.chart_payload import compact_figure
 
-def render_country_patent(patent_filtered):
+def render_country_patent(patent_filtered, schema=None):
     """국가별 특허 경쟁력 분석"""
     st.header("🔬 국가별 특허 경쟁력")
     
@@ -13,17 +15,25 @@ def render_country_patent(patent_filtered):
         st.info("특허 데이터가 없습니다.")
         return
     
-    country_col = [c for c in patent_filtered.columns if c.lower() in ['country', '국가']][0]
-    year_col = [c for c in patent_filtered.columns if c.lower() in ['year', '연도']][0]
-    patents_col = [c for c in patent_filtered.columns if 'total' in c.lower() and 'paper' in c.lower()][0]
+    schema = schema or resolve_schema(patent_filtered)
+    if not schema.has('country', 'year', 'papers'):
+        st.info(f"필요한 컬럼이 없습니다: {', '.join(schema.missing('country', 'year', 'papers'))}")
+        return
+    
+    country_col = schema['country']
+    year_col = schema['year']
+    patents_col = schema['papers']
+    triadic_col = schema.get('triadic')
+    
+    # 문자열 연도 컬럼은 숫자로 변환해 사용
+    patent_filtered = schema.coerce(patent_filtered, 'year')
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Triadic 특허 비율
-        triadic_cols = [c for c in patent_filtered.columns if 'triadic' in c.lower()]
-        if triadic_cols:
-            country_triadic = patent_filtered.groupby(country_col)[triadic_cols[0]].mean().nlargest(15)
+        if triadic_col:
+            country_triadic = patent_filtered.groupby(country_col)[triadic_col].mean().nlargest(15)
             
             fig = px.bar(country_triadic, orientation='h',
                         title="국가별 Triadic 특허 비율",
@@ -33,9 +43,9 @@ def render_country_patent(patent_filtered):
     
     with col2:
         # 특허 패밀리 크기
-        family_cols = [c for c in patent_filtered.columns if 'family' in c.lower()]
-        if family_cols:
-            country_family = patent_filtered.groupby(country_col)[family_cols[0]].mean().nlargest(15)
+        family_col = schema.get('family')
+        if family_col:
+            country_family = patent_filtered.groupby(country_col)[family_col].mean().nlargest(15)
             
             fig = px.bar(country_family, orientation='h',
                         title="국가별 평균 특허 패밀리 크기",
@@ -48,20 +58,20 @@ def render_country_patent(patent_filtered):
     
     top5 = patent_filtered.groupby(country_col)[patents_col].sum().nlargest(5).index
     
-    if triadic_cols:
+    if triadic_col:
         quality_trend = patent_filtered[patent_filtered[country_col].isin(top5)].groupby(
-            [year_col, country_col])[triadic_cols[0]].mean().reset_index()
+            [year_col, country_col])[triadic_col].mean().reset_index()
         
-        fig = px.line(quality_trend, x=year_col, y=triadic_cols[0], color=country_col,
+        fig = px.line(quality_trend, x=year_col, y=triadic_col, color=country_col,
                      markers=True, title="Triadic 특허 비율 변화")
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(compact_figure(fig), use_container_width=True)
     
     # 특허 인용 영향력
-    citation_cols = [c for c in patent_filtered.columns if 'citation' in c.lower()]
-    if citation_cols:
+    citation_col = schema.get('citations')
+    if citation_col:
         st.subheader("국가별 특허 인용 영향력")
         
-        country_citation = patent_filtered.groupby(country_col)[citation_cols[0]].mean().nlargest(10)
+        country_citation = patent_filtered.groupby(country_col)[citation_col].mean().nlargest(10)
         
         citation_df = country_citation.reset_index()
         citation_df.columns = ['Country', 'Citations']
@@ -70,4 +80,4 @@ def render_country_patent(patent_filtered):
                         x='Country', y='Citations',
                         size='Citations',
                         title="평균 특허 인용수")
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        st.plotly_chart(compact_figure(fig), use_container_width=True)
\ No newline at end of file
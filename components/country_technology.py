@@ -4,8 +4,9 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+from utils.schema import resolve_schema
 
-def render_country_technology(paper_filtered, patent_filtered):
+def render_country_technology(paper_filtered, patent_filtered, paper_schema=None, patent_schema=None):
     """국가별 기술 포트폴리오 분석"""
     st.header("🔬 국가별 기술 포트폴리오")
     
@@ -13,22 +14,26 @@ def render_country_technology(paper_filtered, patent_filtered):
         st.info("데이터가 없습니다.")
         return
     
+    # 컬럼 찾기
+    paper_schema = paper_schema or resolve_schema(paper_filtered)
+    patent_schema = patent_schema or resolve_schema(patent_filtered)
+    
     col1, col2 = st.columns(2)
     
     with col1:
         if paper_filtered is not None:
             st.subheader("논문 기술 분야 분포")
             
-            country_col = [c for c in paper_filtered.columns if c.lower() in ['country', '국가']][0]
-            tech_col = [c for c in paper_filtered.columns if any(k in c.lower() for k in ['label', 'tech', '기술'])]
+            country_col = paper_schema.get('country')
+            tech_col = paper_schema.get('tech')
             
-            if tech_col:
+            if country_col and tech_col:
                 # 상위 5개국의 기술 분포
                 top5 = paper_filtered.groupby(country_col).size().nlargest(5).index
                 tech_dist = paper_filtered[paper_filtered[country_col].isin(top5)].groupby(
-                    [country_col, tech_col[0]]).size().reset_index(name='count')
+                    [country_col, tech_col]).size().reset_index(name='count')
                 
-                fig = px.sunburst(tech_dist, path=[country_col, tech_col[0]], values='count',
+                fig = px.sunburst(tech_dist, path=[country_col, tech_col], values='count',
                                 title="국가-기술 계층 구조")
                 st.plotly_chart(fig, use_container_width=True)
     
@@ -36,15 +41,15 @@ def render_country_technology(paper_filtered, patent_filtered):
         if patent_filtered is not None:
             st.subheader("특허 기술 분야 분포")
             
-            country_col = [c for c in patent_filtered.columns if c.lower() in ['country', '국가']][0]
-            tech_col = [c for c in patent_filtered.columns if any(k in c.lower() for k in ['label', 'tech', '기술'])]
+            country_col = patent_schema.get('country')
+            tech_col = patent_schema.get('tech')
             
-            if tech_col:
+            if country_col and tech_col:
                 top5 = patent_filtered.groupby(country_col).size().nlargest(5).index
                 tech_dist = patent_filtered[patent_filtered[country_col].isin(top5)].groupby(
-                    [country_col, tech_col[0]]).size().reset_index(name='count')
+                    [country_col, tech_col]).size().reset_index(name='count')
                 
-                fig = px.treemap(tech_dist, path=[px.Constant("All"), country_col, tech_col[0]], 
+                fig = px.treemap(tech_dist, path=[px.Constant("All"), country_col, tech_col], 
                                values='count', title="특허 기술 분포")
                 st.plotly_chart(fig, use_container_width=True)
     
@@ -52,15 +57,15 @@ def render_country_technology(paper_filtered, patent_filtered):
     st.subheader("국가별 기술 다양성 (Herfindahl Index)")
     
     if paper_filtered is not None:
-        country_col = [c for c in paper_filtered.columns if c.lower() in ['country', '국가']][0]
-        tech_col = [c for c in paper_filtered.columns if any(k in c.lower() for k in ['label', 'tech', '기술'])]
+        country_col = paper_schema.get('country')
+        tech_col = paper_schema.get('tech')
         
-        if tech_col:
+        if country_col and tech_col:
             diversity_data = []
             top10 = paper_filtered.groupby(country_col).size().nlargest(10).index
         
             for country in top10:
-                country_tech = paper_filtered[paper_filtered[country_col] == country][tech_col[0]].value_counts(normalize=True)
+                country_tech = paper_filtered[paper_filtered[country_col] == country][tech_col].value_counts(normalize=True)
                 herfindahl = (country_tech ** 2).sum()
                 diversity_data.append({'Country': country, 'Herfindahl': herfindahl})
             
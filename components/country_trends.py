@@ -5,8 +5,9 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+from utils.schema import resolve_schema
 
-def render_country_trends(paper_filtered, patent_filtered):
+def render_country_trends(paper_filtered, patent_filtered, schema=None):
     """국가별 시계열 분석"""
     st.header("📈 국가별 시계열 추이")
     
@@ -15,9 +16,17 @@ def render_country_trends(paper_filtered, patent_filtered):
         return
     
     # 컬럼 찾기
-    year_col = [c for c in paper_filtered.columns if c.lower() in ['year', '연도']][0]
-    country_col = [c for c in paper_filtered.columns if c.lower() in ['country', '국가']][0]
-    papers_col = [c for c in paper_filtered.columns if 'total' in c.lower() and 'paper' in c.lower()][0]
+    schema = schema or resolve_schema(paper_filtered)
+    if not schema.has('year', 'country', 'papers'):
+        st.info(f"필요한 컬럼이 없습니다: {', '.join(schema.missing('year', 'country', 'papers'))}")
+        return
+    
+    year_col = schema['year']
+    country_col = schema['country']
+    papers_col = schema['papers']
+    
+    # 문자열 연도 컬럼은 숫자로 변환해 사용
+    paper_filtered = schema.coerce(paper_filtered, 'year')
     
     # 상위 10개국 선정
     top10 = paper_filtered.groupby(country_col)[papers_col].sum().nlargest(10).index
@@ -52,11 +61,11 @@ def render_country_trends(paper_filtered, patent_filtered):
     
     # H-index 시계열
     st.subheader("국가별 H-index 추이")
-    h_col = [c for c in paper_filtered.columns if 'h_index' in c.lower()]
+    h_col = schema.get('h_index')
     if h_col:
-        h_yearly = paper_filtered[paper_filtered[country_col].isin(top10[:5])].groupby([year_col, country_col])[h_col[0]].mean().reset_index()
+        h_yearly = paper_filtered[paper_filtered[country_col].isin(top10[:5])].groupby([year_col, country_col])[h_col].mean().reset_index()
         
-        fig = px.line(h_yearly, x=year_col, y=h_col[0], color=country_col,
+        fig = px.line(h_yearly, x=year_col, y=h_col, color=country_col,
                      markers=True, title="H-index 시계열 변화")
         st.plotly_chart(fig, use_container_width=True)
     
@@ -1,84 +1,121 @@
 # components/paper_metrics.py
 import streamlit as st
 import plotly.express as px
-from utils.helpers import get_available_metrics
+from utils.helpers import get_available_metrics, compute_country_means
+from utils.figure_batch import FigureBatch, emit_figure
+from utils.instrumentation import traced
+from utils.schema import resolve_schema
 
-def render_paper_metrics(paper_df, countries, metrics):
-    """논문 지표 시각화"""
-    if paper_df is None or paper_df.empty or 'Country' not in paper_df.columns:
+PAPER_VOLUME_METRICS = [
+    ('논문 건수', '논문 수'),
+    ('Total_Papers', '논문 수'),
+    ('논문 점유율(%)', '논문 점유율 (%)'),
+    ('논문 증가율(%)', '논문 증가율 (%)')
+]
+
+PAPER_IMPACT_METRICS = [
+    ('Total_Citations', '총 인용 수'),
+    ('Avg_Citations', '평균 인용 수'),
+    ('H_Index', 'H-Index'),
+    ('H-index', 'H-Index'),
+    ('논문 영향력', '논문 영향력')
+]
+
+PAPER_QUALITY_METRICS = [
+    ('Top10_Ratio(%)', 'Top 10% 논문 비율 (%)'),
+    ('Top 10% 비율(%)', 'Top 10% 논문 비율 (%)'),
+    ('Q1_Ratio(%)', 'Q1 논문 비율 (%)'),
+    ('Q1 논문 비율(%)', 'Q1 논문 비율 (%)'),
+    ('Avg_mrnif', '평균 MRNIF'),
+    ('MRNIF 평균', '평균 MRNIF'),
+    ('Collaboration_Ratio(%)', '국제협력 비율 (%)'),
+    ('국제협력 비율(%)', '국제협력 비율 (%)')
+]
+
+# 이 섹션이 읽는 컬럼 (로더의 컬럼 프로젝션에 사용)
+REQUIRED_COLUMNS = ['Country'] + (
+    [metric for metric, _ in PAPER_VOLUME_METRICS] +
+    [metric for metric, _ in PAPER_IMPACT_METRICS] +
+    [metric for metric, _ in PAPER_QUALITY_METRICS]
+)
+
+def build_metric_bar(country_metric, metric, metric_name, color_scale='Blues'):
+    """국가별 지표 바차트 생성 (특허 지표 섹션도 함께 사용)"""
+    fig = px.bar(
+        country_metric,
+        x='Country',
+        y=metric,
+        title=f"국가별 {metric_name}",
+        labels={'Country': '국가', metric: metric_name},
+        color=metric,
+        color_continuous_scale=color_scale,
+        height=400
+    )
+    
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+@traced('render')
+def render_paper_metrics(paper_df, countries, metrics, fingerprint=None, figures=None, schema=None):
+    """논문 지표 시각화 (figures 배치가 있으면 차트는 배치에 등록)"""
+    if paper_df is None or paper_df.empty:
         st.warning("표시할 논문 데이터가 없습니다.")
         return
     
-    # 선택한 국가만 필터링
-    filtered_df = paper_df[paper_df['Country'].isin(countries)].copy()
-    
-    if filtered_df.empty:
-        st.warning("선택한 국가의 논문 데이터가 없습니다.")
+    schema = schema or resolve_schema(paper_df)
+    if not schema.has('country'):
+        st.warning(f"필요한 컬럼이 없습니다: {', '.join(schema.missing('country'))}")
         return
     
     # 사용 가능한 지표 확인
-    available_metrics = get_available_metrics(filtered_df, metrics)
+    available_metrics = get_available_metrics(paper_df, metrics)
     
     if not available_metrics:
-        st.warning(f"표시할 지표가 없습니다. 사용 가능한 컬럼: {', '.join(filtered_df.columns)}")
+        st.warning(f"표시할 지표가 없습니다. 사용 가능한 컬럼: {', '.join(paper_df.columns)}")
+        return
+    
+    # 선택한 국가의 국가별 지표 평균을 한 번의 질의로 계산
+    countries = tuple(sorted(countries))
+    country_metrics = compute_country_means(
+        paper_df,
+        countries,
+        tuple(metric for metric, _ in available_metrics),
+        schema['country'],
+        fingerprint=fingerprint
+    )
+    
+    if country_metrics.empty:
+        st.warning("선택한 국가의 논문 데이터가 없습니다.")
         return
     
     # 지표별 시각화
     for metric, metric_name in available_metrics:
-        # 국가별 지표 값 계산
-        country_metric = filtered_df.groupby('Country')[metric].mean().reset_index()
-        country_metric = country_metric.sort_values(metric, ascending=False)
+        # 국가별 지표 값
+        country_metric = country_metrics[['Country', metric]].sort_values(metric, ascending=False)
         
-        # 바차트 생성
-        fig = px.bar(
-            country_metric,
-            x='Country',
-            y=metric,
-            title=f"국가별 {metric_name}",
-            labels={'Country': '국가', metric: metric_name},
-            color=metric,
-            color_continuous_scale='Blues',
-            height=400
+        # 바차트 생성 (같은 집계/옵션이면 캐시된 figure 재사용)
+        emit_figure(
+            figures, fingerprint, 'paper_metric_bar',
+            build_metric_bar, (country_metric, metric, metric_name),
+            countries=countries, metric=metric, metric_name=metric_name
         )
-        
-        fig.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
 
-def paper_metrics_section(paper_df, selected_countries):
-    """논문 지표 섹션"""
+@traced('section')
+def paper_metrics_section(paper_df, selected_countries, fingerprint=None, progressive=False, schema=None):
+    """논문 지표 섹션 (집계 후 차트는 작업자 풀에서 한꺼번에 생성, schema는 main에서 한 번 계산한 매핑)"""
     st.header("논문 성과 지표")
+    figures = FigureBatch(progressive=progressive)
     
     # 논문 총량 지표
     st.subheader("논문 총량 지표")
-    paper_volume_metrics = [
-        ('논문 건수', '논문 수'),
-        ('Total_Papers', '논문 수'),
-        ('논문 점유율(%)', '논문 점유율 (%)'),
-        ('논문 증가율(%)', '논문 증가율 (%)')
-    ]
-    render_paper_metrics(paper_df, selected_countries, paper_volume_metrics)
+    render_paper_metrics(paper_df, selected_countries, PAPER_VOLUME_METRICS, fingerprint, figures, schema)
     
     # 논문 영향력 지표
     st.subheader("논문 영향력 지표")
-    paper_impact_metrics = [
-        ('Total_Citations', '총 인용 수'),
-        ('Avg_Citations', '평균 인용 수'),
-        ('H_Index', 'H-Index'),
-        ('H-index', 'H-Index'),
-        ('논문 영향력', '논문 영향력')
-    ]
-    render_paper_metrics(paper_df, selected_countries, paper_impact_metrics)
+    render_paper_metrics(paper_df, selected_countries, PAPER_IMPACT_METRICS, fingerprint, figures, schema)
     
     # 논문 품질 지표
     st.subheader("논문 품질 지표")
-    paper_quality_metrics = [
-        ('Top10_Ratio(%)', 'Top 10% 논문 비율 (%)'),
-        ('Top 10% 비율(%)', 'Top 10% 논문 비율 (%)'),
-        ('Q1_Ratio(%)', 'Q1 논문 비율 (%)'),
-        ('Q1 논문 비율(%)', 'Q1 논문 비율 (%)'),
-        ('Avg_mrnif', '평균 MRNIF'),
-        ('MRNIF 평균', '평균 MRNIF'),
-        ('Collaboration_Ratio(%)', '국제협력 비율 (%)'),
-        ('국제협력 비율(%)', '국제협력 비율 (%)')
-    ]
-    render_paper_metrics(paper_df, selected_countries, paper_quality_metrics)
\ No newline at end of file
+    render_paper_metrics(paper_df, selected_countries, PAPER_QUALITY_METRICS, fingerprint, figures, schema)
+    
+    figures.render()
\ No newline at end of file
@@ -4,8 +4,9 @@ Patent Analysis 컴포넌트
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
+from utils.schema import resolve_schema
 
-def render_patent_analysis(patent_filtered):
+def render_patent_analysis(patent_filtered, schema=None):
     """Patent Landscape Analysis 렌더링"""
     st.header("🔬 Patent Landscape Analysis")
     
@@ -13,13 +14,15 @@ def render_patent_analysis(patent_filtered):
         st.info("특허 데이터가 없습니다.")
         return
     
+    schema = schema or resolve_schema(patent_filtered)
+    
     col1, col2 = st.columns(2)
     
     with col1:
         # Herfindahl Index
-        tech_col = [c for c in patent_filtered.columns if any(k in c.lower() for k in ['label', 'tech'])]
+        tech_col = schema.get('tech')
         if tech_col:
-            tech_dist = patent_filtered[tech_col[0]].value_counts(normalize=True)
+            tech_dist = patent_filtered[tech_col].value_counts(normalize=True)
             herfindahl = (tech_dist ** 2).sum()
             
             st.metric("Herfindahl Index", f"{herfindahl:.3f}")
@@ -35,19 +38,19 @@ def render_patent_analysis(patent_filtered):
     
     with col2:
         # Patent Quality
-        triadic_cols = [c for c in patent_filtered.columns if 'triadic' in c.lower()]
-        family_cols = [c for c in patent_filtered.columns if 'family' in c.lower()]
+        triadic_col = schema.get('triadic')
+        family_col = schema.get('family')
         
-        if triadic_cols and family_cols:
+        if triadic_col and family_col:
             quality_metrics = patent_filtered.agg({
-                triadic_cols[0]: 'mean',
-                family_cols[0]: 'mean'
+                triadic_col: 'mean',
+                family_col: 'mean'
             })
             
             fig = go.Figure()
             fig.add_trace(go.Indicator(
                 mode="gauge+number",
-                value=quality_metrics[triadic_cols[0]] * 100,
+                value=quality_metrics[triadic_col] * 100,
                 title={'text': "Triadic Patent Ratio (%)"},
                 gauge={'axis': {'range': [None, 100]},
                       'bar': {'color': "darkblue"},
@@ -61,9 +64,9 @@ def render_patent_analysis(patent_filtered):
     # Forward Citations
     st.subheader("Patent Forward Citations")
     
-    citation_cols = [c for c in patent_filtered.columns if 'citation' in c.lower()]
-    if citation_cols:
-        fig = px.histogram(patent_filtered, x=citation_cols[0],
+    citation_col = schema.get('citations')
+    if citation_col:
+        fig = px.histogram(patent_filtered, x=citation_col,
                          title="Forward Citation Distribution",
                          nbins=50)
         st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
@@ -6,8 +6,9 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 from scipy import stats
+from utils.schema import resolve_schema
 
-def render_publication_analysis(paper_filtered):
+def render_publication_analysis(paper_filtered, schema=None):
     """Publication Analysis 렌더링"""
     st.header("📈 Publication Analysis")
     
@@ -16,8 +17,16 @@ def render_publication_analysis(paper_filtered):
         return
     
     # 컬럼 찾기
-    year_col = [c for c in paper_filtered.columns if c.lower() in ['year', '연도']][0]
-    papers_col = [c for c in paper_filtered.columns if 'total' in c.lower() and 'paper' in c.lower()][0]
+    schema = schema or resolve_schema(paper_filtered)
+    if not schema.has('year', 'papers'):
+        st.info(f"필요한 컬럼이 없습니다: {', '.join(schema.missing('year', 'papers'))}")
+        return
+    
+    year_col = schema['year']
+    papers_col = schema['papers']
+    
+    # 문자열 연도 컬럼은 숫자로 변환해 사용
+    paper_filtered = schema.coerce(paper_filtered, 'year')
     
     col1, col2 = st.columns(2)
     
@@ -4,8 +4,9 @@ Research Front 컴포넌트
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
+from utils.schema import resolve_schema
 
-def render_research_front(paper_filtered):
+def render_research_front(paper_filtered, schema=None):
     """Research Front Analysis 렌더링"""
     st.header("🌐 Research Front & Emerging Topics")
     
@@ -14,8 +15,16 @@ def render_research_front(paper_filtered):
         return
     
     # 컬럼 찾기
-    tech_col = [c for c in paper_filtered.columns if any(k in c.lower() for k in ['label', 'tech', '기술'])]
-    year_col = [c for c in paper_filtered.columns if c.lower() in ['year', '연도']][0]
+    schema = schema or resolve_schema(paper_filtered)
+    if not schema.has('year'):
+        st.info("필요한 컬럼이 없습니다: year")
+        return
+    
+    tech_col = schema.get('tech')
+    year_col = schema['year']
+    
+    # 문자열 연도 컬럼은 숫자로 변환해 사용
+    paper_filtered = schema.coerce(paper_filtered, 'year')
     
     # Burst Detection
     st.subheader("📈 Research Burst Detection")
@@ -23,8 +32,8 @@ def render_research_front(paper_filtered):
     if tech_col:
         recent_years = paper_filtered[year_col].max() - 2
         
-        recent_tech = paper_filtered[paper_filtered[year_col] >= recent_years].groupby(tech_col[0]).size()
-        total_tech = paper_filtered.groupby(tech_col[0]).size()
+        recent_tech = paper_filtered[paper_filtered[year_col] >= recent_years].groupby(tech_col).size()
+        total_tech = paper_filtered.groupby(tech_col).size()
         
         burst_strength = (recent_tech / 3) / (total_tech / len(paper_filtered[year_col].unique()))
         burst_strength = burst_strength.sort_values(ascending=False).head(15)
@@ -41,11 +50,11 @@ def render_research_front(paper_filtered):
     st.subheader("🔄 Technology Life Cycle")
     
     if tech_col:
-        top_techs = paper_filtered[tech_col[0]].value_counts().head(5).index
+        top_techs = paper_filtered[tech_col].value_counts().head(5).index
         
         fig = go.Figure()
         for tech in top_techs:
-            tech_data = paper_filtered[paper_filtered[tech_col[0]] == tech]
+            tech_data = paper_filtered[paper_filtered[tech_col] == tech]
             yearly_tech = tech_data.groupby(year_col).size()
             yearly_tech_norm = yearly_tech / yearly_tech.max()
             
@@ -78,8 +87,8 @@ def render_research_front(paper_filtered):
     
     with col2:
         # Innovation Index
-        if 'mrnif' in paper_filtered.columns.str.lower().str.join(''):
-            mrnif_col = [c for c in paper_filtered.columns if 'mrnif' in c.lower()][0]
+        mrnif_col = schema.get('mrnif')
+        if mrnif_col:
             yearly_innovation = paper_filtered.groupby(year_col)[mrnif_col].mean()
             
             fig = px.line(yearly_innovation, 
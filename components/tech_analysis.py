@@ -2,70 +2,96 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from utils.fingerprint import fingerprint_cache
+from utils.figure_batch import FigureBatch, emit_figure
+from utils.instrumentation import traced
+from utils.schema import resolve_schema
 
-def render_technology_distribution(df, tech_col='label_m', title_col='label_m_title'):
-    """기술 분류별 분포 시각화"""
-    if df is None or df.empty or tech_col not in df.columns:
-        st.warning(f"표시할 {tech_col} 데이터가 없습니다.")
-        return
-    
-    # 기술 분류별 집계
+# 이 섹션이 읽는 컬럼 (로더의 컬럼 프로젝션에 사용)
+REQUIRED_COLUMNS = ['Country', 'label_m', 'label_m_title', 'label_s', 'label_s_title']
+
+@fingerprint_cache
+def compute_tech_counts(df, tech_col, title_col):
+    """기술 분류별 건수 (상위 20개)"""
     if title_col in df.columns:
         # 제목 컬럼이 있는 경우
         tech_counts = df.groupby([tech_col, title_col]).size().reset_index(name='count')
-        tech_counts['label'] = tech_counts.apply(lambda x: f"{x[tech_col]}: {x[title_col]}", axis=1)
+        tech_counts['label'] = tech_counts[tech_col].astype(str) + ': ' + tech_counts[title_col].astype(str)
     else:
         # 제목 컬럼이 없는 경우
         tech_counts = df.groupby(tech_col).size().reset_index(name='count')
         tech_counts['label'] = tech_counts[tech_col].astype(str)
     
-    # 정렬
-    tech_counts = tech_counts.sort_values('count', ascending=False)
-    
-    # 상위 20개만 선택
-    if len(tech_counts) > 20:
-        tech_counts = tech_counts.head(20)
-    
-    # 트리맵 생성
-    fig = px.treemap(
+    # 정렬 후 상위 20개만 선택
+    return tech_counts.sort_values('count', ascending=False).head(20)
+
+@fingerprint_cache
+def compute_country_tech(df, countries, tech_col, country_col='Country'):
+    """선택한 국가의 국가-기술 분류 교차표 (행 이름은 country_col과 관계없이 'Country')"""
+    filtered_df = df[df[country_col].isin(countries)]
+    return pd.crosstab(filtered_df[country_col], filtered_df[tech_col]).fillna(0).rename_axis('Country')
+
+def build_tech_treemap(tech_counts, tech_col):
+    """기술 분류별 분포 트리맵 생성"""
+    return px.treemap(
         tech_counts,
         path=['label'],
         values='count',
         title=f"기술 분류별 분포 ({tech_col})",
         height=500
     )
+
+def build_country_tech_heatmap(country_tech):
+    """국가별 기술 분포 히트맵 생성"""
+    fig = px.imshow(
+        country_tech,
+        labels=dict(x="기술 분류", y="국가", color="건수"),
+        title="국가별 기술 분포 히트맵",
+        color_continuous_scale="Viridis"
+    )
     
-    st.plotly_chart(fig, use_container_width=True)
+    fig.update_layout(height=500)
+    return fig
 
-def render_country_tech_heatmap(df, countries, tech_col='label_m', title_col='label_m_title'):
-    """국가별 기술 분포 히트맵"""
-    if df is None or df.empty or 'Country' not in df.columns or tech_col not in df.columns:
-        st.warning(f"표시할 국가-기술 데이터가 없습니다.")
+@traced('render')
+def render_technology_distribution(df, tech_col='label_m', title_col='label_m_title', fingerprint=None,
+                                   figures=None):
+    """기술 분류별 분포 시각화 (figures 배치가 있으면 차트는 배치에 등록)"""
+    if df is None or df.empty or tech_col not in df.columns:
+        st.warning(f"표시할 {tech_col} 데이터가 없습니다.")
         return
     
-    # 선택한 국가만 필터링
-    filtered_df = df[df['Country'].isin(countries)].copy()
+    # 기술 분류별 집계
+    tech_counts = compute_tech_counts(df, tech_col, title_col, fingerprint=fingerprint)
     
-    if filtered_df.empty:
-        st.warning("선택한 국가의 데이터가 없습니다.")
+    # 트리맵 생성 (같은 집계/옵션이면 캐시된 figure 재사용)
+    emit_figure(
+        figures, fingerprint, 'tech_treemap',
+        build_tech_treemap, (tech_counts, tech_col),
+        tech_col=tech_col, title_col=title_col
+    )
+
+@traced('render')
+def render_country_tech_heatmap(df, countries, tech_col='label_m', title_col='label_m_title', fingerprint=None,
+                                figures=None, schema=None):
+    """국가별 기술 분포 히트맵 (figures 배치가 있으면 차트는 배치에 등록)"""
+    if df is None or df.empty or tech_col not in df.columns:
+        st.warning(f"표시할 국가-기술 데이터가 없습니다.")
         return
     
-    # 기술 분류 컬럼 준비
-    if title_col in filtered_df.columns:
-        # 기술 분류 이름이 있는 경우
-        tech_label = filtered_df[title_col]
-    else:
-        # 기술 분류 ID만 있는 경우
-        tech_label = filtered_df[tech_col].astype(str)
-    
-    # 기술 분류 목록 (상위 10개)
-    top_techs = filtered_df.groupby(tech_col).size().nlargest(10).index.tolist()
+    schema = schema or resolve_schema(df)
+    if not schema.has('country'):
+        st.warning(f"필요한 컬럼이 없습니다: {', '.join(schema.missing('country'))}")
+        return
     
     # 국가-기술 분류 교차표
-    country_tech = pd.crosstab(filtered_df['Country'], filtered_df[tech_col])
+    country_tech = compute_country_tech(
+        df, tuple(sorted(countries)), tech_col, schema['country'], fingerprint=fingerprint
+    )
     
-    # 상위 기술만 선택
-    country_tech = country_tech.fillna(0)
+    if country_tech.empty:
+        st.warning("선택한 국가의 데이터가 없습니다.")
+        return
     
     # 선택한 국가만 필터링
     if not all(country in country_tech.index for country in countries):
@@ -78,20 +104,20 @@ def render_country_tech_heatmap(df, countries, tech_col='label_m', title_col='la
     else:
         country_tech = country_tech.loc[countries]
     
-    # 히트맵 생성
-    fig = px.imshow(
-        country_tech,
-        labels=dict(x="기술 분류", y="국가", color="건수"),
-        title="국가별 기술 분포 히트맵",
-        color_continuous_scale="Viridis"
+    # 히트맵 생성 (같은 집계/옵션이면 캐시된 figure 재사용, 국가 순서도 키에 포함)
+    emit_figure(
+        figures, fingerprint, 'country_tech_heatmap',
+        build_country_tech_heatmap, (country_tech,),
+        countries=tuple(country_tech.index), tech_col=tech_col
     )
-    
-    fig.update_layout(height=500)
-    st.plotly_chart(fig, use_container_width=True)
 
-def tech_analysis_section(paper_df, patent_df, selected_countries, tech_level="38대 분류"):
-    """기술 분류 분석 섹션"""
+@traced('section')
+def tech_analysis_section(paper_df, patent_df, selected_countries, tech_level="38대 분류",
+                          paper_fingerprint=None, patent_fingerprint=None, progressive=False,
+                          paper_schema=None, patent_schema=None):
+    """기술 분류 분석 섹션 (집계 후 차트는 작업자 풀에서 한꺼번에 생성, schema는 main에서 한 번 계산한 매핑)"""
     st.header("기술 분류 분석")
+    figures = FigureBatch(progressive=progressive)
     
     # 기술 분류 컬럼 설정
     tech_col = 'label_m' if tech_level == "38대 분류" else 'label_s'
@@ -104,11 +130,11 @@ def tech_analysis_section(paper_df, patent_df, selected_countries, tech_level="3
     
     with col1:
         st.write("#### 논문 기술 분류")
-        render_technology_distribution(paper_df, tech_col, tech_title_col)
+        render_technology_distribution(paper_df, tech_col, tech_title_col, paper_fingerprint, figures)
     
     with col2:
         st.write("#### 특허 기술 분류")
-        render_technology_distribution(patent_df, tech_col, tech_title_col)
+        render_technology_distribution(patent_df, tech_col, tech_title_col, patent_fingerprint, figures)
     
     # 국가별 기술 분포
     st.subheader("국가별 기술 분포")
@@ -117,8 +143,12 @@ def tech_analysis_section(paper_df, patent_df, selected_countries, tech_level="3
     
     with col1:
         st.write("#### 논문 국가-기술 분포")
-        render_country_tech_heatmap(paper_df, selected_countries, tech_col, tech_title_col)
+        render_country_tech_heatmap(paper_df, selected_countries, tech_col, tech_title_col, paper_fingerprint,
+                                    figures, paper_schema)
     
     with col2:
         st.write("#### 특허 국가-기술 분포")
-        render_country_tech_heatmap(patent_df, selected_countries, tech_col, tech_title_col)
\ No newline at end of file
+        render_country_tech_heatmap(patent_df, selected_countries, tech_col, tech_title_col, patent_fingerprint,
+                                    figures, patent_schema)
+    
+    figures.render()
\ No newline at end of file
@@ -1,63 +1,94 @@
 # main.py - 논문/특허 성과 대시보드
 import streamlit as st
 import os
+import time
+import functools
 import pandas as pd
 
 # 유틸리티 가져오기
 from utils.data_loader import (
-    load_data, create_sample_data, preprocess_data, 
-    show_debug_info
+    load_shared_data, create_sample_data, preprocess_data, get_dataset_reloader,
+    show_debug_info, show_rerun_trace
+)
+from utils.instrumentation import start_rerun, timed
+from utils.profiler import profile_rerun, request_profile, show_profile_result
+from utils.telemetry import record_rerun
+from utils.memory import GROWTH_WINDOW, MemoryReport, track_rerun_memory
+from utils.warmup import WARMUP_WORKERS, run_warmup_jobs, start_warmup, warmup_enabled
+
+from utils.helpers import collect_required_columns
+from utils.fingerprint import dataset_fingerprint, selection_fingerprint
+from utils.schema import resolve_dataset_schema
+from utils.filter_state import FilterState, initial_query_params, sync_query_params
+from utils.ranking import (
+    PAPER_RANK_METRICS, PATENT_RANK_METRICS, build_country_ranking, select_top_countries
 )
 
 # 컴포넌트 가져오기
+from components import paper_metrics, patent_metrics, comparison, tech_analysis
 from components.paper_metrics import paper_metrics_section
 from components.patent_metrics import patent_metrics_section
 from components.comparison import comparison_section
 from components.tech_analysis import tech_analysis_section
 
+# 전처리, 국가 선정, 기술 분야 필터에 필요한 컬럼
+BASE_COLUMNS = [
+    '구분', 'Country', 'country',
+    'label_m', 'label_m_title', 'label_s', 'label_s_title',
+    'Total_Papers', '논문 건수', 'total_papers',
+    'total_papers_granted', 'patent_count'
+]
+
+# 대시보드가 읽는 컬럼 (각 섹션이 선언한 컬럼의 합집합)
+DASHBOARD_COLUMNS = collect_required_columns(
+    BASE_COLUMNS,
+    paper_metrics.REQUIRED_COLUMNS,
+    patent_metrics.REQUIRED_COLUMNS,
+    comparison.REQUIRED_COLUMNS,
+    tech_analysis.REQUIRED_COLUMNS
+)
+
+# 대시보드 탭 (선택한 탭만 계산)
+DASHBOARD_TABS = ["📝 논문 지표", "🔬 특허 지표", "📊 성과 비교", "🔍 기술 분류 분석"]
+
+# 데이터 파일 경로 목록 (첫 항목이 기본값)
+DATA_FILES = [
+    "_통합평가자료.xlsx",
+    "통합평가자료.xlsx",
+    "./통합평가자료.xlsx",
+    "../통합평가자료.xlsx"
+]
+
+# 기술 분류 레벨 → (기술 분야 ID 컬럼, 제목 컬럼)
+TECH_LEVELS = {
+    "38대 분류": ('label_m', 'label_m_title'),
+    "82대 분류": ('label_s', 'label_s_title')
+}
+
 # 페이지 설정
 st.set_page_config(page_title="논문/특허 성과 대시보드", page_icon="📊", layout="wide")
 
-# 상위 20개국 필터링 함수 (Total_Papers 기준)
-def get_top20_countries(paper_df, patent_df):
-    """논문 Total_Papers 기준 상위 20개국 필터링"""
-    # 논문 Total_Papers 기준 상위 국가
-    paper_top = []
-    if paper_df is not None and 'Country' in paper_df.columns:
-        # Total_Papers 컬럼 확인
-        paper_metric = None
-        for col in ['Total_Papers', '논문 건수', 'total_papers']:
-            if col in paper_df.columns:
-                paper_metric = col
-                break
-        
-        if paper_metric:
-            # 국가별 Total_Papers 합계 계산
-            country_papers = paper_df.groupby('Country')[paper_metric].sum()
-            # 상위 20개국 선택
-            paper_top = country_papers.nlargest(20).index.tolist()
-            st.sidebar.success(f"논문 {paper_metric} 기준 상위 20개국 선정 완료")
-        else:
-            st.sidebar.warning("논문 데이터에 Total_Papers 관련 컬럼을 찾을 수 없습니다.")
-    
-    # 선택된 국가가 없는 경우 특허 데이터에서 시도
-    if not paper_top and patent_df is not None and 'Country' in patent_df.columns:
-        patent_metric = None
-        for col in ['total_papers_granted', 'patent_count', 'total_papers']:
-            if col in patent_df.columns:
-                patent_metric = col
-                break
-        
-        if patent_metric:
-            country_patents = patent_df.groupby('Country')[patent_metric].sum()
-            paper_top = country_patents.nlargest(20).index.tolist()
-            st.sidebar.warning("논문 데이터에서 국가를 선정할 수 없어 특허 데이터 기준으로 선정했습니다.")
+# 상위 20개국 선정 함수 (Total_Papers 기준)
+def get_top20_countries(paper_df, patent_df, paper_fp=None, patent_fp=None):
+    """논문 Total_Papers 기준 상위 20개국 선정 (논문 기준을 찾을 수 없으면 특허 기준)"""
+    paper_ranking = build_country_ranking(paper_df, 'Country', tuple(PAPER_RANK_METRICS), fingerprint=paper_fp)
+    patent_ranking = build_country_ranking(patent_df, 'Country', tuple(PATENT_RANK_METRICS), fingerprint=patent_fp)
+    
+    if paper_ranking is None and paper_df is not None:
+        st.sidebar.warning("논문 데이터에 Total_Papers 관련 컬럼을 찾을 수 없습니다.")
+    
+    top_countries, basis = select_top_countries(paper_ranking, patent_ranking, n=20)
+    
+    if paper_ranking is not None:
+        st.sidebar.success(f"{basis} 기준 상위 20개국 선정 완료")
+    elif top_countries:
+        st.sidebar.warning("논문 데이터에서 국가를 선정할 수 없어 특허 데이터 기준으로 선정했습니다.")
     
     # 선택된 국가가 20개 미만인 경우 처리
-    if len(paper_top) < 20:
-        st.sidebar.warning(f"선정된 국가가 {len(paper_top)}개로 20개 미만입니다.")
+    if len(top_countries) < 20:
+        st.sidebar.warning(f"선정된 국가가 {len(top_countries)}개로 20개 미만입니다.")
     
-    return paper_top
+    return top_countries
 
 # 기술 분야 목록 가져오기 함수
 def get_tech_categories(df, tech_col, title_col=None):
@@ -97,8 +128,89 @@ def get_tech_categories(df, tech_col, title_col=None):
         # 제목이 없는 경우 ID만 반환
         return [(tid, str(tid)) for tid in tech_ids]
 
+def get_all_techs(paper_df, patent_df, tech_col, title_col=None):
+    """논문과 특허 데이터의 기술 분야 목록을 중복 없이 합쳐 ID 순으로 반환"""
+    with timed('aggregate', 'get_tech_categories'):
+        paper_techs = get_tech_categories(paper_df, tech_col, title_col)
+        patent_techs = get_tech_categories(patent_df, tech_col, title_col)
+    
+    # 중복 제거하여 통합
+    all_techs = []
+    tech_ids = set()
+    for tid, title in paper_techs + patent_techs:
+        if tid not in tech_ids:
+            all_techs.append((tid, title))
+            tech_ids.add(tid)
+    
+    # ID 기준 정렬
+    all_techs.sort(key=lambda x: x[0])
+    return all_techs
+
+def render_dashboard_tab(tab, paper_df, patent_df, selected_countries, tech_level, paper_fp, patent_fp, schema):
+    """대시보드 탭 하나의 섹션 실행 (schema: resolve_dataset_schema 결과)"""
+    if tab == DASHBOARD_TABS[0]:
+        paper_metrics_section(paper_df, selected_countries, paper_fp, progressive=True, schema=schema['paper'])
+    elif tab == DASHBOARD_TABS[1]:
+        patent_metrics_section(patent_df, selected_countries, patent_fp, schema=schema['patent'])
+    elif tab == DASHBOARD_TABS[2]:
+        comparison_section(paper_df, patent_df, selected_countries, paper_fp, patent_fp,
+                           paper_schema=schema['paper'], patent_schema=schema['patent'])
+    elif tab == DASHBOARD_TABS[3]:
+        tech_analysis_section(paper_df, patent_df, selected_countries, tech_level, paper_fp, patent_fp,
+                              progressive=True, paper_schema=schema['paper'], patent_schema=schema['patent'])
+
+def warm_default_views(file_path=None, workers=WARMUP_WORKERS):
+    """
+    기본 화면(상위 20개국 전체, 기술 분야 전체)의 캐시를 두 분류 레벨의 모든 탭에 대해 미리 계산
+    
+    데이터 로드(컬럼 캐시 생성, 공유 데이터셋 발행)와 국가 순위는 한 번만 계산하고, 분류 레벨 × 탭 섹션은 스레드 풀에서 실행합니다.
+    main()과 같은 함수와 인자로 지문을 만들므로 첫 사용자의 재실행이 같은 캐시 키를 찾습니다.
+    
+    Parameters:
+    -----------
+    file_path : str, optional
+        데이터 파일 경로 (기본값: DATA_FILES의 첫 항목)
+    workers : int
+        예열 작업자 수
+        
+    Returns:
+    --------
+    pandas.DataFrame
+        작업별 시간과 오류 (job, seconds, error)
+    """
+    file_path = file_path or DATA_FILES[0]
+    start = time.perf_counter()
+    df = load_shared_data(file_path, columns=DASHBOARD_COLUMNS)
+    if df is None:
+        raise FileNotFoundError(f"파일을 로드할 수 없습니다: {file_path}")
+    dataset_fp = dataset_fingerprint(file_path, df, columns=DASHBOARD_COLUMNS)
+    paper_df, patent_df = preprocess_data(df)
+    schema = resolve_dataset_schema(paper_df, patent_df)
+    top_countries = get_top20_countries(
+        paper_df, patent_df,
+        selection_fingerprint(dataset_fp, kind='paper'),
+        selection_fingerprint(dataset_fp, kind='patent')
+    )
+    loaded = pd.DataFrame([{'job': "데이터 로드", 'seconds': time.perf_counter() - start, 'error': None}])
+    
+    jobs = []
+    for tech_level, (tech_col, title_col) in TECH_LEVELS.items():
+        tech_ids = [tid for tid, _ in get_all_techs(paper_df, patent_df, tech_col, title_col)]
+        filter_state = FilterState.from_selection(top_countries, tech_ids, top_countries, tech_ids, level=tech_col)
+        paper_fp = selection_fingerprint(dataset_fp, kind='paper', filter=filter_state.key)
+        patent_fp = selection_fingerprint(dataset_fp, kind='patent', filter=filter_state.key)
+        for tab in DASHBOARD_TABS:
+            job = functools.partial(render_dashboard_tab, tab, paper_df, patent_df, top_countries,
+                                    tech_level, paper_fp, patent_fp, schema)
+            jobs.append((f"{tech_level} {tab}", job))
+    
+    return pd.concat([loaded, run_warmup_jobs(jobs, workers)], ignore_index=True)
+
 def main():
     """메인 함수"""
+    # 재실행 계측 시작 (디버깅 정보에 단계별 시간 표시)
+    trace = start_rerun()
+    
     # 대시보드 제목
     st.title("📊 논문/특허 성과 대시보드")
     st.markdown("## 상위 20개국 기준 논문 및 특허 성과 분석")
@@ -106,18 +218,13 @@ def main():
     # 사이드바 설정
     st.sidebar.title("🔍 데이터 설정")
     
-    # 파일 경로 목록
-    file_paths = [
-        "_통합평가자료.xlsx",
-        "통합평가자료.xlsx",
-        "./통합평가자료.xlsx",
-        "../통합평가자료.xlsx"
-    ]
+    # 공유 링크로 들어온 경우 URL의 필터 상태를 기본값으로 사용
+    shared_params = initial_query_params()
     
     # 파일 경로 선택
     file_path = st.sidebar.selectbox(
         "데이터 파일 선택",
-        options=file_paths,
+        options=DATA_FILES,
         index=0
     )
     
@@ -128,8 +235,12 @@ def main():
         if custom_path:
             file_path = custom_path
     
-    # 데이터 로드
-    df = load_data(file_path)
+    # 데이터 파일이 바뀌면 백그라운드에서 새 버전을 만들어 다음 재실행부터 사용
+    get_dataset_reloader().watch(DATA_FILES)
+    
+    # 데이터 로드 (대시보드가 사용하는 컬럼만, 서버 프로세스끼리 메모리 맵으로 공유)
+    with timed('load', 'load_data'):
+        df = load_shared_data(file_path, columns=DASHBOARD_COLUMNS)
     
     # 데이터 로드 실패 시 샘플 데이터 사용
     if df is None:
@@ -138,22 +249,45 @@ def main():
         if use_sample:
             df = create_sample_data()
             st.info("샘플 데이터를 사용합니다.")
+            file_path = None
         else:
             st.stop()
     
+    # 데이터셋 버전 지문 (캐시 키로 데이터프레임 대신 사용)
+    with timed('load', 'dataset_fingerprint'):
+        dataset_fp = dataset_fingerprint(file_path, df, columns=DASHBOARD_COLUMNS)
+    
     # 데이터 전처리
-    paper_df, patent_df = preprocess_data(df)
+    with timed('load', 'preprocess_data'):
+        paper_df, patent_df = preprocess_data(df)
     
-    # 디버깅 정보 표시
+    # 논리 필드 → 컬럼 매핑 (데이터셋 버전마다 한 번 계산해 모든 섹션에 전달, 기술 분야 필터는 컬럼을 바꾸지 않음)
+    with timed('load', 'resolve_schema'):
+        schema = resolve_dataset_schema(paper_df, patent_df)
+    
+    # 디버깅 정보 표시 (재실행 계측은 모든 섹션이 끝난 뒤 채움)
     show_debug = st.sidebar.checkbox("디버깅 정보 표시")
+    debug_panel = None
+    memory = None
     if show_debug:
-        show_debug_info(df, paper_df, patent_df)
+        debug_panel = show_debug_info(df, paper_df, patent_df, schema)
+        # 중간 데이터프레임의 크기와 원본과 공유하는 메모리
+        memory = MemoryReport(df)
+        memory.add('preprocess_data', 논문=paper_df, 특허=patent_df)
+        st.sidebar.button(
+            "다음 재실행 프로파일링", on_click=request_profile,
+            help="버튼을 누르면 바로 이어지는 재실행을 샘플링 프로파일러로 실행합니다."
+        )
     
     # 상위 20개국 필터링 (Total_Papers 기준)
     st.sidebar.markdown("### 국가 선정")
     st.sidebar.markdown("논문 Total_Papers 기준 상위 20개국이 자동으로 선정됩니다.")
     
-    top_countries = get_top20_countries(paper_df, patent_df)
+    top_countries = get_top20_countries(
+        paper_df, patent_df,
+        selection_fingerprint(dataset_fp, kind='paper'),
+        selection_fingerprint(dataset_fp, kind='patent')
+    )
     
     # 선정된 국가 목록 표시
     if top_countries:
@@ -161,11 +295,15 @@ def main():
         countries_df = pd.DataFrame({'국가': top_countries})
         st.sidebar.dataframe(countries_df, hide_index=True)
     
+    # URL 필터 상태의 국가 (없으면 모든 상위 국가를 기본값으로 설정)
+    shared_state = FilterState.from_query_params(shared_params, top_countries, [])
+    default_countries = shared_state.countries if shared_state and shared_state.countries else top_countries
+    
     # 국가 선택 옵션
     selected_countries = st.sidebar.multiselect(
         "분석할 국가 선택",
         options=top_countries,
-        default=top_countries  # 모든 상위 국가를 기본값으로 설정
+        default=default_countries
     )
     
     if not selected_countries:
@@ -179,31 +317,12 @@ def main():
     tech_level = st.sidebar.radio(
         "기술 분류 레벨",
         options=["38대 분류", "82대 분류"],
-        index=0
+        index=1 if shared_params.get('l') == 'label_s' else 0
     )
     
-    # 선택한 분류 레벨에 따라 기술 분야 목록 가져오기
-    if tech_level == "38대 분류":
-        tech_col = 'label_m'
-        title_col = 'label_m_title'
-    else:  # "82대 분류"
-        tech_col = 'label_s'
-        title_col = 'label_s_title'
-    
-    # 기술 분야 목록 가져오기 (논문과 특허 데이터 모두에서)
-    paper_techs = get_tech_categories(paper_df, tech_col, title_col)
-    patent_techs = get_tech_categories(patent_df, tech_col, title_col)
-    
-    # 중복 제거하여 통합
-    all_techs = []
-    tech_ids = set()
-    for tid, title in paper_techs + patent_techs:
-        if tid not in tech_ids:
-            all_techs.append((tid, title))
-            tech_ids.add(tid)
-    
-    # ID 기준 정렬
-    all_techs.sort(key=lambda x: x[0])
+    # 선택한 분류 레벨에 따라 기술 분야 목록 가져오기 (논문과 특허 데이터 모두에서)
+    tech_col, title_col = TECH_LEVELS[tech_level]
+    all_techs = get_all_techs(paper_df, patent_df, tech_col, title_col)
     
     # 기술 분야 선택
     st.sidebar.markdown(f"**{tech_level}에서 분석할 기술 분야를 선택하세요:**")
@@ -221,10 +340,19 @@ def main():
     
     # 기술 분야 선택 옵션
     tech_options = ["전체"] + [f"{tid}: {title}" for tid, title in filtered_techs]
+    
+    # URL 필터 상태의 기술 분야 (같은 분류 레벨일 때만, 없으면 전체)
+    default_techs = ["전체"]
+    if shared_params.get('l') == tech_col:
+        shared_state = FilterState.from_query_params(shared_params, top_countries, [tid for tid, _ in all_techs])
+        if shared_state and shared_state.categories and not shared_state.all_categories:
+            shared_ids = set(shared_state.categories)
+            default_techs = [f"{tid}: {title}" for tid, title in filtered_techs if tid in shared_ids] or ["전체"]
+    
     selected_techs = st.sidebar.multiselect(
         "기술 분야 선택",
         options=tech_options,
-        default=["전체"]
+        default=default_techs
     )
     
     # 선택된 기술 분야 ID 추출
@@ -233,37 +361,66 @@ def main():
     else:
         selected_tech_ids = [int(tech.split(":")[0]) for tech in selected_techs]
     
+    # 정규화된 필터 상태 (선택 순서와 무관하게 같은 필터는 같은 캐시 키)
+    filter_state = FilterState.from_selection(
+        top_countries, [tid for tid, _ in all_techs],
+        selected_countries, selected_tech_ids, level=tech_col
+    )
+    sync_query_params(filter_state)
+    
     # 선택된 기술 분야로 데이터 필터링
-    if "전체" not in selected_techs:
-        if paper_df is not None and tech_col in paper_df.columns:
-            paper_df = paper_df[paper_df[tech_col].isin(selected_tech_ids)].copy()
+    if not filter_state.all_categories:
+        with timed('filter', 'tech_filter'):
+            if paper_df is not None and tech_col in paper_df.columns:
+                paper_df = paper_df[paper_df[tech_col].isin(selected_tech_ids)].copy()
+            
+            if patent_df is not None and tech_col in patent_df.columns:
+                patent_df = patent_df[patent_df[tech_col].isin(selected_tech_ids)].copy()
         
-        if patent_df is not None and tech_col in patent_df.columns:
-            patent_df = patent_df[patent_df[tech_col].isin(selected_tech_ids)].copy()
+        if memory is not None:
+            memory.add('tech_filter', 논문=paper_df, 특허=patent_df)
+    
+    # 필터링된 논문/특허 데이터 지문
+    paper_fp = selection_fingerprint(dataset_fp, kind='paper', filter=filter_state.key)
+    patent_fp = selection_fingerprint(dataset_fp, kind='patent', filter=filter_state.key)
     
     # 필터링 후 데이터가 비어있는지 확인
     if (paper_df is None or paper_df.empty) and (patent_df is None or patent_df.empty):
         st.warning("선택한 조건에 맞는 데이터가 없습니다. 필터를 조정해보세요.")
         return
     
-    # 대시보드 구성
-    tab1, tab2, tab3, tab4 = st.tabs(["📝 논문 지표", "🔬 특허 지표", "📊 성과 비교", "🔍 기술 분류 분석"])
+    # 대시보드 구성 (탭을 바꾸면 재실행해 선택한 탭만 계산)
+    tabs = st.tabs(DASHBOARD_TABS, key="active_tab", on_change="rerun")
+    active_tab = st.session_state.get("active_tab", DASHBOARD_TABS[0])
     
-    with tab1:
-        paper_metrics_section(paper_df, selected_countries)
-    
-    with tab2:
-        patent_metrics_section(patent_df, selected_countries)
-    
-    with tab3:
-        comparison_section(paper_df, patent_df, selected_countries)
-    
-    with tab4:
-        tech_analysis_section(paper_df, patent_df, selected_countries, tech_level)
+    for tab, container in zip(DASHBOARD_TABS, tabs):
+        if container.open:
+            with container:
+                render_dashboard_tab(tab, paper_df, patent_df, selected_countries, tech_level,
+                                     paper_fp, patent_fp, schema)
     
     # 푸터
     st.markdown("---")
     st.caption("© 2025 논문/특허 성과 대시보드")
+    
+    # 세션 메모리가 재실행마다 계속 늘면 경고
+    growth = track_rerun_memory()
+    if growth is not None:
+        st.sidebar.warning(
+            f"최근 {GROWTH_WINDOW}번의 재실행 동안 메모리 사용량이 계속 늘었습니다 (+{growth / 1e6:,.0f} MB)."
+        )
+    
+    # 재실행 계측 결과 (디버깅 정보 안에 표시, CT_TELEMETRY_PATH가 있으면 파일에도 기록)
+    if debug_panel is not None:
+        show_rerun_trace(debug_panel, trace, memory)
+    record_rerun(trace, filter_state, active_tab, paper_df, patent_df)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # CT_WARMUP=1이면 프로세스의 첫 재실행에서 기본 화면 캐시 예열을 백그라운드로 한 번 시작
+    if warmup_enabled():
+        start_warmup(warm_default_views)
+    
+    # 프로파일링을 요청한 재실행만 프로파일러로 실행
+    with profile_rerun():
+        main()
+    show_profile_result()
\ No newline at end of file
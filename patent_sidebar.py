@@ -1,13 +1,96 @@
 import streamlit as st
 import pandas as pd
+from utils.hierarchy import ClassificationHierarchy, LEAF_LEVEL
+from utils.filter_state import FilterState
+from utils.ranking import CountryRanking
+from utils.fingerprint import frame_fingerprint
 
-def create_patent_sidebar(data):
+# 레벨별 데이터 사전 형식의 독립 특허 대시보드용 사이드바 (main.py의 논문/특허 대시보드는 사용하지 않음)
+
+def level_data_fingerprint(data):
+    """분류 큐브 캐시 키 (82대 분류 metadata 내용 지문, 처음 한 번 계산해 attrs에 보관)"""
+    if LEAF_LEVEL not in data or 'metadata' not in data[LEAF_LEVEL]:
+        return None
+    metadata = data[LEAF_LEVEL]['metadata']
+    if 'fingerprint' not in metadata.attrs:
+        metadata.attrs['fingerprint'] = frame_fingerprint(metadata)
+    return metadata.attrs['fingerprint']
+
+@st.cache_data(show_spinner=False)
+def build_country_totals_cube(fingerprint, _data):
+    """82대 분류 리프에서 한 번 집계한 국가 × 분류 큐브 생성 (분류 트리가 없으면 None)
+    
+    데이터 사전 전체를 해시하지 않도록 fingerprint(level_data_fingerprint)를 캐시 키로 씁니다.
+    분류 트리는 82대 분류 metadata의 상위 레벨 라벨 컬럼(label_2, label_9, label_38)에서 만듭니다.
+    실제 데이터의 레벨 시트에는 이 컬럼이 없으므로 82대 분류 시트에 상위 라벨을 추가해야 하며,
+    없으면 None을 반환해 레벨별 metadata를 합산하는 방식으로 대체합니다.
+    """
+    if fingerprint is None:
+        return None
+    hierarchy = ClassificationHierarchy.from_level_data(_data)
+    if hierarchy is None:
+        return None
+    
+    metadata = _data[LEAF_LEVEL]['metadata']
+    if 'country' not in metadata.columns or 'total_papers' not in metadata.columns:
+        return None
+    
+    return hierarchy.leaf_cube(metadata, sum_cols=['total_papers'])
+
+# 분류 레벨 표시 이름
+LEVEL_NAMES = {
+    '2': '1단계 분류 (2개 카테고리)',
+    '9': '2단계 분류 (9개 카테고리)',
+    '38': '3단계 분류 (38개 카테고리)',
+    '82': '4단계 분류 (82개 카테고리)'
+}
+
+# 연도 선택 범위
+MIN_YEAR = 2012
+MAX_YEAR = 2024
+
+def get_all_countries(data):
+    """모든 레벨 데이터의 국가 목록 (정렬)"""
+    all_countries = set()
+    for lvl in data:
+        if 'metadata' in data[lvl] and 'country' in data[lvl]['metadata'].columns:
+            all_countries.update(data[lvl]['metadata']['country'].unique())
+    return sorted(list(all_countries))
+
+def get_top_country_names(data, n=20):
+    """논문 수 기준 상위 국가 목록 (분류 트리가 있으면 리프 집계 기준, 없으면 모든 레벨 데이터 통합)"""
+    cube = build_country_totals_cube(level_data_fingerprint(data), data)
+    if cube is not None:
+        country_totals = cube.country_totals('total_papers')
+    else:
+        frames = [
+            data[lvl]['metadata'] for lvl in data
+            if 'metadata' in data[lvl]
+            and 'country' in data[lvl]['metadata'].columns
+            and 'total_papers' in data[lvl]['metadata'].columns
+        ]
+        if not frames:
+            return []
+        country_totals = pd.concat([f[['country', 'total_papers']] for f in frames]).groupby('country')['total_papers'].sum()
+    
+    return CountryRanking({'total_papers': country_totals}).top(n)
+
+def get_level_categories(data, level):
+    """레벨의 분류 목록 (정렬, 데이터가 없으면 빈 목록)"""
+    if level in data and 'metadata' in data[level] and 'label' in data[level]['metadata'].columns:
+        return sorted(data[level]['metadata']['label'].unique().tolist())
+    return []
+
+def create_patent_sidebar(data, compact=False):
     """특허 분석 대시보드용 사이드바 생성 및 필터 설정 반환
     
     Parameters:
     -----------
     data : dict
         레벨별 데이터 사전
+    compact : bool, optional
+        True면 긴 목록을 검색 가능한 멀티셀렉트로 묶어 폼에서 한 번에 적용 (위젯 수 최소화),
+        False(기본값)면 항목마다 체크박스를 그리는 기존 방식
         
     Returns:
     --------
@@ -17,13 +100,75 @@ def create_patent_sidebar(data):
     st.sidebar.title("🔍 필터 설정")
     st.sidebar.markdown("---")
     
+    if compact:
+        filter_config = create_compact_filters(data)
+    else:
+        filter_config = create_checkbox_filters(data)
+    
+    # 정규화된 필터 상태 (선택 순서와 무관하게 같은 필터는 같은 캐시 키, URL 공유용)
+    level = filter_config['level']
+    level_categories = get_level_categories(data, level)
+    filter_config['state'] = FilterState.from_selection(
+        get_all_countries(data), level_categories,
+        filter_config['selected_countries'],
+        filter_config['selected_categories'].get(level, level_categories),
+        filter_config['year_range'], level
+    )
+    
+    return filter_config
+
+def create_compact_filters(data):
+    """폼 하나에 멀티셀렉트로 구성한 필터 (적용 버튼을 누를 때만 한 번 재실행)
+    
+    빈 선택은 전체 선택으로 처리합니다.
+    """
+    filter_config = {}
+    all_countries = get_all_countries(data)
+    top_country_names = get_top_country_names(data)
+    
+    with st.sidebar.form("patent_filter_form"):
+        year_range = st.slider("📅 연도 범위", MIN_YEAR, MAX_YEAR, (2015, 2023))
+        filter_config['year_range'] = tuple(year_range)
+        
+        selected_countries = st.multiselect(
+            "🌎 국가 (기본값: 상위 20개국)",
+            options=all_countries,
+            default=top_country_names,
+            placeholder="전체 국가"
+        )
+        filter_config['selected_countries'] = selected_countries if selected_countries else all_countries
+        
+        filter_config['selected_categories'] = {}
+        for level, level_name in LEVEL_NAMES.items():
+            categories = get_level_categories(data, level)
+            if not categories:
+                continue
+            selected = st.multiselect(
+                f"🔍 {level_name}",
+                options=categories,
+                placeholder="전체 분류"
+            )
+            filter_config['selected_categories'][level] = selected if selected else categories
+        
+        filter_config['level'] = st.selectbox(
+            "분석에 사용할 분류 레벨",
+            options=list(LEVEL_NAMES.keys()),
+            format_func=lambda x: LEVEL_NAMES[x]
+        )
+        
+        st.form_submit_button("필터 적용", use_container_width=True)
+    
+    return filter_config
+
+def create_checkbox_filters(data):
+    """항목마다 체크박스를 그리는 기존 방식의 필터"""
     # 필터 설정 저장할 딕셔너리
     filter_config = {}
     
     # 연도 범위 선택
     with st.sidebar.expander("📅 연도", expanded=True):
-        min_year = 2012
-        max_year = 2024
+        min_year = MIN_YEAR
+        max_year = MAX_YEAR
         
         # 전체 선택/해제 버튼
         col1, col2 = st.columns(2)
@@ -59,24 +204,10 @@ def create_patent_sidebar(data):
     
     # 국가 선택
     with st.sidebar.expander("🌎 국가", expanded=True):
-        all_countries = set()
-        for lvl in data:
-            if 'metadata' in data[lvl] and 'country' in data[lvl]['metadata'].columns:
-                all_countries.update(data[lvl]['metadata']['country'].unique())
-        
-        all_countries = sorted(list(all_countries))
+        all_countries = get_all_countries(data)
         
-        # 상위 20개국 계산 (모든 레벨 데이터 통합)
-        country_totals = {}
-        for lvl in data:
-            if 'metadata' in data[lvl]:
-                metadata = data[lvl]['metadata']
-                if 'country' in metadata.columns and 'total_papers' in metadata.columns:
-                    for country, papers in metadata.groupby('country')['total_papers'].sum().items():
-                        country_totals[country] = country_totals.get(country, 0) + papers
-        
-        top_countries = sorted(country_totals.items(), key=lambda x: x[1], reverse=True)[:20]
-        top_country_names = [c[0] for c in top_countries]
+        # 상위 20개국
+        top_country_names = get_top_country_names(data)
         
         # 전체 선택/해제 버튼
         col1, col2 = st.columns(2)
@@ -255,17 +386,10 @@ def create_patent_sidebar(data):
             filter_config['selected_categories']['82'] = selected_lvl82 if selected_lvl82 else lvl82_categories
     
     # 현재 보여줄 레벨 선택
-    level_names = {
-        '2': '1단계 분류 (2개 카테고리)',
-        '9': '2단계 분류 (9개 카테고리)',
-        '38': '3단계 분류 (38개 카테고리)',
-        '82': '4단계 분류 (82개 카테고리)'
-    }
-    
     level = st.sidebar.selectbox(
         "분석에 사용할 분류 레벨",
-        options=list(level_names.keys()),
-        format_func=lambda x: level_names[x]
+        options=list(LEVEL_NAMES.keys()),
+        format_func=lambda x: LEVEL_NAMES[x]
     )
     
     filter_config['level'] = level
@@ -0,0 +1,207 @@
+# utils/aggregate_store.py
+import importlib
+import json
+import os
+import threading
+import uuid
+
+import pandas as pd
+
+# 집계 결과 디스크 캐시 위치와 최대 크기 (Parquet 파일 합계)
+AGGREGATE_CACHE_DIR = os.path.join('.ct_cache', 'aggregates')
+AGGREGATE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# 파일 형식 버전 (인코딩이 바뀌면 올려서 이전 파일을 무시)
+STORE_FORMAT = 1
+
+# Parquet 스키마 메타데이터 키
+METADATA_KEY = b'ct_aggregate'
+
+ENTRY_SUFFIX = '.parquet'
+
+# 디렉터리를 다시 훑어 크기를 확인하는 저장 횟수 간격 (다른 프로세스가 쓴 파일 반영)
+EVICT_EVERY = 64
+
+
+def _json_label(label):
+    """컬럼 라벨을 JSON 값으로 변환 (변환할 수 없으면 TypeError)"""
+    if hasattr(label, 'item'):
+        label = label.item()
+    if label is None or isinstance(label, (str, int, float, bool)):
+        return label
+    raise TypeError(f"저장할 수 없는 컬럼 라벨입니다: {label!r}")
+
+
+def encode(value):
+    """집계 결과를 (Parquet 테이블용 데이터프레임, 메타데이터)로 변환 (저장할 수 없으면 None)
+
+    데이터프레임은 그대로, to_store_frame()/from_store_frame()을 구현한 객체(예: CountryRanking)는
+    데이터프레임으로 바꿔 저장합니다. 문자열이 아닌 컬럼 라벨(교차표 등)은 메타데이터로 보관합니다.
+    """
+    kind = None
+    if not isinstance(value, pd.DataFrame):
+        if not hasattr(value, 'to_store_frame'):
+            return None
+        kind = f"{type(value).__module__}:{type(value).__qualname__}"
+        value = value.to_store_frame()
+
+    if isinstance(value.columns, pd.MultiIndex):
+        return None
+    try:
+        labels = [_json_label(col) for col in value.columns]
+        columns_name = _json_label(value.columns.name)
+    except TypeError:
+        return None
+
+    frame = value.copy(deep=False)
+    frame.columns = [f"c{i}" for i in range(len(labels))]
+    metadata = {'format': STORE_FORMAT, 'kind': kind, 'columns': labels, 'columns_name': columns_name}
+    return frame, metadata
+
+
+def decode(frame, metadata):
+    """encode의 역변환"""
+    frame.columns = pd.Index(metadata['columns'], name=metadata['columns_name'])
+    if metadata['kind'] is None:
+        return frame
+    module, qualname = metadata['kind'].split(':')
+    cls = importlib.import_module(module)
+    for part in qualname.split('.'):
+        cls = getattr(cls, part)
+    return cls.from_store_frame(frame)
+
+
+class AggregateStore:
+    """집계 결과를 키별 Parquet 파일(zstd)로 보관하는 디스크 캐시
+
+    - 임시 파일에 쓴 뒤 os.replace로 교체하므로 여러 서버 프로세스가 같은 디렉터리를 공유해도
+      읽는 쪽은 완성된 파일만 봅니다.
+    - 읽을 때 수정 시각을 갱신하고, 합계가 max_bytes를 넘으면 수정 시각이 오래된 파일부터 지웁니다 (LRU).
+    - 다른 프로세스가 지운 파일, 깨진 파일은 캐시 미적중으로 처리합니다.
+    """
+
+    def __init__(self, root=AGGREGATE_CACHE_DIR, max_bytes=AGGREGATE_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # 마지막으로 훑은 뒤의 합계 추정치와 저장 횟수 (저장할 때마다 디렉터리를 훑지 않도록)
+        self._estimated_bytes = None
+        self._puts_since_scan = 0
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}{ENTRY_SUFFIX}")
+
+    def get(self, key):
+        """저장된 집계 결과 (없으면 None)"""
+        import pyarrow.parquet as pq
+
+        path = self._path(key)
+        try:
+            table = pq.read_table(path)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        raw = (table.schema.metadata or {}).get(METADATA_KEY)
+        if raw is None:
+            return None
+        metadata = json.loads(raw)
+        if metadata.get('format') != STORE_FORMAT:
+            return None
+        return decode(table.to_pandas(), metadata)
+
+    def put(self, key, value):
+        """집계 결과 저장 (저장할 수 없는 값이면 False)
+
+        타입이 섞인 object 컬럼(예: 엑셀 원본의 1과 'x')처럼 Arrow로 바꿀 수 없는 결과는
+        문자열로 바꾸면 다시 읽은 값이 달라지므로 저장하지 않습니다.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        encoded = encode(value)
+        if encoded is None:
+            return False
+        frame, metadata = encoded
+
+        try:
+            table = pa.Table.from_pandas(frame, preserve_index=True)
+        except (ValueError, TypeError, pa.ArrowException):
+            return False
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[METADATA_KEY] = json.dumps(metadata, ensure_ascii=False).encode('utf-8')
+        table = table.replace_schema_metadata(schema_metadata)
+
+        path = self._path(key)
+        staging = f"{path}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        try:
+            pq.write_table(table, staging, compression='zstd')
+            size = os.path.getsize(staging)
+            os.replace(staging, path)
+        except (OSError, ValueError, TypeError, pa.ArrowException):
+            if os.path.exists(staging):
+                os.remove(staging)
+            return False
+
+        if self._should_evict(size):
+            self.evict()
+        return True
+
+    def _should_evict(self, size):
+        """방금 쓴 파일 크기를 추정치에 더하고 디렉터리를 다시 훑어야 하는지 판단
+
+        처음 저장할 때, 추정치가 max_bytes를 넘을 때, EVICT_EVERY번 저장할 때마다 훑습니다.
+        """
+        with self._lock:
+            self._puts_since_scan += 1
+            if self._estimated_bytes is None or self._puts_since_scan >= EVICT_EVERY:
+                return True
+            self._estimated_bytes += size
+            return self._estimated_bytes > self.max_bytes
+
+    def entries(self):
+        """저장된 파일 (경로, 바이트, 수정 시각) 목록 - 오래된 순"""
+        entries = []
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def evict(self):
+        """합계가 max_bytes 이하가 될 때까지 오래된 파일 삭제"""
+        with self._lock:
+            entries = self.entries()
+            total = sum(size for _, size, _ in entries)
+            for path, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= size
+            self._estimated_bytes = total
+            self._puts_since_scan = 0
+
+    def stats(self):
+        """파일 수와 합계 바이트"""
+        entries = self.entries()
+        return {'entries': len(entries), 'bytes': sum(size for _, size, _ in entries), 'max_bytes': self.max_bytes}
+
+    def clear(self):
+        """모든 파일 삭제"""
+        for path, _, _ in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._estimated_bytes = 0
+            self._puts_since_scan = 0
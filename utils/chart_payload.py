@@ -0,0 +1,187 @@
+# utils/chart_payload.py
+import numpy as np
+import plotly.graph_objects as go
+
+# 표시 정밀도 (유효숫자)
+DISPLAY_DIGITS = 4
+
+# 이 점 개수를 넘는 산점도는 WebGL(scattergl)로 그림
+WEBGL_THRESHOLD = 1000
+
+# 이 점 개수를 넘는 선 그래프는 LTTB로 다운샘플링
+MAX_LINE_POINTS = 2000
+
+# 숫자 배열로 압축할 trace 속성 (그려지는 좌표만, 호버 전용 customdata는 원래 정밀도 유지)
+ARRAY_ATTRIBUTES = ('x', 'y', 'z', 'values')
+MARKER_ATTRIBUTES = ('size', 'color')
+
+
+def round_significant(values, digits=DISPLAY_DIGITS):
+    """원소마다 자기 크기 기준 유효숫자로 반올림 (정수 배열은 그대로)
+
+    배열 최댓값 하나로 자릿수를 정하면 큰 값과 함께 있는 작은 값(비율 등)이 0으로 뭉개지므로
+    원소별 자릿수로 반올림합니다. 0, NaN, inf는 그대로 둡니다.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind != 'f':
+        return values
+    with np.errstate(divide='ignore', invalid='ignore'):
+        magnitude = np.floor(np.log10(np.abs(values)))
+    magnitude = np.where(np.isfinite(magnitude), magnitude, 0)
+    with np.errstate(invalid='ignore', over='ignore'):
+        scale = 10.0 ** (digits - 1 - magnitude)
+        rounded = np.round(values * scale) / scale
+    # 아주 작은 값은 배율이 넘쳐 inf/nan이 되므로 원래 값 사용
+    return np.where(np.isfinite(rounded), rounded, values)
+
+
+def compact_array(values, digits=DISPLAY_DIGITS):
+    """숫자 배열을 표시 정밀도로 반올림한 float32/최소 정수 배열로 변환 (숫자가 아니면 None)
+
+    Plotly는 numpy 배열을 base64 typed array로 직렬화하므로 JSON 숫자 목록보다 훨씬 작습니다.
+    """
+    if not isinstance(values, (list, tuple, np.ndarray)):
+        return None
+    array = np.asarray(values)
+    if array.size == 0:
+        return None
+    if array.dtype.kind == 'f':
+        return round_significant(array, digits).astype(np.float32)
+    if array.dtype.kind in 'iu':
+        return array.astype(np.result_type(np.min_scalar_type(array.min()), np.min_scalar_type(array.max())))
+    return None
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets 다운샘플링으로 남길 점의 인덱스
+
+    첫 점과 마지막 점은 항상 남기고, 나머지 구간을 n_out - 2개 버킷으로 나눠
+    이전에 고른 점과 다음 버킷 평균점으로 만든 삼각형 넓이가 가장 큰 점을 고릅니다.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    selected = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(np.argmax(area))
+        indices[i + 1] = selected
+
+    return indices
+
+
+def _numeric_positions(values):
+    """x 값을 LTTB용 숫자 좌표로 변환 (날짜는 정수 시각, 숫자가 아니면 위치)"""
+    array = np.asarray(values)
+    if array.dtype.kind in 'iuf':
+        return array.astype(float)
+    if array.dtype.kind == 'M':
+        return array.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return np.arange(len(array), dtype=float)
+
+
+def _point_count(trace):
+    """trace의 점 개수"""
+    for attr in ('x', 'y'):
+        values = trace[attr] if attr in trace else None
+        if isinstance(values, (list, tuple, np.ndarray)):
+            return len(values)
+    return 0
+
+
+def downsample_lines(fig, max_points=MAX_LINE_POINTS):
+    """점이 많은 선 그래프를 LTTB로 다운샘플링 (점별 속성도 같은 인덱스로 선택)"""
+    for trace in fig.data:
+        if trace.type not in ('scatter', 'scattergl') or 'lines' not in (trace.mode or 'lines'):
+            continue
+        n = _point_count(trace)
+        if n <= max_points or trace.x is None or trace.y is None:
+            continue
+
+        keep = lttb_indices(_numeric_positions(trace.x), trace.y, max_points)
+        for attr in ('x', 'y', 'text', 'hovertext', 'customdata'):
+            values = trace[attr]
+            if isinstance(values, (list, tuple, np.ndarray)) and len(values) == n:
+                trace[attr] = np.asarray(values)[keep]
+        for attr in MARKER_ATTRIBUTES:
+            values = trace.marker[attr]
+            if isinstance(values, (list, tuple, np.ndarray)) and len(values) == n:
+                trace.marker[attr] = np.asarray(values)[keep]
+    return fig
+
+
+def use_webgl(fig, threshold=WEBGL_THRESHOLD):
+    """산점도 점이 threshold를 넘으면 모든 scatter trace를 scattergl로 교체"""
+    scatter = [trace for trace in fig.data if trace.type == 'scatter']
+    if not scatter or sum(_point_count(trace) for trace in scatter) <= threshold:
+        return fig
+
+    traces = []
+    for trace in fig.data:
+        if trace.type == 'scatter':
+            props = trace.to_plotly_json()
+            props.pop('type', None)
+            trace = go.Scattergl(props, skip_invalid=True)
+        traces.append(trace)
+    fig.data = []
+    fig.add_traces(traces)
+    return fig
+
+
+def compact_arrays(fig, digits=DISPLAY_DIGITS):
+    """trace의 숫자 배열을 표시 정밀도의 typed array로 교체"""
+    for trace in fig.data:
+        for attr in ARRAY_ATTRIBUTES:
+            if attr not in trace:
+                continue
+            array = compact_array(trace[attr], digits)
+            if array is not None:
+                trace[attr] = array
+        if 'marker' in trace and trace.marker is not None:
+            for attr in MARKER_ATTRIBUTES:
+                if attr not in trace.marker:
+                    continue
+                array = compact_array(trace.marker[attr], digits)
+                if array is not None:
+                    trace.marker[attr] = array
+    return fig
+
+
+def compact_figure(fig, digits=DISPLAY_DIGITS, webgl_threshold=WEBGL_THRESHOLD, max_line_points=MAX_LINE_POINTS):
+    """차트 전송 크기 줄이기 (LTTB 다운샘플링 → WebGL 전환 → 표시 정밀도 typed array)
+
+    Parameters:
+    -----------
+    fig : plotly.graph_objects.Figure
+        압축할 figure (제자리에서 변경)
+    digits : int
+        표시 유효숫자
+    webgl_threshold : int
+        산점도를 scattergl로 바꾸는 점 개수 기준
+    max_line_points : int
+        선 그래프 trace당 최대 점 개수
+
+    Returns:
+    --------
+    plotly.graph_objects.Figure
+        같은 figure 객체
+    """
+    downsample_lines(fig, max_line_points)
+    use_webgl(fig, webgl_threshold)
+    compact_arrays(fig, digits)
+    return fig
@@ -0,0 +1,158 @@
+# utils/citation_network.py
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# 고정 인용 윈도우 (년)
+CITATION_WINDOWS = (3, 5)
+
+
+class CitationNetwork:
+    """특허 인용(citing → cited) 네트워크
+
+    피인용 특허를 행, 인용 특허를 열로 하는 CSR 희소 행렬에
+    인용 시차(연도 차이 + 1)를 값으로 저장합니다.
+    분류 레벨별 집계 결과는 인스턴스 안에 캐시됩니다.
+    """
+
+    def __init__(self, patents, edges, id_col='patent_id', country_col='Country',
+                 year_col='year', citing_col='citing_id', cited_col='cited_id'):
+        """
+        Parameters:
+        -----------
+        patents : pandas.DataFrame
+            특허 속성 테이블 (특허 ID, 국가, 연도, 기술 분류 컬럼)
+        edges : pandas.DataFrame
+            인용 엣지 테이블 (citing_col, cited_col)
+        """
+        self.patents = patents.reset_index(drop=True)
+        self.country_col = country_col
+        self.year_col = year_col
+        self._cache = {}
+
+        # 특허 ID가 중복되면 첫 번째 행으로 연결 (get_indexer는 중복 인덱스를 허용하지 않음)
+        first = ~self.patents[id_col].duplicated().to_numpy()
+        rows = np.flatnonzero(first)
+        index = pd.Index(self.patents[id_col].to_numpy()[first])
+        citing = index.get_indexer(edges[citing_col])
+        cited = index.get_indexer(edges[cited_col])
+
+        # 특허 테이블에 없는 엣지는 제외
+        valid = (citing >= 0) & (cited >= 0)
+        citing, cited = rows[citing[valid]], rows[cited[valid]]
+        n = len(self.patents)
+
+        # 중복 엣지 제거 (CSR 변환 시 중복 값이 합산되는 것을 방지)
+        edge_keys = np.unique(cited.astype(np.int64) * n + citing)
+        cited, citing = edge_keys // n, edge_keys % n
+
+        # 연도가 비어 있거나 숫자가 아닌 특허의 엣지는 시차를 알 수 없으므로 제외
+        years = pd.to_numeric(self.patents[year_col], errors='coerce').to_numpy(dtype=np.float64)
+        lag = years[citing] - years[cited]
+
+        # 시차 0도 희소 행렬에 남도록 1을 더해 저장 (음수 시차는 데이터 오류로 제외)
+        keep = lag >= 0
+        self.matrix = sparse.csr_matrix(
+            (lag[keep].astype(np.int64) + 1, (cited[keep], citing[keep])), shape=(n, n), dtype=np.int32
+        )
+
+    @property
+    def lags(self):
+        """엣지별 인용 시차 (년)"""
+        return self.matrix.data - 1
+
+    def _edge_rows(self):
+        """CSR 데이터 순서에 맞춘 피인용 특허 행 번호"""
+        return np.repeat(np.arange(self.matrix.shape[0]), np.diff(self.matrix.indptr))
+
+    def forward_citations(self, window=None):
+        """특허별 전방 인용 수
+
+        Parameters:
+        -----------
+        window : int, optional
+            출원 후 인용 윈도우 (년). None이면 전체 기간
+
+        Returns:
+        --------
+        numpy.ndarray
+            특허별 전방 인용 수
+        """
+        if window is None:
+            weights = np.ones(len(self.matrix.data))
+        else:
+            weights = (self.matrix.data <= window + 1).astype(np.float64)
+        return np.bincount(self._edge_rows(), weights=weights, minlength=self.matrix.shape[0])
+
+    def citation_lag_distribution(self, max_lag=None):
+        """인용 시차 분포 (시차별 인용 건수)"""
+        counts = np.bincount(self.lags)
+        if max_lag is not None:
+            counts = counts[:max_lag + 1]
+        return pd.Series(counts, index=pd.RangeIndex(len(counts), name='lag'), name='citations')
+
+    def _edge_countries(self):
+        """엣지별 (인용 국가 코드, 피인용 국가 코드, 국가 목록) - 한쪽 국가가 비어 있는 엣지는 제외"""
+        country_codes, countries = pd.factorize(self.patents[self.country_col], sort=True)
+        citing_country = country_codes[self.matrix.indices]
+        cited_country = country_codes[self._edge_rows()]
+        known = (citing_country >= 0) & (cited_country >= 0)
+        return citing_country[known], cited_country[known], countries
+
+    def self_citation_ratio(self):
+        """국가별 자국 인용 비율 (피인용 국가 기준)"""
+        citing_country, cited_country, countries = self._edge_countries()
+        n_countries = len(countries)
+
+        total = np.bincount(cited_country, minlength=n_countries)
+        own = np.bincount(cited_country, weights=citing_country == cited_country, minlength=n_countries)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(total > 0, own / total, np.nan)
+        return pd.Series(ratio, index=pd.Index(countries, name='Country'), name='self_citation_ratio')
+
+    def knowledge_flow_matrix(self):
+        """국가 간 지식 흐름 행렬 (행: 피인용 국가 → 열: 인용 국가)"""
+        citing_country, cited_country, countries = self._edge_countries()
+        n_countries = len(countries)
+
+        flows = np.bincount(
+            cited_country * n_countries + citing_country, minlength=n_countries * n_countries
+        ).reshape(n_countries, n_countries)
+
+        return pd.DataFrame(
+            flows,
+            index=pd.Index(countries, name='cited'),
+            columns=pd.Index(countries, name='citing')
+        )
+
+    def level_summary(self, tech_col):
+        """분류 레벨별 국가 × 기술 × 연도 전방 인용 지표 (레벨별 캐시)
+
+        Parameters:
+        -----------
+        tech_col : str
+            기술 분류 컬럼명 (예: 'label_m', 'label_s')
+
+        Returns:
+        --------
+        pandas.DataFrame
+            Country, tech_col, year별 patents, forward_citations,
+            forward_citations_3y, forward_citations_5y (특허당 평균)
+        """
+        if tech_col in self._cache:
+            return self._cache[tech_col]
+
+        frame = self.patents[[self.country_col, tech_col, self.year_col]].copy()
+        frame['forward_citations'] = self.forward_citations()
+        for window in CITATION_WINDOWS:
+            frame[f'forward_citations_{window}y'] = self.forward_citations(window)
+
+        metric_cols = ['forward_citations'] + [f'forward_citations_{w}y' for w in CITATION_WINDOWS]
+        grouped = frame.groupby([self.country_col, tech_col, self.year_col], sort=True)
+        summary = grouped[metric_cols].mean()
+        summary.insert(0, 'patents', grouped.size())
+        summary = summary.reset_index()
+
+        self._cache[tech_col] = summary
+        return summary
@@ -3,18 +3,104 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import os
+import zipfile
+from utils.partition_store import (
+    CACHE_WRITE_ERRORS, find_year_column, read_empty_partitioned, read_partitioned, read_source_info,
+    write_partitioned
+)
+# 컴포넌트의 필터 → 그룹 → 집계 질의 (DuckDB 설치 시 DuckDB, 아니면 pandas)
+from utils.query_backend import aggregate as query_aggregate
+from utils.schema import resolve_dataset_schema
+from utils.fingerprint import file_fingerprint, get_aggregate_store
+from utils.memory import RSS_HISTORY_KEY, get_session_registry
+from utils.shared_dataset import attach, publish, publish_lock, read_current
+from utils.dataset_watcher import DatasetReloader
+from utils.workbook import data_sheet_pattern, read_workbook
+
+# 엑셀 원본을 연도별 Parquet 파티션으로 저장하는 캐시 디렉터리
+CACHE_DIR = '.ct_cache'
+
+# 프로세스 공유 데이터셋, 시트별 캐시 디렉터리 접미사 (파티션 캐시 경로 옆)
+SHARED_SUFFIX = '.shared'
+SHEETS_SUFFIX = '.sheets'
+
+def get_cache_root(file_path):
+    """엑셀 파일에 대응하는 파티션 캐시 경로"""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR, stem)
+
+def get_source_info(file_path):
+    """캐시 유효성 확인용 원본 파일 정보 (데이터 시트 설정이 바뀌어도 캐시를 다시 만듦)"""
+    stat = os.stat(file_path)
+    return {'path': os.path.abspath(file_path), 'mtime': stat.st_mtime, 'size': stat.st_size,
+            'sheet_pattern': data_sheet_pattern()}
+
+def build_columnar_cache(file_path, df=None):
+    """엑셀 데이터를 연도별 Parquet 파티션 캐시로 저장 (실패해도 로드는 계속)"""
+    try:
+        if df is None:
+            df = pd.read_excel(file_path)
+        write_partitioned(df, get_cache_root(file_path), source=get_source_info(file_path))
+        return True
+    except CACHE_WRITE_ERRORS as e:
+        st.warning(f"컬럼 캐시를 만들 수 없어 엑셀에서 직접 로드합니다: {e}")
+        return False
+
+def is_cache_fresh(cache_info, file_path):
+    """파티션 캐시가 현재 엑셀 파일로 만들어졌는지 확인"""
+    if cache_info is None:
+        return False
+    source = get_source_info(file_path)
+    return all(cache_info.get(key) == value for key, value in source.items())
 
 @st.cache_data
-def load_data(file_path):
-    """엑셀 파일에서 데이터 로드"""
+def load_data(file_path, year_range=None, columns=None):
+    """엑셀 파일에서 데이터 로드
+
+    연도별 파티션 캐시가 최신이면 캐시에서 선택한 연도 파티션과 요청한 컬럼만 읽고,
+    없으면 엑셀을 읽어 캐시를 만든 뒤 캐시에서 읽습니다 (캐시를 만들 수 없으면 엑셀 데이터를 연도 범위와 컬럼으로 필터링).
+    columns가 None이면 모든 컬럼을 읽습니다.
+    """
     try:
         # 파일 존재 확인
         if not os.path.exists(file_path):
             st.error(f"파일이 존재하지 않습니다: {file_path}")
             return None
-            
-        # 엑셀 파일 로드
-        df = pd.read_excel(file_path)
+        
+        cache_root = get_cache_root(file_path)
+        cache_info = read_source_info(cache_root)
+        if not is_cache_fresh(cache_info, file_path):
+            # 엑셀 파일 로드 후 캐시 생성 (데이터 시트 설정이 있으면 일치하는 시트를 이어 붙임)
+            pattern = data_sheet_pattern()
+            if pattern is None:
+                df = pd.read_excel(file_path)
+            else:
+                df, _ = read_workbook(file_path, cache_root + SHEETS_SUFFIX, pattern)
+            if build_columnar_cache(file_path, df):
+                # 캐시에서 다시 읽어 이후 로드(다른 서버 프로세스 포함)와 같은 컬럼 순서/타입으로 반환
+                # (데이터셋 지문이 같아야 집계 디스크 캐시를 함께 사용)
+                cache_info = read_source_info(cache_root)
+        
+        # 파티션 캐시 로드 (연도 파티션 프루닝 + 컬럼 프로젝션)
+        if is_cache_fresh(cache_info, file_path):
+            if columns is not None:
+                columns = [col for col in columns if col in cache_info['columns']]
+            cached = read_partitioned(cache_root, year_range=year_range, columns=columns)
+            if cached is None:
+                # 연도 범위에 해당하는 파티션이 없으면 저장된 스키마의 빈 데이터 반환 (전처리에서 '구분' 컬럼 사용)
+                cached = read_empty_partitioned(cache_root, columns=columns)
+            if cached is None:
+                cached = pd.DataFrame(columns=columns if columns is not None else cache_info['columns'])
+            st.success(f"캐시 로드 성공: {file_path}, 데이터 크기: {cached.shape}")
+            return cached
+        
+        year_col = find_year_column(df)
+        if year_range is not None and year_col is not None:
+            df = df[df[year_col].between(*year_range)].reset_index(drop=True)
+        
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+        
         st.success(f"파일 로드 성공: {file_path}, 데이터 크기: {df.shape}")
         return df
     except Exception as e:
@@ -23,6 +109,117 @@ def load_data(file_path):
         st.error(f"상세 오류: {traceback.format_exc()}")
         return None
 
+def rebuild_shared_data(file_path, requested=None):
+    """엑셀 파일의 새 버전으로 컬럼 캐시를 다시 만들고 공유 데이터셋 다음 세대로 발행 (세대 번호 반환)
+    
+    컬럼 캐시가 이 파일로 만들어져 있으면 그대로 쓰고, 아니면 바뀐 시트만 다시 파싱해(utils.workbook)
+    컬럼 캐시를 다시 만듭니다. 다른 프로세스가 이미 같은 버전을 발행했으면 건너뜁니다.
+    논문/특허를 복사 없이 나눌 수 있도록 '구분' 순서로 정렬해 발행합니다.
+    
+    Parameters:
+    -----------
+    file_path : str
+        엑셀 파일 경로
+    requested : list, optional
+        발행할 컬럼 목록 (None이면 모든 컬럼)
+    """
+    cache_root = get_cache_root(file_path)
+    root = cache_root + SHARED_SUFFIX
+    with publish_lock(root):
+        # 잠금을 기다리는 동안 다른 프로세스가 발행했을 수 있으므로 다시 확인
+        current = read_current(root)
+        if _shared_covers(current, file_path, requested):
+            return current['generation']
+        
+        # 읽는 도중 파일이 바뀌면 다음 확인에서 다시 만들도록 읽기 전의 파일 정보와 지문을 기록
+        source = get_source_info(file_path)
+        fingerprint = file_fingerprint(file_path)
+        cache_info = read_source_info(cache_root)
+        sheets = None
+        if not is_cache_fresh(cache_info, file_path):
+            df, sheets = read_workbook(file_path, cache_root + SHEETS_SUFFIX, source['sheet_pattern'])
+            write_partitioned(df, cache_root, source=source)
+            cache_info = read_source_info(cache_root)
+        
+        # 컬럼 캐시에서 읽어 load_data와 같은 컬럼 순서/타입으로 발행
+        columns = None if requested is None else [col for col in requested if col in cache_info['columns']]
+        df = read_partitioned(cache_root, columns=columns)
+        if '구분' in df.columns:
+            df = df.sort_values('구분', kind='stable', ignore_index=True)
+        return publish(df, root, dict(source, fingerprint=fingerprint, requested=requested, sheets=sheets))
+
+def shared_data_is_stale(file_path):
+    """발행된 공유 데이터셋이 있고 엑셀 파일이 그 뒤에 바뀌었는지 확인"""
+    current = read_current(get_cache_root(file_path) + SHARED_SUFFIX)
+    return current is not None and os.path.exists(file_path) and not is_cache_fresh(current['source'], file_path)
+
+def refresh_shared_data(file_path):
+    """발행할 때와 같은 컬럼으로 공유 데이터셋 다시 만들기 (파일 감시 작업자가 호출)"""
+    current = read_current(get_cache_root(file_path) + SHARED_SUFFIX)
+    return rebuild_shared_data(file_path, current['source'].get('requested') if current else None)
+
+@st.cache_resource(show_spinner=False)
+def get_dataset_reloader():
+    """프로세스 전체에서 공유하는 데이터 파일 감시/재구성 작업자"""
+    return DatasetReloader(refresh_shared_data, shared_data_is_stale).start()
+
+def load_shared_data(file_path, columns=None):
+    """여러 서버 프로세스가 메모리 맵으로 공유하는 데이터셋 로드 (utils.shared_dataset)
+    
+    공유 데이터셋이 없으면 엑셀을 읽어 발행한 뒤, 있으면 바로 파일을 메모리 맵으로 붙여 복사 없이 반환합니다.
+    엑셀 파일이 바뀌었으면 재실행을 막지 않고 현재 세대를 계속 쓰면서 백그라운드 작업자에 재구성을 요청하며,
+    새 세대가 발행되면 다음 재실행부터 새 데이터를 사용합니다. 발행할 수 없으면 load_data 결과를 사용합니다.
+    
+    Parameters:
+    -----------
+    file_path : str
+        엑셀 파일 경로
+    columns : list, optional
+        읽을 컬럼 목록 (None이면 모든 컬럼)
+        
+    Returns:
+    --------
+    pandas.DataFrame or None
+        데이터프레임 (읽기 전용 버퍼, 로드 실패 시 None)
+    """
+    if not os.path.exists(file_path):
+        return load_data(file_path, columns=columns)
+    
+    root = get_cache_root(file_path) + SHARED_SUFFIX
+    # 요청 컬럼 중 파일에 있는 것만 발행되므로 발행할 때의 요청 목록과 비교
+    requested = None if columns is None else [str(col) for col in columns]
+    current = read_current(root)
+    try:
+        if current is None or not _shared_covers(current, file_path, requested, fresh=False):
+            rebuild_shared_data(file_path, requested)
+            current = read_current(root)
+        elif not is_cache_fresh(current['source'], file_path):
+            reloader = get_dataset_reloader()
+            reloader.request(file_path)
+            failure = reloader.failure(file_path)
+            if failure is not None and failure['stopped']:
+                st.warning(f"데이터 파일의 새 버전을 만들 수 없어 이전 데이터를 계속 사용합니다 "
+                           f"(현재 세대 {current['generation']}, 파일을 고치면 다시 시도): {failure['error']}")
+            else:
+                st.info(f"데이터 파일이 바뀌어 새 버전을 준비하는 중입니다. 준비되면 다음 화면 갱신부터 반영됩니다 "
+                        f"(현재 세대 {current['generation']}).")
+        path = os.path.join(root, current['file'])
+        df = attach(path, os.path.getmtime(path))
+    except CACHE_WRITE_ERRORS + (zipfile.BadZipFile,) as e:
+        # load_data는 컬럼 캐시를 만들 수 없어도 읽은 엑셀 데이터를 반환
+        st.warning(f"공유 데이터셋을 사용할 수 없어 프로세스별로 로드합니다: {e}")
+        return load_data(file_path, columns=columns)
+    
+    st.success(f"공유 데이터셋 로드 성공: {file_path}, 세대 {current['generation']}, 데이터 크기: {df.shape}")
+    return df
+
+def _shared_covers(current, file_path, requested, fresh=True):
+    """공유 데이터셋이 같은 컬럼 요청으로 발행되었는지 (fresh면 현재 엑셀 파일로 만들어졌는지도) 확인"""
+    if current is None or (fresh and not is_cache_fresh(current['source'], file_path)):
+        return False
+    published = current['source'].get('requested')
+    return published is None or (requested is not None and set(requested) <= set(published))
+
 def create_sample_data():
     """샘플 데이터 생성"""
     # 국가 목록
@@ -78,6 +275,13 @@ def create_sample_data():
     
     return pd.DataFrame(data)
 
+def _select_rows(df, mask):
+    """조건에 맞는 행 선택 (행이 연속이면 원본 버퍼를 공유하는 슬라이스, 아니면 복사)"""
+    positions = np.flatnonzero(mask.to_numpy())
+    if len(positions) and positions[-1] - positions[0] + 1 == len(positions):
+        return df.iloc[positions[0]:positions[-1] + 1]
+    return df[mask].copy()
+
 def preprocess_data(df):
     """데이터 전처리"""
     if df is None:
@@ -85,8 +289,8 @@ def preprocess_data(df):
     
     # 논문/특허 구분
     if '구분' in df.columns:
-        paper_df = df[df['구분'] == '1. 논문'].copy()
-        patent_df = df[df['구분'] == '2. 특허'].copy()
+        paper_df = _select_rows(df, df['구분'] == '1. 논문')
+        patent_df = _select_rows(df, df['구분'] == '2. 특허')
     else:
         st.error("데이터에 '구분' 컬럼이 없습니다.")
         return None, None
@@ -116,50 +320,8 @@ def preprocess_data(df):
     
     return paper_df, patent_df
 
-def get_top20_countries(paper_df, patent_df):
-    """논문과 특허 데이터에서 상위 20개국 필터링"""
-    # 논문 기준 상위 국가
-    paper_top = []
-    if paper_df is not None and 'Country' in paper_df.columns:
-        # 논문 지표 후보들
-        paper_metrics = ['논문 건수', 'Total_Papers', '논문 점유율(%)', 'H_Index']
-        
-        for metric in paper_metrics:
-            if metric in paper_df.columns:
-                paper_top = paper_df.groupby('Country')[metric].sum().nlargest(20).index.tolist()
-                st.info(f"논문 기준 상위 20개국: {', '.join(paper_top[:5])}...")
-                break
-    
-    # 특허 기준 상위 국가
-    patent_top = []
-    if patent_df is not None and 'Country' in patent_df.columns:
-        # 특허 지표 후보들
-        patent_metrics = ['total_papers_granted', 'patent_share', 'h_index', 'total_citations']
-        
-        for metric in patent_metrics:
-            if metric in patent_df.columns:
-                patent_top = patent_df.groupby('Country')[metric].sum().nlargest(20).index.tolist()
-                st.info(f"특허 기준 상위 20개국: {', '.join(patent_top[:5])}...")
-                break
-    
-    # 우선순위: 논문 top10 + 특허 top10 (중복 제거)
-    combined = list(dict.fromkeys(paper_top[:10] + patent_top[:10]))
-    
-    # 남은 자리는 논문, 특허 순위로 채움
-    if len(combined) < 20:
-        remaining = 20 - len(combined)
-        extra_countries = [c for c in paper_top[10:] + patent_top[10:] if c not in combined]
-        combined.extend(extra_countries[:remaining])
-    
-    # 최대 20개로 제한
-    top_countries = combined[:20]
-    
-    st.success(f"분석 대상 상위 20개국 선정 완료: {', '.join(top_countries)}")
-    
-    return top_countries
-    
-def show_debug_info(df, paper_df, patent_df):
-    """디버깅 정보 표시"""
+def show_debug_info(df, paper_df, patent_df, schema=None):
+    """디버깅 정보 표시 (schema: resolve_dataset_schema 결과, 없으면 여기서 계산)"""
     with st.expander("데이터 디버깅 정보", expanded=False):
         st.write("### 원본 데이터")
         st.write(f"크기: {df.shape}")
@@ -189,4 +351,85 @@ def show_debug_info(df, paper_df, patent_df):
             st.write("첫 5개 행:")
             st.dataframe(patent_df.head())
         else:
-            st.write("특허 데이터 없음")
\ No newline at end of file
+            st.write("특허 데이터 없음")
+        
+        st.write("### 스키마 매핑")
+        schema = schema or resolve_dataset_schema(paper_df, patent_df)
+        for kind, frame_schema in schema.items():
+            if frame_schema is None:
+                continue
+            st.write(f"**{kind}**: " + ", ".join(f"{field} → {col}" for field, col in frame_schema.fields.items()))
+            for field, cols in frame_schema.invalid.items():
+                st.write(f"- {field}: 숫자형이 아닌 컬럼 제외 ({', '.join(map(str, cols))})")
+        
+        history = list(get_dataset_reloader().history)
+        if history:
+            st.write("### 데이터 파일 재구성 기록")
+            reloads = pd.DataFrame(history)
+            reloads['time'] = pd.to_datetime(reloads['time'], unit='s')
+            st.dataframe(_to_ms(reloads, ['seconds']), hide_index=True)
+        
+        st.write("### 재실행 계측")
+        # 섹션 실행이 끝난 뒤 show_rerun_trace로 채울 자리
+        return st.container()
+
+def _to_ms(frame, columns):
+    """초 단위 컬럼을 밀리초로 변환"""
+    frame = frame.copy()
+    for col in columns:
+        frame[col] = (frame[col].astype(float) * 1000).round(1)
+    return frame.rename(columns={col: col.replace('seconds', 'ms').replace('_s', '_ms') for col in columns})
+
+def show_rerun_trace(container, trace, memory=None):
+    """재실행 계측 결과 표시 (단계별 시간, 섹션/render 호출, 집계 캐시 적중, 차트별 크기, 메모리)"""
+    events = trace.frame()
+    with container:
+        st.write(f"이번 재실행: {trace.elapsed * 1000:.0f} ms")
+        
+        st.write("**단계별 시간** (데이터 로드 → 필터링 → 집계 → figure 생성 → 직렬화)")
+        st.dataframe(_to_ms(trace.stage_summary(), ['seconds']))
+        
+        st.write("**섹션/render 호출** (안쪽 단계 시간 포함)")
+        calls = events[events['kind'].isin(['section', 'render'])][['kind', 'section', 'name', 'seconds']]
+        st.dataframe(_to_ms(calls, ['seconds']), hide_index=True)
+        
+        st.write("**집계 호출** (지문 캐시 적중/디스크 적중/미적중)")
+        aggregates = events[events['kind'] == 'aggregate'][['section', 'name', 'cache', 'seconds']]
+        st.dataframe(_to_ms(aggregates, ['seconds']), hide_index=True)
+        store = get_aggregate_store()
+        if store is not None:
+            stats = store.stats()
+            st.caption(f"집계 디스크 캐시: {stats['entries']:,}개, "
+                       f"{stats['bytes'] / 1e6:,.1f} / {stats['max_bytes'] / 1e6:,.0f} MB")
+        
+        st.write("**차트별** (figure 캐시, 생성/직렬화 시간, JSON 바이트)")
+        charts = trace.chart_summary()
+        # 캐시 키는 앞 8자리만 표시
+        charts['chart'] = charts['chart'].map(lambda chart: str(chart)[:8] if chart is not None else None)
+        st.dataframe(_to_ms(charts, ['figure_s', 'serialize_s']), hide_index=True)
+        
+        if memory is not None:
+            show_memory_report(memory)
+
+def show_memory_report(memory):
+    """중간 데이터프레임 크기/공유 비율, 세션 RSS 추이, 프로세스 세션별 RSS 표시"""
+    st.write("### 메모리")
+    st.write(f"이번 재실행의 데이터프레임이 참조하는 메모리: {memory.footprint / 1e6:,.1f} MB "
+             "(같은 버퍼는 한 번만 계산)")
+    frames = memory.frame()
+    for col in ['deep_bytes', 'actual_bytes', 'shared_bytes']:
+        frames[col.replace('bytes', 'mb')] = (frames.pop(col) / 1e6).round(2)
+    frames['shared_ratio'] = (frames['shared_ratio'] * 100).round(1)
+    st.dataframe(frames.rename(columns={'shared_ratio': '원본 공유 %'}), hide_index=True)
+    
+    history = st.session_state.get(RSS_HISTORY_KEY, [])
+    if history:
+        st.write(f"**이 세션의 재실행별 RSS** (현재 {history[-1] / 1e6:,.1f} MB)")
+        st.line_chart(pd.Series(history, name='RSS (MB)') / 1e6)
+    
+    sessions = get_session_registry().frame()
+    if not sessions.empty:
+        st.write(f"**프로세스 세션별 RSS** (세션 {len(sessions)}개)")
+        for col in ['first_rss', 'last_rss', 'growth']:
+            sessions[col] = (sessions[col] / 1e6).round(1)
+        st.dataframe(sessions[['session', 'reruns', 'first_rss', 'last_rss', 'growth']], hide_index=True)
\ No newline at end of file
@@ -0,0 +1,144 @@
+# utils/dataset_watcher.py
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# 데이터 파일 확인 간격 (초)
+WATCH_INTERVAL = 2.0
+
+# 재구성에 실패한 파일을 다시 시도하기까지 기다릴 시간 (초, 쓰는 중인 파일 등, 실패할 때마다 두 배로 최대 MAX_RETRY_DELAY)
+RETRY_DELAY = 30.0
+MAX_RETRY_DELAY = 1800.0
+
+# 같은 오류로 이 횟수만큼 연속 실패하면 파일이 다시 바뀔 때까지 재시도하지 않음
+MAX_SAME_FAILURES = 5
+
+# 보관할 재구성 기록 수
+RELOAD_HISTORY = 20
+
+
+def _file_state(path):
+    """파일이 바뀌었는지 비교할 (수정 시각, 크기) - 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DatasetReloader:
+    """데이터 파일 변경을 감시해 요청 경로 밖에서 데이터셋을 다시 만드는 백그라운드 작업자
+
+    감시 스레드가 주기적으로 is_stale(path)를 확인하고, 바뀐 파일은 작업자 스레드 하나에서
+    rebuild(path)로 다시 만듭니다. 같은 파일의 재구성 요청은 진행 중인 작업 하나로 합칩니다.
+    재실행은 재구성을 기다리지 않고 현재 버전을 계속 쓰다가, 새 버전이 발행되면 다음 재실행부터 사용합니다.
+    실패한 파일은 간격을 늘려 가며 다시 시도하고, 같은 오류가 반복되면 파일이 다시 바뀔 때까지 멈춥니다.
+    """
+
+    def __init__(self, rebuild, is_stale, interval=WATCH_INTERVAL):
+        """
+        Parameters:
+        -----------
+        rebuild : callable
+            파일 경로를 받아 데이터셋을 다시 만들고 새 버전(세대 번호)을 반환하는 함수
+        is_stale : callable
+            파일 경로를 받아 다시 만들어야 하는지 반환하는 함수
+        interval : float
+            파일 확인 간격 (초)
+        """
+        self.rebuild = rebuild
+        self.is_stale = is_stale
+        self.interval = interval
+        self.paths = set()
+        self.history = deque(maxlen=RELOAD_HISTORY)
+        self._pending = set()
+        self._failed = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dataset-reload')
+        self._thread = threading.Thread(target=self._watch, name='dataset-watcher', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def watch(self, paths):
+        """감시할 파일 경로 추가"""
+        with self._lock:
+            self.paths.update(paths)
+
+    def request(self, path):
+        """재구성 요청 (이미 진행 중이면 무시, 요청을 받았으면 True)"""
+        with self._lock:
+            if path in self._pending or self._waiting(path):
+                return False
+            self._pending.add(path)
+        self._executor.submit(self._reload, path)
+        return True
+
+    def failure(self, path):
+        """파일의 최근 연속 실패 정보 (error, count, stopped - 실패하지 않았으면 None)"""
+        with self._lock:
+            failure = self._failed.get(path)
+            return None if failure is None else dict(failure)
+
+    def _waiting(self, path):
+        """재시도를 기다리는 중인지 (멈춘 파일은 파일이 바뀌면 다시 시도, _lock 안에서 호출)"""
+        failure = self._failed.get(path)
+        if failure is None:
+            return False
+        if failure['stopped']:
+            if _file_state(path) == failure['file_state']:
+                return True
+            del self._failed[path]
+            return False
+        return time.monotonic() < failure['retry_at']
+
+    def _record_failure(self, path, error, file_state):
+        """실패 횟수와 다음 재시도 시각 기록 (같은 오류가 MAX_SAME_FAILURES번 반복되면 멈춤)
+
+        file_state는 재구성을 시작할 때의 파일 상태로, 멈춘 뒤 이 상태와 달라지면 다시 시도합니다.
+        """
+        with self._lock:
+            previous = self._failed.get(path)
+            count = previous['count'] + 1 if previous is not None and previous['error'] == error else 1
+            delay = min(RETRY_DELAY * 2 ** (count - 1), MAX_RETRY_DELAY)
+            self._failed[path] = {
+                'error': error,
+                'count': count,
+                'retry_at': time.monotonic() + delay,
+                'stopped': count >= MAX_SAME_FAILURES,
+                'file_state': file_state
+            }
+
+    def _reload(self, path):
+        start = time.perf_counter()
+        record = {'time': time.time(), 'path': path, 'version': None, 'seconds': None, 'error': None}
+        file_state = _file_state(path)
+        try:
+            record['version'] = self.rebuild(path)
+            with self._lock:
+                self._failed.pop(path, None)
+        except Exception as e:
+            # 쓰는 중인 파일 등은 잠시 뒤 다시 시도
+            record['error'] = f"{type(e).__name__}: {e}"
+            self._record_failure(path, record['error'], file_state)
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self.history.append(record)
+            with self._lock:
+                self._pending.discard(path)
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                paths = list(self.paths)
+            for path in paths:
+                try:
+                    stale = self.is_stale(path)
+                except OSError:
+                    continue
+                if stale:
+                    self.request(path)
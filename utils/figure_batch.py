@@ -0,0 +1,150 @@
+# utils/figure_batch.py
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import plotly.io as pio
+import streamlit as st
+
+from utils.chart_payload import compact_figure
+from utils.figure_cache import cached_figure, figure_key, get_figure_cache
+from utils.instrumentation import current_section, current_trace, timed
+
+# figure 생성 작업자 수
+FIGURE_WORKERS = min(8, os.cpu_count() or 1)
+
+# 작업자 풀 종류 ('thread' - 시작 비용 없음, 'process' - GIL 없이 멀티코어 사용)
+FIGURE_POOLS = ('thread', 'process')
+
+
+def _chart_key(key):
+    """차트 위젯 키 (내용이 같은 figure가 두 번 나와도 요소 ID가 겹치지 않도록 캐시 키 사용)"""
+    return f"figure_{key}" if key is not None else None
+
+
+def _build(build, args):
+    """figure를 만들고 전송 크기를 줄임 (figure, 생성 시간) 반환"""
+    start = time.perf_counter()
+    fig = compact_figure(build(*args))
+    return fig, time.perf_counter() - start
+
+
+def _build_json(build, args):
+    """작업 프로세스에서 figure를 만들어 JSON으로 반환 (figure 객체 대신 문자열만 전달)"""
+    fig, seconds = _build(build, args)
+    return fig.to_json(), seconds
+
+
+def show_figure(target, fig, chart_type, key=None, section=None, chart=None):
+    """figure를 출력하고 직렬화 시간 기록 (target은 st 또는 자리표시자, chart는 계측용 차트 식별자)"""
+    with timed('serialize', chart_type, section=section, chart=chart if chart is not None else key):
+        target.plotly_chart(fig, use_container_width=True, key=_chart_key(key))
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_executor(pool='thread', workers=FIGURE_WORKERS):
+    """프로세스 전체에서 공유하는 figure 작업자 풀"""
+    if pool == 'process':
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='figure')
+
+
+class FigureBatch:
+    """섹션의 figure 작업을 모아 작업자 풀에서 만들고 자리표시자에 채우는 배치
+
+    add()를 호출한 위치에 자리표시자를 만들어 두므로 레이아웃 순서는 그대로 유지됩니다.
+    Streamlit 호출(자리표시자 채우기)과 계측 기록은 모두 스크립트 스레드에서 하고, 작업자는 figure만 만듭니다.
+    """
+
+    def __init__(self, progressive=False, pool='thread', workers=FIGURE_WORKERS):
+        """
+        Parameters:
+        -----------
+        progressive : bool
+            True면 완성되는 순서대로 자리표시자를 채움 (첫 차트가 빨리 보임),
+            False면 등록 순서대로 채움
+        pool : str
+            작업자 풀 종류 ('thread' 또는 'process')
+        workers : int
+            작업자 수 (1이면 풀 없이 스크립트 스레드에서 생성)
+        """
+        if pool not in FIGURE_POOLS:
+            raise ValueError(f"지원하지 않는 작업자 풀입니다: {pool}")
+        self.progressive = progressive
+        self.pool = pool
+        self.workers = workers
+        self._jobs = []
+
+    def add(self, fingerprint, chart_type, build, args, **options):
+        """현재 위치에 자리표시자를 만들고 figure 작업 등록
+
+        build는 args를 받아 figure를 만드는 모듈 수준 함수여야 합니다 (프로세스 풀에서 피클링).
+        """
+        self._jobs.append((st.empty(), fingerprint, chart_type, build, args, options, current_section()))
+
+    def render(self):
+        """등록한 figure를 만들어 자리표시자에 출력 (캐시에 있으면 바로 출력)"""
+        cache = get_figure_cache()
+        trace = current_trace()
+        pending = []
+        for placeholder, fingerprint, chart_type, build, args, options, section in self._jobs:
+            job = (placeholder, chart_type, section)
+            key = figure_key(fingerprint, chart_type, **options) if fingerprint is not None else None
+            if key is None:
+                pending.append((job, key, build, args))
+                continue
+            start = time.perf_counter()
+            payload = cache.get_json(key)
+            if payload is None:
+                pending.append((job, key, build, args))
+                continue
+            fig = pio.from_json(payload)
+            if trace is not None:
+                trace.record('figure', chart_type, time.perf_counter() - start, section=section, chart=key,
+                             cache='hit', bytes=len(payload.encode('utf-8')))
+            show_figure(placeholder, fig, chart_type, key, section)
+        self._jobs = []
+
+        if not pending:
+            return
+
+        if self.workers <= 1:
+            for job, key, build, args in pending:
+                self._emit(cache, trace, job, key, _build(build, args))
+            return
+
+        executor = get_figure_executor(self.pool, self.workers)
+        worker = _build_json if self.pool == 'process' else _build
+        futures = {executor.submit(worker, build, args): (job, key) for job, key, build, args in pending}
+
+        for future in (as_completed(futures) if self.progressive else list(futures)):
+            job, key = futures[future]
+            self._emit(cache, trace, job, key, future.result())
+
+    def _emit(self, cache, trace, job, key, result):
+        """작업 결과(figure 또는 JSON, 생성 시간)를 캐시에 저장하고 자리표시자에 출력"""
+        placeholder, chart_type, section = job
+        fig, seconds = result
+        start = time.perf_counter()
+        size = None
+        if isinstance(fig, str):
+            if key is not None:
+                size = cache.put_json(key, fig)
+            fig = pio.from_json(fig)
+        elif key is not None:
+            size = cache.put(key, fig)
+        if trace is not None:
+            trace.record('figure', chart_type, seconds, section=section, chart=key,
+                         cache='miss' if key is not None else None, bytes=size)
+            trace.record('serialize', chart_type, time.perf_counter() - start, section=section, chart=key)
+        show_figure(placeholder, fig, chart_type, key, section)
+
+
+def emit_figure(figures, fingerprint, chart_type, build, args, **options):
+    """figure 출력 (배치가 있으면 배치에 등록, 없으면 캐시를 거쳐 바로 출력)"""
+    if figures is not None:
+        figures.add(fingerprint, chart_type, build, args, **options)
+        return
+    fig = cached_figure(fingerprint, chart_type, lambda: build(*args), **options)
+    key = figure_key(fingerprint, chart_type, **options) if fingerprint is not None else None
+    show_figure(st, fig, chart_type, key)
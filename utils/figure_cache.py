@@ -0,0 +1,129 @@
+# utils/figure_cache.py
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+import streamlit as st
+
+from utils.chart_payload import compact_figure
+from utils.fingerprint import _digest, canonical_filters
+from utils.instrumentation import timed
+
+# figure 캐시 최대 크기 (직렬화한 JSON 바이트 기준)
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class FigureCache:
+    """직렬화한 Plotly figure JSON을 바이트 상한으로 보관하는 LRU 캐시
+
+    figure 객체는 변경 가능하므로 JSON으로 저장하고, 꺼낼 때마다 새 figure를 만들어
+    세션끼리 같은 객체를 공유하지 않습니다.
+    """
+
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_json(self, key):
+        """캐시된 figure JSON (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get(self, key):
+        """캐시된 figure (없으면 None)"""
+        payload = self.get_json(key)
+        return pio.from_json(payload) if payload is not None else None
+
+    def put(self, key, fig):
+        """figure를 JSON으로 직렬화해 저장하고 JSON 바이트 수 반환"""
+        return self.put_json(key, fig.to_json())
+
+    def put_json(self, key, payload):
+        """직렬화한 figure JSON을 저장하고 상한을 넘으면 오래된 항목부터 제거 (JSON 바이트 수 반환)"""
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return size
+
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (payload, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+        return size
+
+    def clear(self):
+        """모든 항목 제거"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """캐시 통계 (항목 수, 바이트, 적중/미적중 횟수)"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """프로세스 전체에서 공유하는 figure 캐시"""
+    return FigureCache()
+
+
+def figure_key(fingerprint, chart_type, **options):
+    """(집계 지문, 차트 종류, 옵션)으로 만든 figure 캐시 키"""
+    return _digest(fingerprint, chart_type, canonical_filters(options))
+
+
+def cached_figure(fingerprint, chart_type, build, **options):
+    """캐시된 figure 반환, 없으면 build()로 만들어 전송 크기를 줄인 뒤 저장
+
+    Parameters:
+    -----------
+    fingerprint : str or None
+        figure 입력 데이터의 지문 (None이면 캐시 없이 매번 생성)
+    chart_type : str
+        차트 종류 (예: 'bar', 'treemap')
+    build : callable
+        인자 없이 figure를 만드는 함수
+    **options
+        figure 모양에 영향을 주는 옵션 (해시 가능한 값)
+
+    Returns:
+    --------
+    plotly.graph_objects.Figure
+    """
+    if fingerprint is None:
+        with timed('figure', chart_type):
+            return compact_figure(build())
+
+    key = figure_key(fingerprint, chart_type, **options)
+    cache = get_figure_cache()
+    with timed('figure', chart_type, chart=key) as info:
+        payload = cache.get_json(key)
+        if payload is not None:
+            info.update(cache='hit', bytes=len(payload.encode('utf-8')))
+            return pio.from_json(payload)
+        info['cache'] = 'miss'
+        fig = compact_figure(build())
+    with timed('serialize', chart_type, chart=key) as info:
+        info['bytes'] = cache.put(key, fig)
+    return fig
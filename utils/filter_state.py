@@ -0,0 +1,138 @@
+# utils/filter_state.py
+import streamlit as st
+
+from utils.fingerprint import _digest
+
+
+def _plain(value):
+    """numpy 스칼라를 파이썬 기본 타입으로 변환 (해시 문자열이 타입 표기에 흔들리지 않도록)"""
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _sorted_universe(values):
+    """전체 후보 목록을 정렬된 튜플로 정규화 (타입이 섞여도 정렬되도록 문자열 기준)"""
+    values = dict.fromkeys(_plain(v) for v in values)
+    return tuple(sorted(values, key=lambda v: (type(v).__name__, str(v))))
+
+
+def _to_mask(universe, selected):
+    """선택 목록 → 비트셋 (universe 순서의 비트 위치)"""
+    selected = {_plain(v) for v in selected}
+    mask = 0
+    for i, value in enumerate(universe):
+        if value in selected:
+            mask |= 1 << i
+    return mask
+
+
+def _from_mask(universe, mask):
+    """비트셋 → 선택 목록 (universe 순서)"""
+    return [value for i, value in enumerate(universe) if mask >> i & 1]
+
+
+class FilterState:
+    """정규화된 필터 상태 (국가/분류 비트셋 + 연도 범위 + 분류 레벨)
+
+    선택 순서와 무관하게 같은 필터는 같은 key를 가지므로
+    세션이 달라도 같은 캐시 결과를 재사용할 수 있고, URL 쿼리 파라미터로 공유할 수 있습니다.
+    """
+
+    def __init__(self, country_universe, category_universe, country_mask=0, category_mask=0,
+                 year_range=None, level=None):
+        self.country_universe = _sorted_universe(country_universe)
+        self.category_universe = _sorted_universe(category_universe)
+        self.country_mask = country_mask
+        self.category_mask = category_mask
+        self.year_range = tuple(int(y) for y in year_range) if year_range else None
+        self.level = str(level) if level is not None else None
+
+    @classmethod
+    def from_selection(cls, country_universe, category_universe, countries, categories,
+                       year_range=None, level=None):
+        """위젯 선택 값으로 필터 상태 생성"""
+        country_universe = _sorted_universe(country_universe)
+        category_universe = _sorted_universe(category_universe)
+        return cls(
+            country_universe, category_universe,
+            _to_mask(country_universe, countries),
+            _to_mask(category_universe, categories),
+            year_range, level
+        )
+
+    @property
+    def countries(self):
+        """선택한 국가 목록 (정렬 순서)"""
+        return _from_mask(self.country_universe, self.country_mask)
+
+    @property
+    def categories(self):
+        """선택한 분류 목록 (정렬 순서)"""
+        return _from_mask(self.category_universe, self.category_mask)
+
+    @property
+    def all_categories(self):
+        """모든 분류가 선택되었는지 여부"""
+        return self.category_mask == (1 << len(self.category_universe)) - 1
+
+    @property
+    def key(self):
+        """안정적인 필터 해시 (프로세스/세션과 무관하게 같은 값)"""
+        return _digest('filter', self.country_universe, self.category_universe,
+                       self.country_mask, self.category_mask, self.year_range, self.level)
+
+    def to_query_params(self):
+        """URL 쿼리 파라미터로 인코딩 (비트셋은 16진수)"""
+        params = {
+            'c': format(self.country_mask, 'x'),
+            't': format(self.category_mask, 'x')
+        }
+        if self.year_range:
+            params['y'] = f"{self.year_range[0]}-{self.year_range[1]}"
+        if self.level is not None:
+            params['l'] = self.level
+        return params
+
+    @classmethod
+    def from_query_params(cls, params, country_universe, category_universe):
+        """URL 쿼리 파라미터에서 필터 상태 복원 (파라미터가 없거나 잘못되면 None)"""
+        try:
+            country_mask = int(params['c'], 16)
+            category_mask = int(params['t'], 16)
+            year_range = None
+            if params.get('y'):
+                start, end = params['y'].split('-')
+                year_range = (int(start), int(end))
+        except (KeyError, ValueError):
+            return None
+
+        state = cls(country_universe, category_universe, country_mask, category_mask,
+                    year_range, params.get('l'))
+
+        # 현재 데이터셋 후보 범위를 넘는 비트는 무시
+        state.country_mask &= (1 << len(state.country_universe)) - 1
+        state.category_mask &= (1 << len(state.category_universe)) - 1
+        return state
+
+    def __eq__(self, other):
+        return isinstance(other, FilterState) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return (f"FilterState(countries={self.countries}, categories={len(self.categories)}, "
+                f"year_range={self.year_range}, level={self.level})")
+
+
+def initial_query_params():
+    """세션 첫 실행 때의 URL 쿼리 파라미터 (위젯 기본값이 실행마다 바뀌지 않도록 고정)"""
+    if '_initial_query_params' not in st.session_state:
+        st.session_state['_initial_query_params'] = st.query_params.to_dict()
+    return st.session_state['_initial_query_params']
+
+
+def sync_query_params(state):
+    """현재 필터 상태를 URL 쿼리 파라미터에 반영 (바뀐 경우에만)"""
+    params = state.to_query_params()
+    if st.query_params.to_dict() != params:
+        st.query_params.from_dict(params)
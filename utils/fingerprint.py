@@ -0,0 +1,177 @@
+# utils/fingerprint.py
+import functools
+import hashlib
+import inspect
+import os
+import threading
+from collections import Counter
+
+import pandas as pd
+import streamlit as st
+
+from utils.aggregate_store import AGGREGATE_CACHE_DIR, AggregateStore
+from utils.instrumentation import timed
+from utils.schema import resolve_schema
+
+# 집계 디스크 캐시 사용 여부 (0이면 메모리 캐시만 사용)
+AGGREGATE_STORE_ENV = 'CT_AGGREGATE_CACHE'
+
+# 지문 캐시 호출/계산/디스크 적중 횟수 (함수 이름별, 프로세스 전체)
+_cache_calls = Counter()
+_cache_misses = Counter()
+_cache_disk_hits = Counter()
+_cache_stats_lock = threading.Lock()
+
+# 현재 호출의 캐시 결과 ('hit', 'disk', 'miss' - 계측용, 캐시 함수는 호출한 스레드에서 실행됨)
+_computed = threading.local()
+
+
+def _digest(*parts):
+    """문자열 조각들의 짧은 해시 (16바이트 hex)"""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(str(part).encode('utf-8'))
+        h.update(b'\x1f')
+    return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=32)
+def _file_digest(path, mtime, size, chunk_size=1 << 20):
+    """파일 내용 해시 (경로/수정시각/크기가 같으면 다시 읽지 않음)"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_fingerprint(path):
+    """파일 내용 기반 지문"""
+    stat = os.stat(path)
+    return _file_digest(os.path.abspath(path), stat.st_mtime, stat.st_size)
+
+
+def schema_signature(df):
+    """컬럼명/타입과 논리 필드 매핑으로 만든 스키마 서명"""
+    columns = tuple((str(col), str(dtype)) for col, dtype in df.dtypes.items())
+    return (columns, resolve_schema(df).key)
+
+
+def frame_fingerprint(df):
+    """파일이 없는 데이터(샘플 데이터 등)의 내용 기반 지문"""
+    row_hash = pd.util.hash_pandas_object(df, index=False).sum()
+    return _digest('frame', int(row_hash), schema_signature(df))
+
+
+def dataset_fingerprint(file_path, df, **load_options):
+    """데이터셋 버전 지문 (파일 해시 + 스키마 + 로드 옵션)
+
+    로드 시점에 한 번 계산해 두고, 이후 캐시 키에는 데이터프레임 대신 이 값을 사용합니다.
+    """
+    if df is None:
+        return None
+    # 공유 데이터셋은 발행할 때 읽은 파일의 지문 사용 (파일이 바뀌어도 새 세대로 바뀌기 전까지는 이전 데이터)
+    source_fp = df.attrs.get('source', {}).get('fingerprint')
+    if source_fp is None:
+        if file_path is None or not os.path.exists(file_path):
+            return frame_fingerprint(df)
+        source_fp = file_fingerprint(file_path)
+    return _digest('file', source_fp, schema_signature(df), canonical_filters(load_options))
+
+
+def canonical_filters(filters):
+    """필터 값을 정렬된 튜플로 정규화 (선택 순서와 무관하게 같은 값)"""
+    canonical = []
+    for key in sorted(filters):
+        value = filters[key]
+        if isinstance(value, (list, set, frozenset)):
+            value = tuple(sorted(value, key=str))
+        canonical.append((key, value))
+    return tuple(canonical)
+
+
+def selection_fingerprint(dataset_fp, **filters):
+    """데이터셋 지문 + 정규화한 필터로 만든 선택 데이터 지문"""
+    if dataset_fp is None:
+        return None
+    return _digest(dataset_fp, canonical_filters(filters))
+
+
+def function_version(func):
+    """함수 소스 코드 해시 (코드가 바뀌면 디스크에 남은 이전 결과를 쓰지 않도록 키에 포함)"""
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = func.__code__.co_code
+    return _digest(source)[:12]
+
+
+@st.cache_resource(show_spinner=False)
+def get_aggregate_store(root=AGGREGATE_CACHE_DIR):
+    """프로세스 전체에서 공유하는 집계 디스크 캐시 (끄거나 pyarrow가 없으면 None)"""
+    if os.environ.get(AGGREGATE_STORE_ENV, '1') == '0':
+        return None
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    return AggregateStore(root)
+
+
+def fingerprint_cache(func):
+    """데이터프레임 대신 지문으로 캐시하는 데코레이터
+
+    데코레이트한 함수는 fingerprint 키워드 인자를 받습니다.
+    fingerprint가 있으면 데이터프레임 해시 없이 (지문, 나머지 인자)로 캐시를 찾고,
+    없으면 캐시 없이 바로 계산합니다. 나머지 인자는 해시 가능한 작은 값이어야 합니다.
+
+    메모리 캐시에 없으면 디스크 캐시(utils.aggregate_store)를 먼저 찾으므로
+    서버를 다시 시작해도 같은 데이터셋/함수 버전의 집계는 다시 계산하지 않습니다.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    version = function_version(func)
+
+    @functools.wraps(func)
+    def wrapper(df, *args, fingerprint=None):
+        with timed('aggregate', func.__name__) as info:
+            if fingerprint is None:
+                return func(df, *args)
+            with _cache_stats_lock:
+                _cache_calls[name] += 1
+            _computed.value = 'hit'
+            result = _cached_call(name, version, fingerprint, df, func, *args)
+            info['cache'] = _computed.value
+            return result
+
+    return wrapper
+
+
+@st.cache_data(show_spinner=False)
+def _cached_call(name, version, fingerprint, _df, _func, *args):
+    """지문 기반 캐시 저장소 (밑줄로 시작하는 인자는 Streamlit이 해시하지 않음)"""
+    # 메모리 캐시에 없을 때만 실행되므로 여기서 미적중 횟수를 셈
+    store = get_aggregate_store()
+    key = _digest(name, version, fingerprint, args)
+    result = store.get(key) if store is not None else None
+    if result is not None:
+        with _cache_stats_lock:
+            _cache_disk_hits[name] += 1
+        _computed.value = 'disk'
+        return result
+
+    with _cache_stats_lock:
+        _cache_misses[name] += 1
+    _computed.value = 'miss'
+    result = _func(_df, *args)
+    if store is not None and result is not None:
+        store.put(key, result)
+    return result
+
+
+def fingerprint_cache_stats():
+    """지문 캐시 통계 (함수 이름 → 호출/디스크 적중/미적중 횟수)"""
+    with _cache_stats_lock:
+        return {
+            name: {'calls': _cache_calls[name], 'disk_hits': _cache_disk_hits[name], 'misses': _cache_misses[name]}
+            for name in _cache_calls
+        }
@@ -1,5 +1,7 @@
 # utils/helpers.py
 import streamlit as st
+from utils.data_loader import query_aggregate
+from utils.fingerprint import fingerprint_cache
 
 def get_available_metrics(df, preferred_metrics):
     """데이터프레임에서 사용 가능한 지표 목록 반환"""
@@ -9,4 +11,27 @@ def get_available_metrics(df, preferred_metrics):
         if metric in df.columns:
             available_metrics.append((metric, name))
     
-    return available_metrics
\ No newline at end of file
+    return available_metrics
+
+def collect_required_columns(*column_lists):
+    """섹션별 필요 컬럼 목록의 합집합 (순서 유지, 중복 제거)"""
+    columns = []
+    for column_list in column_lists:
+        columns.extend(column_list)
+    return list(dict.fromkeys(columns))
+
+@fingerprint_cache
+def compute_country_means(df, countries, metric_cols, country_col='Country'):
+    """선택한 국가의 국가별 지표 평균 (지표 여러 개를 한 번의 질의로 계산)
+    
+    country_col은 스키마가 찾은 국가 컬럼이며, 결과의 국가 컬럼명은 항상 'Country'입니다.
+    """
+    result = query_aggregate(
+        df,
+        [country_col],
+        {metric: (metric, 'mean') for metric in metric_cols},
+        filters={country_col: countries}
+    )
+    if country_col != 'Country':
+        result = result.rename(columns={country_col: 'Country'})
+    return result
\ No newline at end of file
@@ -0,0 +1,170 @@
+# utils/hierarchy.py
+import numpy as np
+import pandas as pd
+
+# 분류 레벨 (상위 → 하위)
+LEVELS = ('2', '9', '38', '82')
+LEAF_LEVEL = '82'
+
+# 82대 분류(리프) 메타데이터에서 상위 레벨 라벨을 담는 컬럼
+PARENT_COLUMNS = {'2': 'label_2', '9': 'label_9', '38': 'label_38', '82': 'label'}
+
+
+class ClassificationHierarchy:
+    """2 → 9 → 38 → 82 분류 트리
+
+    리프(82대 분류) 라벨마다 상위 레벨 라벨 코드를 배열로 저장합니다.
+    """
+
+    def __init__(self, mapping, level_columns=None):
+        """
+        Parameters:
+        -----------
+        mapping : pandas.DataFrame
+            리프 라벨별 상위 레벨 라벨 (level_columns의 컬럼 포함)
+        level_columns : dict, optional
+            레벨 → 컬럼명 매핑 (기본값: PARENT_COLUMNS)
+        """
+        self.level_columns = level_columns or PARENT_COLUMNS
+        leaf_col = self.level_columns[LEAF_LEVEL]
+
+        # 라벨이 하나라도 비어 있는 리프는 제외 (factorize가 -1을 돌려 마지막 라벨로 잘못 연결되지 않도록)
+        columns = [self.level_columns[level] for level in LEVELS]
+        mapping = mapping.dropna(subset=columns)
+        mapping = mapping.drop_duplicates(subset=[leaf_col]).sort_values(leaf_col)
+        self.leaf_labels = pd.Index(mapping[leaf_col].to_numpy())
+
+        # 레벨별 (리프 위치 → 레벨 코드, 레벨 라벨 목록)
+        self.codes = {}
+        self.labels = {}
+        for level in LEVELS:
+            codes, labels = pd.factorize(mapping[self.level_columns[level]], sort=True)
+            self.codes[level] = codes
+            self.labels[level] = pd.Index(labels)
+
+    @classmethod
+    def from_level_data(cls, data):
+        """레벨별 데이터 사전(patent_sidebar 형식)에서 분류 트리 생성
+
+        82대 분류 metadata에 상위 레벨 라벨 컬럼(PARENT_COLUMNS)이 모두 있어야 합니다.
+        레벨 시트끼리는 서로 연결하는 키가 없어 상위 분류를 추론할 수 없으므로,
+        실제 데이터는 82대 분류 시트에 label_2, label_9, label_38 컬럼을 추가해야 합니다.
+        없으면 None을 반환합니다.
+        """
+        if LEAF_LEVEL not in data or 'metadata' not in data[LEAF_LEVEL]:
+            return None
+
+        metadata = data[LEAF_LEVEL]['metadata']
+        columns = list(PARENT_COLUMNS.values())
+        if not all(col in metadata.columns for col in columns):
+            return None
+
+        return cls(metadata[columns])
+
+    def leaf_cube(self, leaf_df, sum_cols=(), mean_cols=None, country_col='country'):
+        """리프 레벨에서 한 번만 집계한 국가 × 리프 큐브 생성
+
+        Parameters:
+        -----------
+        leaf_df : pandas.DataFrame
+            82대 분류 데이터 (country_col, 리프 라벨 컬럼, 지표 컬럼)
+        sum_cols : sequence
+            합계로 롤업할 컬럼
+        mean_cols : dict, optional
+            가중 평균으로 롤업할 컬럼 → 가중치 컬럼
+
+        Returns:
+        --------
+        HierarchyCube
+        """
+        return HierarchyCube(self, leaf_df, sum_cols, mean_cols or {}, country_col)
+
+
+class HierarchyCube:
+    """국가 × 리프 분류 집계 큐브와 레벨별 세그먼트 롤업"""
+
+    def __init__(self, hierarchy, leaf_df, sum_cols, mean_cols, country_col):
+        self.hierarchy = hierarchy
+        self.sum_cols = list(sum_cols)
+        self.mean_cols = dict(mean_cols)
+
+        leaf_col = hierarchy.level_columns[LEAF_LEVEL]
+        leaf_codes = hierarchy.leaf_labels.get_indexer(leaf_df[leaf_col])
+        country_codes, self.countries = pd.factorize(leaf_df[country_col], sort=True)
+
+        # 트리에 없는 리프나 국가가 비어 있는 행은 셀 키가 음수가 되므로 제외
+        known = (leaf_codes >= 0) & (country_codes >= 0)
+
+        # 가중 평균은 (가중치 × 값) 합과 가중치 합으로 저장
+        totals = {col: leaf_df[col].to_numpy(dtype=np.float64) for col in self.sum_cols}
+        for col, weight_col in self.mean_cols.items():
+            weights = leaf_df[weight_col].to_numpy(dtype=np.float64)
+            totals[f'{col}__wsum'] = weights * leaf_df[col].to_numpy(dtype=np.float64)
+            totals[f'{col}__w'] = weights
+
+        # 국가 × 리프 셀 단위로 한 번 집계
+        n_leaves = len(hierarchy.leaf_labels)
+        keys = country_codes[known].astype(np.int64) * n_leaves + leaf_codes[known]
+        cells, inverse = np.unique(keys, return_inverse=True)
+
+        self.country_codes = cells // n_leaves
+        self.leaf_codes = cells % n_leaves
+        self.values = {
+            name: np.bincount(inverse, weights=values[known], minlength=len(cells))
+            for name, values in totals.items()
+        }
+
+    def _mask(self, countries=None, categories=None):
+        """국가/분류 필터에 해당하는 셀 마스크
+
+        categories는 {레벨: 라벨 목록} 형식이며 모든 레벨 조건을 동시에 만족해야 합니다.
+        """
+        mask = np.ones(len(self.leaf_codes), dtype=bool)
+        if countries is not None:
+            allowed = self.countries.isin(countries)
+            mask &= allowed[self.country_codes]
+        for level, labels in (categories or {}).items():
+            allowed = self.hierarchy.labels[level].isin(labels)
+            mask &= allowed[self.hierarchy.codes[level][self.leaf_codes]]
+        return mask
+
+    def rollup(self, level, countries=None, categories=None):
+        """선택한 레벨로 롤업한 국가 × 라벨 집계
+
+        Returns:
+        --------
+        pandas.DataFrame
+            country, label, sum_cols 합계, mean_cols 가중 평균
+        """
+        mask = self._mask(countries, categories)
+        level_codes = self.hierarchy.codes[level][self.leaf_codes[mask]]
+        level_labels = self.hierarchy.labels[level]
+        n_labels = len(level_labels)
+
+        keys = self.country_codes[mask] * n_labels + level_codes
+        size = len(self.countries) * n_labels
+        reduced = {
+            name: np.bincount(keys, weights=values[mask], minlength=size)
+            for name, values in self.values.items()
+        }
+        present = np.bincount(keys, minlength=size) > 0
+
+        result = pd.DataFrame({
+            'country': self.countries.to_numpy()[np.arange(size) // n_labels],
+            'label': level_labels.to_numpy()[np.arange(size) % n_labels]
+        })
+        for col in self.sum_cols:
+            result[col] = reduced[col]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for col in self.mean_cols:
+                result[col] = reduced[f'{col}__wsum'] / reduced[f'{col}__w']
+
+        return result[present].reset_index(drop=True)
+
+    def country_totals(self, col, countries=None, categories=None):
+        """국가별 합계 (모든 레벨에서 동일한 리프 기준 값)"""
+        mask = self._mask(countries, categories)
+        totals = np.bincount(
+            self.country_codes[mask], weights=self.values[col][mask], minlength=len(self.countries)
+        )
+        return pd.Series(totals, index=pd.Index(self.countries, name='country'), name=col)
@@ -0,0 +1,146 @@
+# utils/instrumentation.py
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+# 계측 단계 (표시 순서) → 표시 이름
+STAGES = {
+    'load': '데이터 로드',
+    'filter': '필터링',
+    'aggregate': '집계',
+    'figure': 'figure 생성',
+    'serialize': '직렬화'
+}
+
+# 기록 항목 컬럼
+EVENT_COLUMNS = ['kind', 'name', 'section', 'chart', 'seconds', 'cache', 'bytes']
+
+# 현재 재실행의 기록과 섹션 (스크립트 스레드마다 따로 유지)
+_current_trace = contextvars.ContextVar('rerun_trace', default=None)
+_current_section = contextvars.ContextVar('rerun_section', default=None)
+
+
+class RerunTrace:
+    """재실행 한 번의 단계별 시간, 캐시 적중, 차트 크기 기록
+
+    항목 종류(kind)는 STAGES의 단계와 'section', 'render'입니다.
+    섹션/render 항목은 안에 포함된 단계 시간을 모두 포함하므로 단계 합계와 따로 봅니다.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.events = []
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self):
+        """재실행 시작 후 경과 시간 (초)"""
+        return time.perf_counter() - self.started
+
+    def record(self, kind, name, seconds, section=None, chart=None, cache=None, bytes=None):
+        """항목 하나 기록 (section을 생략하면 현재 섹션, chart는 같은 차트의 항목을 묶는 식별자)"""
+        event = {
+            'kind': kind, 'name': name,
+            'section': section if section is not None else _current_section.get(),
+            'chart': chart, 'seconds': seconds, 'cache': cache, 'bytes': bytes
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def frame(self):
+        """기록 전체를 데이터프레임으로 반환"""
+        with self._lock:
+            return pd.DataFrame(self.events, columns=EVENT_COLUMNS)
+
+    def stage_summary(self):
+        """단계별 합계 시간과 호출 수"""
+        events = self.frame()
+        events = events[events['kind'].isin(list(STAGES))]
+        summary = events.groupby('kind')['seconds'].agg(['sum', 'count']).reindex(list(STAGES)).fillna(0)
+        summary.index = [STAGES[kind] for kind in summary.index]
+        return summary.rename(columns={'sum': 'seconds', 'count': 'calls'})
+
+    def chart_summary(self):
+        """차트별 figure 생성/직렬화 시간, 캐시 적중, 전송 크기 (JSON 바이트)"""
+        columns = ['section', 'name', 'chart', 'cache', 'figure_s', 'serialize_s', 'bytes']
+        events = self.frame()
+        charts = events[events['kind'].isin(['figure', 'serialize'])]
+        if charts.empty:
+            return pd.DataFrame(columns=columns)
+        keys = ['section', 'name', 'chart']
+        seconds = charts.pivot_table(index=keys, columns='kind', values='seconds', aggfunc='sum',
+                                     dropna=False, sort=False)
+        seconds = seconds.reindex(columns=['figure', 'serialize'])
+        info = charts.groupby(keys, dropna=False, sort=False).agg(
+            cache=('cache', 'first'),
+            bytes=('bytes', 'max')
+        )
+        summary = info.join(seconds.rename(columns={'figure': 'figure_s', 'serialize': 'serialize_s'}))
+        return summary.reset_index()[columns]
+
+
+def session_key():
+    """현재 Streamlit 세션의 짧은 식별자 (세션 ID를 그대로 남기지 않음, 세션 밖이면 None)"""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    from utils.fingerprint import _digest
+    ctx = get_script_run_ctx()
+    return _digest('session', ctx.session_id)[:12] if ctx is not None else None
+
+
+def start_rerun():
+    """새 재실행 기록을 만들어 현재 스크립트 스레드에 지정"""
+    trace = RerunTrace()
+    _current_trace.set(trace)
+    _current_section.set(None)
+    return trace
+
+
+def current_trace():
+    """현재 재실행 기록 (계측 중이 아니면 None)"""
+    return _current_trace.get()
+
+
+def current_section():
+    """현재 섹션 이름"""
+    return _current_section.get()
+
+
+@contextmanager
+def timed(kind, name, **info):
+    """블록 실행 시간을 기록 (계측 중이 아니면 아무것도 하지 않음)
+
+    yield한 사전에 cache/bytes를 넣으면 함께 기록합니다.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield info
+        return
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        trace.record(kind, name, time.perf_counter() - start, **info)
+
+
+def traced(kind):
+    """함수 호출 시간을 기록하는 데코레이터 ('section'이면 안쪽 항목의 섹션 이름으로도 사용)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            token = _current_section.set(func.__name__) if kind == 'section' else None
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                trace.record(kind, func.__name__, time.perf_counter() - start)
+                if token is not None:
+                    _current_section.reset(token)
+        return wrapper
+    return decorator
@@ -0,0 +1,221 @@
+# utils/memory.py
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.instrumentation import session_key
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 세션별로 보관할 재실행 RSS 기록 수
+RSS_HISTORY = 20
+
+# 연속으로 이 횟수만큼 재실행마다 RSS가 늘고, 합계가 기준을 넘으면 경고
+GROWTH_WINDOW = 5
+GROWTH_WARN_BYTES = 64 * 1024 * 1024
+
+# 세션 상태 키 (재실행 RSS 기록)
+RSS_HISTORY_KEY = '_rss_history'
+
+# 프로세스 세션 기록에 보관할 최대 세션 수 (오래 갱신되지 않은 세션부터 제거)
+MAX_TRACKED_SESSIONS = 200
+
+
+def current_rss():
+    """현재 프로세스 RSS (바이트, /proc이 없으면 최대 RSS로 대체, 둘 다 잴 수 없으면 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return peak_rss()
+
+
+def peak_rss():
+    """프로세스 시작 후 최대 RSS (바이트, resource 모듈이 없으면 None)"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+
+def _array_buffers(values):
+    """배열이 참조하는 메모리 구간 [(주소, 바이트)] - 알 수 없는 배열 종류면 None"""
+    if isinstance(values, np.ndarray):
+        if values.nbytes == 0:
+            return []
+        if values.dtype.hasobject:
+            return None
+        return [(values.__array_interface__['data'][0], values.nbytes)]
+    if isinstance(values, pd.Categorical):
+        codes = _array_buffers(values.codes)
+        categories = _array_buffers(values.categories.array)
+        return None if codes is None or categories is None else codes + categories
+    if hasattr(values, '__arrow_array__'):
+        chunked = values.__arrow_array__()
+        return [(buf.address, buf.size) for chunk in chunked.chunks for buf in chunk.buffers()
+                if buf is not None and buf.size]
+    return None
+
+
+def _series_buffers(series):
+    """컬럼 데이터의 메모리 구간 (numpy 컬럼은 복사 없는 뷰로 확인)"""
+    if isinstance(series.dtype, np.dtype):
+        return _array_buffers(series.to_numpy())
+    return _array_buffers(series.array)
+
+
+def _merge(ranges):
+    """겹치는 메모리 구간을 합친 정렬된 구간 목록 [(시작, 끝)]"""
+    merged = []
+    for start, end in sorted((address, address + size) for address, size in ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _size(merged):
+    return sum(end - start for start, end in merged)
+
+
+def _overlap(merged, other):
+    """두 합친 구간 목록이 겹치는 바이트 수"""
+    total, j = 0, 0
+    for start, end in merged:
+        while j < len(other) and other[j][1] <= start:
+            j += 1
+        k = j
+        while k < len(other) and other[k][0] < end:
+            total += min(end, other[k][1]) - max(start, other[k][0])
+            k += 1
+    return total
+
+
+def frame_ranges(df):
+    """데이터프레임 컬럼이 참조하는 메모리 구간과 구간을 알 수 없는 컬럼의 깊은 크기
+
+    Returns:
+    --------
+    tuple
+        (합친 구간 목록, 알 수 없는 컬럼 바이트 수)
+    """
+    ranges, unknown = [], 0
+    for col in df.columns:
+        series = df[col]
+        buffers = _series_buffers(series)
+        if buffers is None:
+            unknown += int(series.memory_usage(deep=True, index=False))
+        else:
+            ranges.extend(buffers)
+    return _merge(ranges), unknown
+
+
+class MemoryReport:
+    """재실행 중간 데이터프레임의 깊은 크기와 원본 데이터와 공유하는 메모리 기록
+
+    깊은 크기(deep)는 pandas memory_usage(deep=True) 합계이고,
+    실제 바이트(actual)는 같은 버퍼를 여러 컬럼이 참조해도 한 번만 센 크기입니다.
+    공유 바이트(shared)는 원본(base)과 같은 버퍼를 참조하는 크기입니다.
+    """
+
+    def __init__(self, base, base_name='load_data'):
+        self.base_ranges, _ = frame_ranges(base)
+        self.entries = []
+        self._all_ranges = list(self.base_ranges)
+        self._unknown = 0
+        self.add(base_name, 원본=base)
+
+    def add(self, stage, **frames):
+        """단계의 데이터프레임들 기록 (이름=데이터프레임)"""
+        for name, df in frames.items():
+            if df is None:
+                continue
+            merged, unknown = frame_ranges(df)
+            actual = _size(merged) + unknown
+            shared = _overlap(merged, self.base_ranges)
+            self.entries.append({
+                'stage': stage, 'frame': name, 'rows': len(df),
+                'deep_bytes': int(df.memory_usage(deep=True).sum()),
+                'actual_bytes': actual,
+                'shared_bytes': shared,
+                'shared_ratio': shared / actual if actual else 0.0
+            })
+            self._all_ranges = _merge([(start, end - start) for start, end in self._all_ranges + merged])
+            self._unknown += unknown
+
+    @property
+    def footprint(self):
+        """기록한 데이터프레임 전체가 참조하는 실제 바이트 (공유 버퍼는 한 번만)"""
+        return _size(self._all_ranges) + self._unknown
+
+    def frame(self):
+        return pd.DataFrame(self.entries)
+
+
+def track_rerun_memory(rss=None):
+    """재실행 끝의 RSS를 세션/프로세스 기록에 추가하고, 계속 늘고 있으면 증가량 반환 (아니면 None)
+
+    최근 GROWTH_WINDOW번의 재실행에서 매번 RSS가 늘었고 합계가 GROWTH_WARN_BYTES를 넘으면
+    세션이 메모리를 계속 붙잡고 있을 가능성이 있으므로 증가량을 반환합니다.
+    RSS를 잴 수 없는 환경에서는 기록하지 않습니다.
+    """
+    rss = current_rss() if rss is None else rss
+    if rss is None:
+        return None
+    history = st.session_state.get(RSS_HISTORY_KEY, [])[-(RSS_HISTORY - 1):] + [rss]
+    st.session_state[RSS_HISTORY_KEY] = history
+
+    session_id = session_key()
+    if session_id is not None:
+        get_session_registry().update(session_id, rss)
+
+    recent = history[-(GROWTH_WINDOW + 1):]
+    if len(recent) <= GROWTH_WINDOW:
+        return None
+    growing = all(later > earlier for earlier, later in zip(recent, recent[1:]))
+    growth = recent[-1] - recent[0]
+    return growth if growing and growth > GROWTH_WARN_BYTES else None
+
+
+class SessionRssRegistry:
+    """프로세스의 세션별 재실행 수와 재실행 끝 RSS (세션 사이의 메모리 증가 비교용)"""
+
+    def __init__(self, max_sessions=MAX_TRACKED_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, session_id, rss):
+        """세션의 재실행 끝 RSS 기록"""
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:
+                entry = {'reruns': 0, 'first_rss': rss, 'started': time.time()}
+            entry.update(reruns=entry['reruns'] + 1, last_rss=rss, updated=time.time())
+            self._sessions[session_id] = entry
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def frame(self):
+        """세션별 재실행 수, 첫/마지막 RSS, 증가량 (최근 갱신 순)"""
+        with self._lock:
+            rows = [{'session': session_id, **entry} for session_id, entry in reversed(self._sessions.items())]
+        df = pd.DataFrame(rows, columns=['session', 'reruns', 'first_rss', 'last_rss', 'started', 'updated'])
+        df['growth'] = df['last_rss'] - df['first_rss']
+        return df
+
+
+@st.cache_resource(show_spinner=False)
+def get_session_registry():
+    """프로세스 전체에서 공유하는 세션 RSS 기록"""
+    return SessionRssRegistry()
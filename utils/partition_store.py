@@ -0,0 +1,220 @@
+# utils/partition_store.py
+import json
+import os
+import shutil
+
+import pandas as pd
+
+try:
+    from pyarrow import ArrowException
+except ImportError:  # pyarrow 미설치 (to_parquet이 ImportError를 냄)
+    ArrowException = ImportError
+
+# 연도 컬럼 후보 (Hive 파티션 키는 'year'로 통일)
+YEAR_COLUMNS = ['year', 'Year', '연도']
+
+# 캐시 원본 정보 파일
+SOURCE_FILE = '_source.json'
+
+# 연도 값이 없는 행의 파티션 이름 (Hive 기본값)
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+# 캐시를 쓰다 날 수 있는 오류 (실패하면 캐시 없이 엑셀 데이터 사용)
+CACHE_WRITE_ERRORS = (ImportError, OSError, ValueError, TypeError, ArrowException)
+
+# 한 컬럼에 타입이 섞여 Arrow로 저장할 수 없는 값 종류 (pandas.api.types.infer_dtype 결과)
+MIXED_INFERRED_TYPES = ('mixed', 'mixed-integer')
+
+
+def find_year_column(df):
+    """데이터프레임의 연도 컬럼명 반환 (없으면 None)"""
+    for col in YEAR_COLUMNS:
+        if col in df.columns:
+            return col
+    return None
+
+
+def arrow_compatible(df):
+    """타입이 섞인 object 컬럼을 문자열로 바꾼 데이터프레임 (바꿀 컬럼이 없으면 그대로 반환)
+
+    엑셀 컬럼에 숫자와 문자열이 섞여 있으면(예: 비고 컬럼의 1과 '확인필요') pandas는 object로 읽지만
+    Arrow/Parquet은 컬럼마다 한 타입만 저장할 수 있습니다. 결측값은 그대로 둡니다.
+    """
+    mixed = [
+        col for col in df.columns
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) in MIXED_INFERRED_TYPES
+    ]
+    if not mixed:
+        return df
+    df = df.copy(deep=False)
+    for col in mixed:
+        df[col] = df[col].map(str, na_action='ignore')
+    return df
+
+
+def _partition_dir(root, keys):
+    """Hive 스타일 파티션 경로 (예: root/level=82/year=2015)"""
+    return os.path.join(root, *[f"{name}={value}" for name, value in keys])
+
+
+def write_partitioned(df, root, level=None, source=None):
+    """데이터를 분류 레벨 × 연도 Hive 파티션 Parquet으로 저장
+
+    임시 디렉터리에 모두 쓴 뒤 교체하므로 읽는 쪽이 반쯤 쓰인 캐시를 보지 않습니다.
+
+    타입이 섞인 object 컬럼은 문자열로 저장합니다 (arrow_compatible).
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        저장할 데이터
+    root : str
+        파티션 루트 디렉터리 (level 지정 시 root/level=<level> 아래만 교체)
+    level : str, optional
+        분류 레벨 ('2', '9', '38', '82')
+    source : dict, optional
+        원본 파일 정보 (SOURCE_FILE로 저장되어 캐시 유효성 확인에 사용)
+    """
+    target = _partition_dir(root, [('level', level)]) if level is not None else root
+    staging = f"{target}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    df = arrow_compatible(df)
+    year_col = find_year_column(df)
+    if year_col is None:
+        df.to_parquet(os.path.join(staging, 'part-0.parquet'), index=False)
+    else:
+        for year, part in df.groupby(year_col, sort=True, dropna=False):
+            part_dir = _partition_dir(staging, [('year', NULL_PARTITION if pd.isna(year) else int(year))])
+            os.makedirs(part_dir)
+            part.to_parquet(os.path.join(part_dir, 'part-0.parquet'), index=False)
+
+    if source is not None:
+        with open(os.path.join(staging, SOURCE_FILE), 'w', encoding='utf-8') as f:
+            json.dump(dict(source, columns=[str(col) for col in df.columns]), f)
+
+    # 기존 캐시를 옆으로 치운 뒤 교체
+    if os.path.exists(target):
+        retired = f"{target}.old-{os.getpid()}"
+        os.replace(target, retired)
+        os.replace(staging, target)
+        shutil.rmtree(retired, ignore_errors=True)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        os.replace(staging, target)
+
+
+def write_level_data(data, root):
+    """레벨별 데이터 사전(patent_sidebar 형식)의 metadata를 레벨 파티션으로 저장"""
+    for level, frames in data.items():
+        if 'metadata' in frames:
+            write_partitioned(frames['metadata'], root, level=level)
+
+
+def read_source_info(root):
+    """캐시에 기록된 원본 파일 정보와 저장된 컬럼 목록 (없으면 None)"""
+    path = os.path.join(root, SOURCE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def list_partitions(root):
+    """파티션 파일 목록과 파티션 키 값
+
+    Returns:
+    --------
+    list
+        (파일 경로, {키: 값}) 튜플 목록
+    """
+    partitions = []
+    if not os.path.isdir(root):
+        return partitions
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        # 교체 중인 임시/폐기 디렉터리는 건너뜀
+        dirnames[:] = sorted(d for d in dirnames if '.tmp-' not in d and '.old-' not in d)
+
+        rel = os.path.relpath(dirpath, root)
+        keys = {}
+        if rel != '.':
+            for part in rel.split(os.sep):
+                name, _, value = part.partition('=')
+                keys[name] = value
+
+        for filename in sorted(filenames):
+            if filename.endswith('.parquet'):
+                partitions.append((os.path.join(dirpath, filename), keys))
+
+    return partitions
+
+
+def read_partitioned(root, year_range=None, levels=None, columns=None):
+    """파티션 프루닝으로 필요한 연도/레벨 파일만 읽기
+
+    Parameters:
+    -----------
+    root : str
+        파티션 루트 디렉터리
+    year_range : tuple, optional
+        (시작 연도, 끝 연도) - 범위 밖의 year 파티션은 읽지 않음
+    levels : list, optional
+        읽을 분류 레벨 목록
+    columns : list, optional
+        읽을 컬럼 목록 (파티션 키 컬럼은 자동으로 복원)
+
+    Returns:
+    --------
+    pandas.DataFrame or None
+        읽은 데이터 (해당 파티션이 없으면 None)
+    """
+    frames = []
+    for path, keys in list_partitions(root):
+        if levels is not None and 'level' in keys and keys['level'] not in levels:
+            continue
+        if year_range is not None and 'year' in keys:
+            if keys['year'] == NULL_PARTITION or not year_range[0] <= int(keys['year']) <= year_range[1]:
+                continue
+
+        part = pd.read_parquet(path, columns=columns)
+        if 'year' in keys and keys['year'] != NULL_PARTITION and find_year_column(part) is None:
+            part['year'] = int(keys['year'])
+        if 'level' in keys:
+            part['level'] = keys['level']
+        frames.append(part)
+
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_level_data(root, year_range=None, levels=None):
+    """레벨 파티션을 레벨별 데이터 사전(patent_sidebar 형식)으로 읽기"""
+    df = read_partitioned(root, year_range=year_range, levels=levels)
+    # level= 파티션이 없는 저장소(연도 파티션만 있는 경우)는 레벨 데이터가 없는 것으로 처리
+    if df is None or 'level' not in df.columns:
+        return {}
+    return {
+        level: {'metadata': part.drop(columns='level').reset_index(drop=True)}
+        for level, part in df.groupby('level', sort=False)
+    }
+
+
+def read_empty_partitioned(root, columns=None):
+    """저장된 스키마(컬럼과 타입)만 가진 빈 데이터프레임 (파티션이 없으면 None)
+
+    프루닝으로 읽을 파티션이 하나도 남지 않았을 때 read_partitioned와 같은 컬럼 구성을 돌려주기 위해 사용합니다.
+    """
+    partitions = list_partitions(root)
+    if not partitions:
+        return None
+
+    path, keys = partitions[0]
+    empty = pd.read_parquet(path, columns=columns).iloc[:0]
+    if 'year' in keys and find_year_column(empty) is None:
+        empty['year'] = pd.Series(dtype='int64')
+    if 'level' in keys:
+        empty['level'] = pd.Series(dtype=object)
+    return empty.reset_index(drop=True)
@@ -0,0 +1,184 @@
+# utils/patent_family.py
+import numpy as np
+import pandas as pd
+
+# Triadic 패밀리 판정에 사용하는 특허청
+TRIADIC_OFFICES = ('EP', 'JP', 'US')
+
+
+def _find_roots(parent):
+    """포인터 점프로 모든 노드의 루트를 찾고 경로를 완전히 압축"""
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            return parent
+        parent = grandparent
+
+
+def union_find_components(n_nodes, left, right):
+    """배열 기반 union-find로 연결 요소(패밀리) 계산
+
+    링크 배열 전체를 한 번에 처리하는 벡터화 hook/compress 방식으로,
+    루프 반복 횟수는 링크 수가 아니라 패밀리 깊이(로그 수준)에 비례합니다.
+
+    Parameters:
+    -----------
+    n_nodes : int
+        노드(출원) 수
+    left, right : numpy.ndarray
+        링크 양 끝 노드 번호 (0 ~ n_nodes-1)
+
+    Returns:
+    --------
+    numpy.ndarray
+        노드별 루트 번호 (같은 패밀리는 같은 값, 패밀리 내 최소 노드 번호)
+    """
+    parent = np.arange(n_nodes, dtype=np.int64)
+    left = np.asarray(left, dtype=np.int64)
+    right = np.asarray(right, dtype=np.int64)
+
+    while len(left):
+        root_left = parent[left]
+        root_right = parent[right]
+
+        # 이미 합쳐진 링크는 다음 반복에서 제외
+        pending = root_left != root_right
+        if not pending.any():
+            break
+        left, right = left[pending], right[pending]
+        root_left, root_right = root_left[pending], root_right[pending]
+
+        # 큰 루트를 작은 루트 아래로 연결 (hook)
+        low = np.minimum(root_left, root_right)
+        high = np.maximum(root_left, root_right)
+        np.minimum.at(parent, high, low)
+
+        # 경로 압축 (compress)
+        parent = _find_roots(parent)
+
+    return _find_roots(parent)
+
+
+def assign_families(applications, priority_links, app_col='app_id', priority_col='priority_app_id'):
+    """출원-우선권 링크로 출원별 패밀리 ID 부여
+
+    Parameters:
+    -----------
+    applications : pandas.DataFrame
+        출원 테이블 (app_col 포함)
+    priority_links : pandas.DataFrame
+        우선권 링크 테이블 (app_col, priority_col 포함)
+
+    Returns:
+    --------
+    pandas.Series
+        applications 인덱스 기준 패밀리 ID (0부터 시작하는 연속 정수)
+    """
+    app_ids = applications[app_col].to_numpy()
+
+    # 한쪽 끝이 비어 있는 링크는 제외 (결측값이 한 노드로 묶여 관계없는 패밀리가 합쳐지지 않도록)
+    valid_links = priority_links[app_col].notna() & priority_links[priority_col].notna()
+    link_apps = priority_links.loc[valid_links, app_col].to_numpy()
+    link_priorities = priority_links.loc[valid_links, priority_col].to_numpy()
+
+    # 출원 테이블에 없는 우선권 출원도 노드로 포함해야 패밀리가 끊기지 않음
+    codes, uniques = pd.factorize(
+        np.concatenate([app_ids, link_apps, link_priorities]), sort=False
+    )
+    n_apps = len(app_ids)
+    n_links = len(link_apps)
+
+    # 출원 ID가 없는 출원은 각각 단독 패밀리
+    missing = np.flatnonzero(codes[:n_apps] < 0)
+    codes[missing] = len(uniques) + np.arange(len(missing))
+
+    roots = union_find_components(
+        len(uniques) + len(missing),
+        codes[n_apps:n_apps + n_links],
+        codes[n_apps + n_links:]
+    )
+
+    # 출원 테이블에 나타난 패밀리만 연속 번호로 재부여
+    family_ids, _ = pd.factorize(roots[codes[:n_apps]], sort=True)
+    return pd.Series(family_ids, index=applications.index, name='family_id')
+
+
+def build_patent_families(applications, priority_links, tech_col='label_m',
+                          app_col='app_id', priority_col='priority_app_id',
+                          country_col='Country', office_col='office', year_col='year'):
+    """우선권 링크로 특허 패밀리를 재구성하고 국가 × 기술 × 연도 지표 계산
+
+    각 패밀리는 가장 이른 출원(우선권 출원)의 국가, 기술 분류, 연도로 귀속됩니다.
+    대표 출원의 국가, 기술 분류, 연도가 비어 있는 패밀리도 결측값 그룹으로 집계합니다.
+
+    Parameters:
+    -----------
+    applications : pandas.DataFrame
+        출원 테이블 (출원 ID, 출원인 국가, 출원 관청, 기술 분류, 연도)
+    priority_links : pandas.DataFrame
+        출원 → 우선권 출원 링크 테이블
+    tech_col : str
+        기술 분류 컬럼명 (예: 'label_m')
+    country_col : str
+        출원인 국가 컬럼명 (결과의 국가 컬럼명으로도 사용)
+
+    Returns:
+    --------
+    pandas.DataFrame
+        country_col, tech_col, year_col별 family_count, avg_family_size(패밀리당 출원 수),
+        avg_family_countries(패밀리당 출원 관청 수), triadic_count, triadic_ratio,
+        foreign_filing_intensity
+    """
+    family_ids = assign_families(applications, priority_links, app_col, priority_col).to_numpy()
+    n_families = int(family_ids.max()) + 1 if len(family_ids) else 0
+
+    # 패밀리 대표 출원: 패밀리 내 가장 이른 연도의 출원
+    order = np.lexsort((applications[year_col].to_numpy(), family_ids))
+    first_mask = np.ones(len(order), dtype=bool)
+    first_mask[1:] = family_ids[order][1:] != family_ids[order][:-1]
+    representative = applications.iloc[order[first_mask]]
+
+    # 패밀리 크기: 패밀리에 속한 출원 수
+    family_size = np.bincount(family_ids, minlength=n_families)
+
+    # 패밀리별 출원 관청 (중복 제거, 관청이 비어 있는 출원은 제외)
+    office_codes, offices = pd.factorize(applications[office_col], sort=True)
+    has_office = office_codes >= 0
+    pair_keys = np.unique(family_ids[has_office].astype(np.int64) * len(offices) + office_codes[has_office])
+    pair_family = pair_keys // max(len(offices), 1)
+    pair_office = offices.to_numpy()[pair_keys % max(len(offices), 1)]
+
+    family_offices = np.bincount(pair_family, minlength=n_families)
+
+    # Triadic: EP, JP, US 모두에 출원된 패밀리
+    triadic_hits = np.bincount(
+        pair_family, weights=np.isin(pair_office, TRIADIC_OFFICES), minlength=n_families
+    )
+    is_triadic = triadic_hits == len(TRIADIC_OFFICES)
+
+    # 해외 출원: 대표 출원 국가 이외 관청에 출원
+    home_country = representative[country_col].to_numpy()
+    foreign_offices = np.bincount(
+        pair_family, weights=pair_office != home_country[pair_family], minlength=n_families
+    )
+
+    families = pd.DataFrame({
+        country_col: home_country,
+        tech_col: representative[tech_col].to_numpy(),
+        year_col: representative[year_col].to_numpy(),
+        'family_size': family_size,
+        'family_offices': family_offices,
+        'triadic': is_triadic,
+        'foreign_offices': foreign_offices
+    })
+
+    result = families.groupby([country_col, tech_col, year_col], sort=True, dropna=False).agg(
+        family_count=('family_size', 'size'),
+        avg_family_size=('family_size', 'mean'),
+        avg_family_countries=('family_offices', 'mean'),
+        triadic_count=('triadic', 'sum'),
+        foreign_filing_intensity=('foreign_offices', 'mean')
+    ).reset_index()
+    result['triadic_ratio'] = result['triadic_count'] / result['family_count']
+
+    return result
@@ -0,0 +1,203 @@
+# utils/profiler.py
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+# 샘플링 간격 (초)
+PROFILE_INTERVAL = 0.005
+
+# 스크립트 스레드와 함께 샘플링할 작업자 스레드 이름 접두사 (figure 작업자 풀)
+WORKER_THREAD_PREFIX = 'figure'
+
+# 세션 상태 키 (다음 재실행 프로파일 요청, 마지막 결과)
+PROFILE_REQUEST_KEY = '_profile_next_rerun'
+PROFILE_RESULT_KEY = '_profile_result'
+
+# 저장소 루트 (이 아래 파일의 프레임을 컴포넌트로 집계)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+def _module_name(filename):
+    """저장소 파일 경로의 모듈 이름 (저장소 밖이면 None)"""
+    if not filename.startswith(REPO_ROOT + os.sep):
+        return None
+    return os.path.splitext(os.path.relpath(filename, REPO_ROOT))[0].replace(os.sep, '.')
+
+
+def _component(stack):
+    """스택에서 가장 안쪽 저장소 프레임 (모듈, 함수) - 라이브러리 시간은 이를 호출한 저장소 함수에 귀속"""
+    for name, filename, _ in reversed(stack):
+        module = _module_name(filename)
+        if module is not None:
+            return module, name
+    return '(외부)', stack[-1][0] if stack else '?'
+
+
+class StackSampler:
+    """백그라운드 스레드에서 sys._current_frames()로 스택을 주기적으로 수집하는 샘플링 프로파일러
+
+    시작한 스레드(스크립트 스레드)와 figure 작업자 스레드를 샘플링합니다.
+    작업자 스레드는 저장소 코드를 실행 중인 스택만 기록합니다 (대기 중인 스택 제외).
+    """
+
+    def __init__(self, interval=PROFILE_INTERVAL, worker_prefix=WORKER_THREAD_PREFIX):
+        self.interval = interval
+        self.worker_prefix = worker_prefix
+        self.target = threading.get_ident()
+        self.samples = {}
+        self.started = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def _threads(self):
+        """샘플링할 스레드 (ident → 표시 이름)"""
+        threads = {}
+        for thread in threading.enumerate():
+            if thread.ident == self.target:
+                threads[thread.ident] = 'script'
+            elif thread.name.startswith(self.worker_prefix):
+                threads[thread.ident] = thread.name
+        return threads
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident, name in self._threads().items():
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                if not stack or (ident != self.target and not any(_module_name(f) for _, f, _ in stack)):
+                    continue
+                stack.reverse()
+                self.samples.setdefault(name, Counter())[tuple(stack)] += 1
+
+    @property
+    def sample_count(self):
+        return sum(sum(counter.values()) for counter in self.samples.values())
+
+    def component_summary(self):
+        """스레드/컴포넌트(모듈, 함수)별 샘플 수, 추정 시간, 비율"""
+        rows = Counter()
+        for thread, counter in self.samples.items():
+            for stack, count in counter.items():
+                rows[(thread, *_component(stack))] += count
+        summary = pd.DataFrame(
+            [(thread, module, function, count) for (thread, module, function), count in rows.items()],
+            columns=['thread', 'component', 'function', 'samples']
+        )
+        total = summary['samples'].sum()
+        summary['seconds'] = summary['samples'] * self.interval
+        summary['share'] = summary['samples'] / total if total else 0.0
+        return summary.sort_values('samples', ascending=False, ignore_index=True)
+
+    def to_speedscope(self, name="rerun"):
+        """speedscope 파일 형식(JSON) - 스레드마다 sampled 프로파일 하나"""
+        frames, index = [], {}
+        profiles = []
+        for thread, counter in self.samples.items():
+            samples, weights = [], []
+            for stack, count in counter.items():
+                path = []
+                for frame in stack:
+                    if frame not in index:
+                        func, filename, line = frame
+                        module = _module_name(filename)
+                        index[frame] = len(frames)
+                        frames.append({
+                            'name': f"{module}.{func}" if module else func,
+                            'file': os.path.relpath(filename, REPO_ROOT) if module else filename,
+                            'line': line
+                        })
+                    path.append(index[frame])
+                samples.append(path)
+                weights.append(count * self.interval)
+            profiles.append({
+                'type': 'sampled', 'name': thread, 'unit': 'seconds',
+                'startValue': 0, 'endValue': sum(weights),
+                'samples': samples, 'weights': weights
+            })
+        return json.dumps({
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'shared': {'frames': frames},
+            'profiles': profiles,
+            'name': name,
+            'exporter': 'ct_level dashboard'
+        })
+
+
+def request_profile():
+    """다음 재실행을 프로파일링하도록 요청 (버튼 콜백, 콜백은 재실행 전에 실행됨)"""
+    st.session_state[PROFILE_REQUEST_KEY] = True
+
+
+@contextmanager
+def profile_rerun():
+    """요청이 있으면 이번 재실행을 샘플링 프로파일러로 실행
+
+    요청이 없으면 세션 상태 확인 한 번 외에는 아무것도 하지 않으므로 평소 비용이 없습니다.
+    결과는 세션 상태에 저장해 show_profile_result로 표시합니다.
+    """
+    if not st.session_state.pop(PROFILE_REQUEST_KEY, False):
+        yield None
+        return
+
+    sampler = StackSampler().start()
+    try:
+        yield sampler
+    finally:
+        sampler.stop()
+        st.session_state[PROFILE_RESULT_KEY] = {
+            'elapsed': sampler.elapsed,
+            'samples': sampler.sample_count,
+            'summary': sampler.component_summary(),
+            'speedscope': sampler.to_speedscope(f"rerun {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        }
+
+
+def show_profile_result():
+    """마지막 프로파일 결과 (컴포넌트별 집계, speedscope 파일 다운로드)"""
+    result = st.session_state.get(PROFILE_RESULT_KEY)
+    if result is None:
+        return
+
+    with st.sidebar.expander("프로파일 결과", expanded=True):
+        st.write(f"재실행 {result['elapsed'] * 1000:.0f} ms, 샘플 {result['samples']}개")
+        summary = result['summary'].copy()
+        summary['ms'] = (summary.pop('seconds') * 1000).round(1)
+        summary['share'] = (summary['share'] * 100).round(1)
+        st.dataframe(summary.rename(columns={'share': '%'}), hide_index=True)
+        st.download_button(
+            "speedscope 파일 다운로드",
+            data=result['speedscope'],
+            file_name="rerun.speedscope.json",
+            mime="application/json",
+            on_click='ignore',
+            help="https://www.speedscope.app 에서 열 수 있습니다."
+        )
+        if st.button("프로파일 결과 닫기"):
+            st.session_state.pop(PROFILE_RESULT_KEY, None)
+            st.rerun()
@@ -0,0 +1,156 @@
+# utils/query_backend.py
+import os
+import threading
+from collections import namedtuple
+
+import pandas as pd
+
+from utils.partition_store import read_partitioned
+
+# DuckDB는 선택 설치 (없으면 pandas로 처리)
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# 지원하는 집계 함수 (pandas 이름 → SQL 함수)
+SQL_FUNCTIONS = {
+    'sum': 'SUM',
+    'mean': 'AVG',
+    'count': 'COUNT',
+    'min': 'MIN',
+    'max': 'MAX',
+    'nunique': 'COUNT(DISTINCT {})'
+}
+
+# 범위 필터 값 (하한, 상한 포함)
+Between = namedtuple('Between', ['low', 'high'])
+
+_local = threading.local()
+
+
+def has_duckdb():
+    """DuckDB 백엔드 사용 가능 여부"""
+    return duckdb is not None
+
+
+def _get_connection():
+    """스레드별 DuckDB 연결 (연결 객체는 스레드 간 공유하지 않음)"""
+    if not hasattr(_local, 'connection'):
+        _local.connection = duckdb.connect(database=':memory:')
+    return _local.connection
+
+
+def _quote(identifier):
+    """SQL 식별자 인용"""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _sql_aggregate(func, column):
+    """집계 함수 SQL 표현식"""
+    template = SQL_FUNCTIONS[func]
+    if '{}' in template:
+        return template.format(_quote(column))
+    return f"{template}({_quote(column)})"
+
+
+def _build_where(group_by, filters):
+    """WHERE 절과 바인딩 파라미터 생성
+
+    filters 값이 Between이면 범위, 그 외 시퀀스는 IN 조건입니다.
+    """
+    clauses = [f"{_quote(col)} IS NOT NULL" for col in group_by]
+    params = []
+    for col, value in (filters or {}).items():
+        if isinstance(value, Between):
+            clauses.append(f"{_quote(col)} BETWEEN ? AND ?")
+            params.extend(value)
+        else:
+            values = list(value)
+            if not values:
+                clauses.append('FALSE')
+                continue
+            clauses.append(f"{_quote(col)} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    return where, params
+
+
+def _aggregate_duckdb(source, group_by, metrics, filters):
+    """DuckDB로 필터 → 그룹 → 집계 실행"""
+    connection = _get_connection()
+
+    if isinstance(source, str):
+        pattern = os.path.join(source, '**', '*.parquet').replace("'", "''")
+        relation = f"read_parquet('{pattern}', hive_partitioning = true, union_by_name = true)"
+    else:
+        connection.register('source_df', source)
+        relation = 'source_df'
+
+    select = [_quote(col) for col in group_by] + [
+        f"{_sql_aggregate(func, col)} AS {_quote(name)}" for name, (col, func) in metrics.items()
+    ]
+    where, params = _build_where(group_by, filters)
+    query = f"SELECT {', '.join(select)} FROM {relation} {where}"
+    if group_by:
+        keys = ', '.join(_quote(col) for col in group_by)
+        query += f" GROUP BY {keys} ORDER BY {keys}"
+
+    try:
+        return connection.execute(query, params).df()
+    finally:
+        if relation == 'source_df':
+            connection.unregister('source_df')
+
+
+def _aggregate_pandas(source, group_by, metrics, filters):
+    """pandas로 필터 → 그룹 → 집계 실행 (DuckDB 미설치 시)"""
+    if isinstance(source, str):
+        year_range = (filters or {}).get('year')
+        if not isinstance(year_range, Between):
+            year_range = None
+        columns = list(dict.fromkeys(
+            list(group_by) + [col for col, _ in metrics.values()] + list(filters or {})
+        ))
+        source = read_partitioned(source, year_range=year_range, columns=columns)
+        if source is None:
+            return pd.DataFrame(columns=list(group_by) + list(metrics))
+
+    mask = pd.Series(True, index=source.index)
+    for col, value in (filters or {}).items():
+        if isinstance(value, Between):
+            mask &= source[col].between(*value)
+        else:
+            mask &= source[col].isin(list(value))
+
+    selected = source.loc[mask]
+    if not group_by:
+        return pd.DataFrame({name: [selected[col].agg(func)] for name, (col, func) in metrics.items()})
+
+    return selected.groupby(list(group_by), sort=True).agg(**metrics).reset_index()
+
+
+def aggregate(source, group_by, metrics, filters=None):
+    """필터 → 그룹 → 집계 질의 실행
+
+    DuckDB가 설치되어 있으면 인프로세스 DuckDB(멀티스레드)로, 없으면 pandas로 실행합니다.
+
+    Parameters:
+    -----------
+    source : pandas.DataFrame or str
+        데이터프레임 또는 Parquet 파티션 캐시 루트 경로
+    group_by : list
+        그룹 컬럼 목록
+    metrics : dict
+        결과 컬럼명 → (원본 컬럼, 집계 함수) ('sum', 'mean', 'count', 'min', 'max', 'nunique')
+    filters : dict, optional
+        컬럼 → 값 목록(IN) 또는 Between(하한, 상한)(BETWEEN)
+
+    Returns:
+    --------
+    pandas.DataFrame
+        그룹 컬럼과 집계 결과 컬럼 (그룹 키 기준 정렬)
+    """
+    if has_duckdb():
+        return _aggregate_duckdb(source, list(group_by), metrics, filters)
+    return _aggregate_pandas(source, list(group_by), metrics, filters)
@@ -0,0 +1,106 @@
+# utils/ranking.py
+import numpy as np
+import pandas as pd
+
+from utils.fingerprint import fingerprint_cache
+
+# 국가 순위 기준 지표 후보 (앞에서부터 먼저 있는 컬럼 사용)
+PAPER_RANK_METRICS = ['Total_Papers', '논문 건수', 'total_papers']
+PATENT_RANK_METRICS = ['total_papers_granted', 'patent_count', 'total_papers']
+
+
+class CountryRanking:
+    """데이터셋 버전 하나의 지표별 국가 순위
+
+    국가명을 정렬해 두고 지표별 국가 합계를 배열로 보관합니다.
+    지표별 내림차순 순서(값이 같으면 국가명 순)를 생성할 때 한 번 계산해 두고, 상위 N개는 앞에서 잘라 씁니다.
+    """
+
+    def __init__(self, totals):
+        """
+        Parameters:
+        -----------
+        totals : dict
+            지표명 → 국가별 합계 Series (index: 국가)
+        """
+        countries = set()
+        for series in totals.values():
+            countries.update(series.index)
+        self.countries = np.array(sorted(countries, key=str), dtype=object)
+        self.metrics = list(totals)
+        self.values = {
+            metric: series.reindex(self.countries).fillna(-np.inf).to_numpy(dtype=float)
+            for metric, series in totals.items()
+        }
+        # 국가명이 정렬되어 있으므로 위치가 동점 처리 순서 (lexsort는 마지막 키가 1순위)
+        positions = np.arange(len(self.countries))
+        self.order = {metric: np.lexsort((positions, -values)) for metric, values in self.values.items()}
+
+    @classmethod
+    def from_frame(cls, df, country_col, metrics):
+        """데이터프레임에서 사용 가능한 지표를 골라 한 번의 groupby로 순위 생성 (없으면 None)"""
+        if df is None or country_col not in df.columns:
+            return None
+        metrics = [metric for metric in metrics if metric in df.columns]
+        if not metrics:
+            return None
+        sums = df.groupby(country_col)[metrics].sum()
+        return cls({metric: sums[metric] for metric in metrics})
+
+    def to_store_frame(self):
+        """디스크 캐시 저장용 데이터프레임 (국가 × 지표 합계)"""
+        return pd.DataFrame(self.values, index=pd.Index(self.countries, name='country'), columns=self.metrics)
+
+    @classmethod
+    def from_store_frame(cls, frame):
+        """to_store_frame의 역변환"""
+        return cls({metric: frame[metric] for metric in frame.columns})
+
+    @property
+    def metric(self):
+        """기본 순위 지표 (후보 중 첫 번째로 있는 컬럼)"""
+        return self.metrics[0] if self.metrics else None
+
+    def top(self, n, metric=None):
+        """상위 n개국 (내림차순, 동점은 국가명 순)"""
+        metric = metric or self.metric
+        if n <= 0:
+            return []
+        return self.countries[self.order[metric][:n]].tolist()
+
+    def rank(self, metric=None):
+        """전체 국가 순위 (1부터, 동점은 국가명 순)"""
+        metric = metric or self.metric
+        order = self.countries[self.order[metric]]
+        return pd.Series(np.arange(1, len(order) + 1), index=pd.Index(order, name='country'), name=metric)
+
+
+@fingerprint_cache
+def build_country_ranking(df, country_col, metrics):
+    """데이터셋 버전별 국가 순위 (지문이 있으면 캐시)"""
+    return CountryRanking.from_frame(df, country_col, list(metrics))
+
+
+def select_top_countries(paper_ranking, patent_ranking, n=20):
+    """논문 기준 상위 n개국 선정 (논문 순위가 없으면 특허 기준)
+
+    Parameters:
+    -----------
+    paper_ranking, patent_ranking : CountryRanking or None
+        논문/특허 국가 순위
+    n : int
+        선정할 국가 수
+
+    Returns:
+    --------
+    tuple
+        (국가 목록, 사용한 기준 설명)
+    """
+    paper_top = paper_ranking.top(n) if paper_ranking is not None else []
+    if paper_top:
+        return paper_top, f"논문 {paper_ranking.metric}"
+
+    patent_top = patent_ranking.top(n) if patent_ranking is not None else []
+    if patent_top:
+        return patent_top, f"특허 {patent_ranking.metric}"
+    return [], None
@@ -0,0 +1,118 @@
+# utils/schema.py
+from functools import lru_cache
+
+import pandas as pd
+
+# 논리 필드 → 물리 컬럼 판별 규칙 (소문자 컬럼명 기준, 컬럼 순서상 첫 번째 일치 사용)
+FIELD_RULES = {
+    'country': lambda name: name in ['country', 'nation', '국가'],
+    'year': lambda name: name in ['year', '연도'],
+    'papers': lambda name: 'total' in name and 'paper' in name,
+    'citations': lambda name: 'citation' in name,
+    'h_index': lambda name: 'h_index' in name or 'hindex' in name,
+    'top10': lambda name: 'top10' in name,
+    'triadic': lambda name: 'triadic' in name,
+    'family': lambda name: 'family' in name,
+    'collab': lambda name: 'collab' in name,
+    'mrnif': lambda name: 'mrnif' in name,
+    'tech': lambda name: any(k in name for k in ['label', 'tech', '기술'])
+}
+
+# 숫자형이어야 하는 필드
+NUMERIC_FIELDS = {'year', 'papers', 'citations', 'h_index', 'top10', 'triadic', 'family', 'collab', 'mrnif'}
+
+# 문자열 컬럼도 허용하는 숫자 필드 (엑셀의 '2015' 같은 문자열 연도, 사용할 때 coerce로 변환)
+COERCIBLE_FIELDS = {'year'}
+
+
+class FrameSchema:
+    """데이터프레임 하나의 논리 필드 → 물리 컬럼 매핑"""
+
+    def __init__(self, fields, invalid):
+        self.fields = fields
+        self.invalid = invalid
+
+    def get(self, field):
+        """필드에 대응하는 컬럼명 (없으면 None)"""
+        return self.fields.get(field)
+
+    def has(self, *fields):
+        """모든 필드가 매핑되어 있는지 여부"""
+        return all(field in self.fields for field in fields)
+
+    def missing(self, *fields):
+        """매핑되지 않은 필드 목록"""
+        return [field for field in fields if field not in self.fields]
+
+    @property
+    def key(self):
+        """캐시 키로 쓸 수 있는 정렬된 (필드, 컬럼) 튜플"""
+        return tuple(sorted(self.fields.items()))
+
+    def coerce(self, df, *fields):
+        """필드 컬럼 중 숫자형이 아닌 컬럼을 숫자로 변환한 데이터프레임 (변환할 수 없는 값은 NaN)
+
+        변환할 컬럼이 없으면 df를 그대로 반환합니다.
+        """
+        columns = [
+            self.fields[field] for field in fields
+            if field in self.fields and not pd.api.types.is_numeric_dtype(df[self.fields[field]])
+        ]
+        if not columns:
+            return df
+        return df.assign(**{col: pd.to_numeric(df[col], errors='coerce') for col in columns})
+
+    def __getitem__(self, field):
+        return self.fields[field]
+
+    def __repr__(self):
+        return f"FrameSchema({self.fields})"
+
+
+@lru_cache(maxsize=64)
+def _resolve(columns, dtypes):
+    """컬럼명/타입 튜플로 스키마 계산 (같은 데이터셋 버전은 한 번만 계산)"""
+    fields = {}
+    invalid = {}
+    for field, rule in FIELD_RULES.items():
+        for column, dtype in zip(columns, dtypes):
+            if not rule(str(column).lower()):
+                continue
+            if field in NUMERIC_FIELDS and not pd.api.types.is_numeric_dtype(dtype) and not (
+                field in COERCIBLE_FIELDS and (pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype))
+            ):
+                # 숫자가 아닌 컬럼은 건너뛰고 다음 후보를 찾음
+                invalid.setdefault(field, []).append(column)
+                continue
+            fields[field] = column
+            break
+    return FrameSchema(fields, invalid)
+
+
+def resolve_schema(df):
+    """데이터프레임의 논리 필드 매핑 계산
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        논문 또는 특허 데이터
+
+    Returns:
+    --------
+    FrameSchema or None
+        필드 매핑 (df가 None이면 None)
+    """
+    if df is None:
+        return None
+    return _resolve(tuple(df.columns), tuple(df.dtypes))
+
+
+def resolve_dataset_schema(paper_df, patent_df):
+    """논문/특허 데이터의 스키마를 함께 계산
+
+    Returns:
+    --------
+    dict
+        {'paper': FrameSchema, 'patent': FrameSchema}
+    """
+    return {'paper': resolve_schema(paper_df), 'patent': resolve_schema(patent_df)}
@@ -0,0 +1,236 @@
+# utils/science_linkage.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# 지문 계산을 프로세스 풀로 나누는 기준 (행 수)
+FINGERPRINT_CHUNK_SIZE = 200_000
+
+# 비어 있는 DOI/제목의 해시 값 (매칭에서 제외)
+EMPTY_HASH = np.uint64(0)
+
+_DOI_PREFIX = r'^(?:https?://)?(?:dx\.)?(?:doi\.org/)?(?:doi:\s*)?'
+
+
+def _hash_strings(values):
+    """정규화된 문자열 배열을 uint64 해시로 변환 (빈 문자열은 EMPTY_HASH)"""
+    values = values.fillna('')
+    hashes = pd.util.hash_array(values.to_numpy(dtype=object), categorize=False)
+    hashes[(values == '').to_numpy()] = EMPTY_HASH
+    return hashes
+
+
+def normalize_doi(dois):
+    """DOI 정규화 (소문자, URL/접두어 제거)"""
+    return (
+        dois.astype('string')
+        .str.strip()
+        .str.lower()
+        .str.replace(_DOI_PREFIX, '', regex=True)
+    )
+
+
+def normalize_title(titles):
+    """제목 지문용 정규화 (소문자, 문자/숫자 외 모든 문자 제거)"""
+    return (
+        titles.astype('string')
+        .str.lower()
+        .str.replace(r'[\W_]+', '', regex=True)
+    )
+
+
+def _fingerprint_chunk(dois, titles):
+    """DOI/제목 해시 계산 (프로세스 풀 작업 단위)"""
+    dois = pd.Series(dois, dtype=object)
+    titles = pd.Series(titles, dtype=object)
+    return _hash_strings(normalize_doi(dois)), _hash_strings(normalize_title(titles))
+
+
+def fingerprint_records(df, doi_col='doi', title_col='title', workers=None):
+    """레코드별 DOI 해시와 제목 지문 계산
+
+    행 수가 FINGERPRINT_CHUNK_SIZE를 넘으면 청크로 나누어 프로세스 풀에서 계산합니다.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        논문 레코드 또는 특허 비특허문헌(NPL) 참조 테이블
+    workers : int, optional
+        프로세스 수 (기본값: CPU 수, 1이면 현재 프로세스에서 계산)
+
+    Returns:
+    --------
+    tuple
+        (DOI 해시 배열, 제목 지문 배열)
+    """
+    n = len(df)
+    dois = df[doi_col].to_numpy(dtype=object) if doi_col in df.columns else np.full(n, None, dtype=object)
+    titles = df[title_col].to_numpy(dtype=object) if title_col in df.columns else np.full(n, None, dtype=object)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or n <= FINGERPRINT_CHUNK_SIZE:
+        return _fingerprint_chunk(dois, titles)
+
+    bounds = range(0, n, FINGERPRINT_CHUNK_SIZE)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            _fingerprint_chunk,
+            [dois[i:i + FINGERPRINT_CHUNK_SIZE] for i in bounds],
+            [titles[i:i + FINGERPRINT_CHUNK_SIZE] for i in bounds]
+        ))
+
+    return (
+        np.concatenate([doi_hash for doi_hash, _ in results]),
+        np.concatenate([title_hash for _, title_hash in results])
+    )
+
+
+def _build_index(hashes, offset=0):
+    """해시 → 레코드 위치 인덱스 (중복 해시는 첫 레코드 사용)"""
+    positions = pd.Series(np.arange(offset, offset + len(hashes)), index=hashes)
+    positions = positions[positions.index != EMPTY_HASH]
+    return positions[~positions.index.duplicated(keep='first')]
+
+
+def _lookup(index, hashes):
+    """해시 배열을 인덱스에서 찾아 레코드 위치 반환 (없으면 -1)"""
+    found = index.index.get_indexer(hashes)
+    return np.where(found >= 0, index.to_numpy()[found], -1)
+
+
+class ScienceLinkage:
+    """특허 NPL 참조 ↔ 논문 레코드 연계
+
+    논문 DOI 해시와 제목 지문 인덱스를 유지하고, 새 연도 데이터가 들어오면
+    변경된 부분만 다시 매칭합니다.
+    """
+
+    def __init__(self, papers, doi_col='doi', title_col='title', workers=None):
+        """
+        Parameters:
+        -----------
+        papers : pandas.DataFrame
+            논문 레코드 (DOI, 제목 컬럼 포함)
+        """
+        self.doi_col = doi_col
+        self.title_col = title_col
+        self.workers = workers
+
+        self.papers = papers.reset_index(drop=True)
+        self._doi_index, self._title_index = self._index_papers(self.papers, offset=0)
+
+        self.references = None
+        self._ref_hashes = (np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint64))
+        self.matches = np.empty(0, dtype=np.int64)
+
+    def _index_papers(self, papers, offset):
+        """논문 DOI/제목 인덱스 생성"""
+        doi_hash, title_hash = fingerprint_records(papers, self.doi_col, self.title_col, self.workers)
+        return _build_index(doi_hash, offset), _build_index(title_hash, offset)
+
+    @staticmethod
+    def _match(doi_index, title_index, doi_hash, title_hash):
+        """DOI 우선, 실패 시 제목 지문으로 매칭"""
+        matched = _lookup(doi_index, doi_hash)
+        pending = matched < 0
+        if pending.any():
+            matched[pending] = _lookup(title_index, title_hash[pending])
+        return matched
+
+    def add_papers(self, new_papers):
+        """새 논문 추가 후 미매칭 참조만 새 논문과 다시 매칭"""
+        offset = len(self.papers)
+        new_doi_index, new_title_index = self._index_papers(new_papers.reset_index(drop=True), offset)
+
+        self.papers = pd.concat([self.papers, new_papers], ignore_index=True)
+
+        # 기존 인덱스에 없는 해시만 추가 (기존 레코드 우선)
+        self._doi_index = pd.concat([
+            self._doi_index, new_doi_index[~new_doi_index.index.isin(self._doi_index.index)]
+        ])
+        self._title_index = pd.concat([
+            self._title_index, new_title_index[~new_title_index.index.isin(self._title_index.index)]
+        ])
+
+        unmatched = np.flatnonzero(self.matches < 0)
+        if len(unmatched):
+            doi_hash, title_hash = self._ref_hashes
+            self.matches[unmatched] = self._match(
+                new_doi_index, new_title_index, doi_hash[unmatched], title_hash[unmatched]
+            )
+
+    def add_references(self, new_references):
+        """새 NPL 참조를 전체 논문 인덱스와 매칭해 누적"""
+        new_references = new_references.reset_index(drop=True)
+        doi_hash, title_hash = fingerprint_records(new_references, self.doi_col, self.title_col, self.workers)
+        matched = self._match(self._doi_index, self._title_index, doi_hash, title_hash)
+
+        if self.references is None:
+            self.references = new_references
+        else:
+            self.references = pd.concat([self.references, new_references], ignore_index=True)
+
+        self._ref_hashes = (
+            np.concatenate([self._ref_hashes[0], doi_hash]),
+            np.concatenate([self._ref_hashes[1], title_hash])
+        )
+        self.matches = np.concatenate([self.matches, matched])
+
+    def update(self, new_papers=None, new_references=None):
+        """새 연도 데이터 반영 (논문 먼저 추가 후 새 참조 매칭)"""
+        if new_papers is not None and not new_papers.empty:
+            self.add_papers(new_papers)
+        if new_references is not None and not new_references.empty:
+            self.add_references(new_references)
+
+    def linked_references(self):
+        """매칭된 참조와 논문 위치 (paper_pos) 반환"""
+        if self.references is None:
+            return pd.DataFrame()
+        linked = self.references.copy()
+        linked['paper_pos'] = self.matches
+        return linked[linked['paper_pos'] >= 0]
+
+    def linkage_intensity(self, patents, tech_col='label_m', patent_id_col='patent_id',
+                          country_col='Country'):
+        """국가 × 기술별 과학 연계 강도 (특허당 논문 연계 참조 수)
+
+        Parameters:
+        -----------
+        patents : pandas.DataFrame
+            특허 테이블 (patent_id_col, country_col, tech_col 포함)
+
+        Returns:
+        --------
+        pandas.DataFrame
+            Country, tech_col별 patents, npl_references, linked_references, science_linkage
+        """
+        patent_keys = patents[[patent_id_col, country_col, tech_col]]
+
+        if self.references is None:
+            ref_counts = pd.DataFrame(columns=[patent_id_col, 'npl_references', 'linked_references'])
+        else:
+            refs = pd.DataFrame({
+                patent_id_col: self.references[patent_id_col].to_numpy(),
+                'linked': self.matches >= 0
+            })
+            ref_counts = refs.groupby(patent_id_col).agg(
+                npl_references=('linked', 'size'),
+                linked_references=('linked', 'sum')
+            ).reset_index()
+
+        merged = patent_keys.merge(ref_counts, on=patent_id_col, how='left')
+        merged[['npl_references', 'linked_references']] = (
+            merged[['npl_references', 'linked_references']].fillna(0).astype(np.int64)
+        )
+
+        result = merged.groupby([country_col, tech_col], sort=True).agg(
+            patents=(patent_id_col, 'size'),
+            npl_references=('npl_references', 'sum'),
+            linked_references=('linked_references', 'sum')
+        ).reset_index()
+        result['science_linkage'] = result['linked_references'] / result['patents']
+
+        return result.rename(columns={country_col: 'Country'})
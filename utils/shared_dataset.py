@@ -0,0 +1,165 @@
+# utils/shared_dataset.py
+# 여러 서버 프로세스가 공유하는 메모리 맵 데이터셋 (압축하지 않은 Arrow IPC 파일)
+#   한 프로세스가 데이터셋을 세대(generation) 번호를 붙인 Arrow 파일로 발행하면
+#   다른 프로세스는 파일을 메모리 맵으로 붙여 복사 없이 사용합니다 (OS 페이지 캐시 한 벌을 공유).
+#   CURRENT.json의 세대 번호가 바뀌면 각 프로세스가 다음 재실행에서 새 파일로 옮겨 갑니다.
+import json
+import os
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+from utils.partition_store import arrow_compatible
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# 현재 세대 정보 파일과 발행 잠금 파일
+CURRENT_FILE = 'CURRENT.json'
+LOCK_FILE = '.lock'
+
+# 발행한 원본 파일 정보의 Arrow 스키마 메타데이터 키 (붙인 데이터프레임의 attrs['source']로 복원)
+SOURCE_METADATA_KEY = b'ct_source'
+
+# 남겨 둘 세대 수 (이전 세대를 붙이고 있는 세션이 다음 재실행까지 사용)
+KEEP_GENERATIONS = 2
+
+
+def _generation_file(generation):
+    return f"dataset-{generation:06d}.arrow"
+
+
+def read_current(root):
+    """현재 세대 정보 (generation, file, source, columns - 발행 전이면 None)"""
+    try:
+        with open(os.path.join(root, CURRENT_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, write):
+    """임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽은 완성된 파일만 봄)"""
+    staging = f"{path}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    try:
+        write(staging)
+        os.replace(staging, path)
+    finally:
+        if os.path.exists(staging):
+            os.remove(staging)
+
+
+@contextmanager
+def publish_lock(root):
+    """발행 잠금 (여러 프로세스가 같은 세대를 동시에 발행하지 않도록, fcntl이 없으면 잠그지 않음)"""
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK_FILE), 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _to_table(df):
+    """데이터프레임을 한 덩어리 Arrow 테이블로 변환
+
+    숫자 컬럼은 NaN을 null로 바꾸지 않고 그대로 저장해 읽을 때 null 비트맵 처리(복사) 없이
+    numpy 배열로 붙일 수 있게 합니다. 타입이 섞인 object 컬럼은 문자열로 저장합니다.
+    """
+    import pyarrow as pa
+
+    df = arrow_compatible(df)
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if series.dtype.kind in 'iuf':
+            columns[str(col)] = pa.array(series.to_numpy(), from_pandas=False)
+        else:
+            columns[str(col)] = pa.Array.from_pandas(series)
+    return pa.table(columns).combine_chunks()
+
+
+def _to_frame(table):
+    """Arrow 테이블을 복사 없이 데이터프레임으로 변환 (숫자는 읽기 전용 numpy 배열, 문자열은 Arrow 기반)"""
+    import pyarrow as pa
+
+    data = {}
+    for name, column in zip(table.column_names, table.columns):
+        if (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)) and column.num_chunks == 1:
+            data[name] = column.chunk(0).to_numpy(zero_copy_only=True)
+        else:
+            data[name] = table.select([name]).to_pandas()[name]
+    return pd.DataFrame(data, copy=False)
+
+
+def publish(df, root, source):
+    """데이터프레임을 다음 세대 Arrow 파일로 발행하고 세대 번호 반환 (publish_lock 안에서 호출)
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        발행할 데이터
+    root : str
+        공유 데이터셋 디렉터리
+    source : dict
+        원본 파일 정보 (CURRENT.json에 저장되어 최신 여부 확인에 사용)
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    current = read_current(root)
+    generation = (current['generation'] if current else 0) + 1
+    table = _to_table(df)
+    # 데이터와 원본 정보(파일 지문 등)를 한 파일에 두어 세대를 바꾸는 도중에도 짝이 맞도록 함
+    table = table.replace_schema_metadata({SOURCE_METADATA_KEY: json.dumps(source, ensure_ascii=False)})
+
+    def write_table(path):
+        with pa.OSFile(path, 'wb') as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    def write_current(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generation': generation,
+                'file': _generation_file(generation),
+                'source': source,
+                'columns': table.column_names
+            }, f, ensure_ascii=False)
+
+    _write_atomic(os.path.join(root, _generation_file(generation)), write_table)
+    _write_atomic(os.path.join(root, CURRENT_FILE), write_current)
+
+    # 오래된 세대 삭제 (POSIX에서는 메모리 맵으로 붙어 있는 프로세스가 있어도 안전, 실패하면 다음 발행 때 다시 시도)
+    for name in os.listdir(root):
+        if name.startswith('dataset-') and name.endswith('.arrow'):
+            if int(name[len('dataset-'):-len('.arrow')]) <= generation - KEEP_GENERATIONS:
+                try:
+                    os.remove(os.path.join(root, name))
+                except OSError:
+                    pass
+    return generation
+
+
+@st.cache_resource(show_spinner=False, max_entries=KEEP_GENERATIONS)
+def attach(path, mtime=None):
+    """발행된 Arrow 파일을 메모리 맵으로 붙인 데이터프레임 (프로세스에서 세대마다 한 번)
+
+    mtime은 캐시 키로만 사용합니다 (캐시 디렉터리를 지운 뒤 같은 경로에 다시 발행한 파일 구분).
+    발행할 때의 원본 파일 정보는 attrs['source']에 넣습니다.
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    table = ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    df = _to_frame(table)
+    source = (table.schema.metadata or {}).get(SOURCE_METADATA_KEY)
+    df.attrs['source'] = json.loads(source) if source is not None else {}
+    return df
@@ -0,0 +1,236 @@
+# utils/synthetic.py
+import argparse
+import itertools
+import os
+import string
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.partition_store import write_partitioned
+
+# 구분 값 (preprocess_data와 동일)
+PAPER_KIND = '1. 논문'
+PATENT_KIND = '2. 특허'
+
+# 분류 레벨별 분류 수 (상위 → 하위)
+LEVEL_SIZES = {'2': 2, '9': 9, '38': 38, '82': 82}
+
+# 분류 레벨별 분류 ID 컬럼 (38대/82대는 대시보드 컬럼명 사용)
+LEVEL_COLUMNS = {'2': 'label_2', '9': 'label_9', '38': 'label_m', '82': 'label_s'}
+
+# 실제 데이터와 같은 국가 코드를 앞에 두고 나머지는 두 글자 코드로 채움
+BASE_COUNTRIES = ['US', 'CN', 'JP', 'KR', 'DE', 'FR', 'GB', 'IN', 'CA', 'IT',
+                  'AU', 'ES', 'BR', 'RU', 'NL', 'CH', 'SE', 'SG', 'TR', 'PL']
+
+# 엑셀 시트 최대 행 수 (헤더 포함)
+EXCEL_MAX_ROWS = 1_048_576
+
+
+def make_countries(n_countries):
+    """국가 코드 목록 생성"""
+    codes = list(BASE_COUNTRIES)
+    for a, b in itertools.product(string.ascii_uppercase, repeat=2):
+        if len(codes) >= n_countries:
+            break
+        if a + b not in codes:
+            codes.append(a + b)
+    return codes[:n_countries]
+
+
+def make_hierarchy(level_sizes=LEVEL_SIZES, seed=0):
+    """일관된 분류 트리 생성 (모든 상위 분류가 하위 분류를 하나 이상 가짐)
+
+    Returns:
+    --------
+    pandas.DataFrame
+        리프 분류마다 한 행, 레벨별 분류 ID 컬럼(LEVEL_COLUMNS, ID는 1부터)
+    """
+    rng = np.random.default_rng(seed)
+    levels = list(level_sizes)
+    sizes = [level_sizes[level] for level in levels]
+
+    # 하위 분류 → 상위 분류 배정 (앞쪽은 모든 상위 분류를 한 번씩, 나머지는 무작위)
+    parents = []
+    for parent_size, child_size in zip(sizes[:-1], sizes[1:]):
+        assignment = np.concatenate([np.arange(parent_size), rng.integers(0, parent_size, child_size - parent_size)])
+        parents.append(np.sort(assignment))
+
+    codes = {levels[-1]: np.arange(sizes[-1])}
+    for i in range(len(levels) - 2, -1, -1):
+        codes[levels[i]] = parents[i][codes[levels[i + 1]]]
+
+    return pd.DataFrame({LEVEL_COLUMNS.get(level, f"label_{level}"): codes[level] + 1 for level in levels})
+
+
+def _categorical(codes, categories):
+    """코드 배열로 범주형 컬럼 생성 (문자열 객체 배열보다 빠르고 작음)"""
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _base_frame(kind_code, countries, years, hierarchy, docs_per_cell, country_weight, rng):
+    """국가 × 연도 × 리프 분류 × 문서 행의 공통 컬럼"""
+    n_countries, n_years, n_leaves = len(countries), len(years), len(hierarchy)
+    n_cells = n_countries * n_years * n_leaves
+    n_rows = n_cells * docs_per_cell
+
+    cell = np.repeat(np.arange(n_cells), docs_per_cell)
+    country_code = cell // (n_years * n_leaves)
+    year_code = (cell // n_leaves) % n_years
+    leaf_code = cell % n_leaves
+
+    label_m = hierarchy['label_m'].to_numpy()[leaf_code]
+    label_s = hierarchy['label_s'].to_numpy()[leaf_code]
+    n_m = int(hierarchy['label_m'].max())
+    n_s = int(hierarchy['label_s'].max())
+
+    frame = pd.DataFrame({
+        '구분': _categorical(np.full(n_rows, kind_code, dtype=np.int8), [PAPER_KIND, PATENT_KIND]),
+        'Country': _categorical(country_code, countries),
+        'year': np.asarray(years, dtype=np.int16)[year_code],
+        'label_2': hierarchy['label_2'].to_numpy()[leaf_code].astype(np.int8),
+        'label_9': hierarchy['label_9'].to_numpy()[leaf_code].astype(np.int8),
+        'label_m': label_m,
+        'label_m_title': _categorical(label_m - 1, [f"기술분류_38_{i}" for i in range(1, n_m + 1)]),
+        'label_s': label_s,
+        'label_s_title': _categorical(label_s - 1, [f"기술분류_82_{i}" for i in range(1, n_s + 1)])
+    })
+
+    # 국가 규모(두꺼운 꼬리) × 분류별 편차
+    scale = country_weight[country_code] * rng.lognormal(0, 0.5, n_leaves)[leaf_code]
+    return frame, scale, n_rows
+
+
+def generate_synthetic_data(n_rows=None, countries=200, years=(2012, 2024), docs_per_cell=1,
+                            level_sizes=LEVEL_SIZES, seed=0):
+    """벡터화한 합성 논문/특허 데이터 생성 (preprocess_data가 기대하는 스키마)
+
+    Parameters:
+    -----------
+    n_rows : int, optional
+        목표 전체 행 수 (지정하면 docs_per_cell을 맞춰 계산, 실제 행 수는 셀 수의 배수)
+    countries : int or list
+        국가 수 또는 국가 코드 목록
+    years : tuple
+        (시작 연도, 끝 연도)
+    docs_per_cell : int
+        국가 × 연도 × 리프 분류 셀당 논문/특허 각각의 행 수
+    level_sizes : dict
+        분류 레벨별 분류 수
+    seed : int
+        난수 시드
+
+    Returns:
+    --------
+    pandas.DataFrame
+        논문 행과 특허 행을 합친 데이터 (인용 수는 파레토 분포의 두꺼운 꼬리)
+    """
+    rng = np.random.default_rng(seed)
+    if isinstance(countries, int):
+        countries = make_countries(countries)
+    years = list(range(years[0], years[1] + 1))
+    hierarchy = make_hierarchy(level_sizes, seed)
+
+    if n_rows is not None:
+        n_cells = len(countries) * len(years) * len(hierarchy)
+        docs_per_cell = max(1, int(np.ceil(n_rows / (2 * n_cells))))
+
+    # 국가 규모는 순위에 따라 멱법칙으로 감소
+    country_weight = 1.0 / np.arange(1, len(countries) + 1) ** 0.8
+
+    # 논문
+    paper, scale, n = _base_frame(0, countries, years, hierarchy, docs_per_cell, country_weight, rng)
+    papers = np.maximum(1, rng.poisson(200 * scale)).astype(np.int32)
+    citations = (papers * (rng.pareto(2.5, n) + 1) * 3).astype(np.int64)
+    paper['Total_Papers'] = papers
+    paper['Total_Citations'] = citations
+    paper['Avg_Citations'] = citations / papers
+    paper['H_Index'] = (np.sqrt(citations) * rng.uniform(0.8, 1.2, n)).astype(np.int32)
+    paper['Top10_Ratio(%)'] = np.clip(rng.normal(10, 4, n) * (citations / papers / 6) ** 0.3, 0, 100)
+    paper['Q1_Ratio(%)'] = rng.uniform(30, 60, n)
+    paper['Avg_mrnif'] = rng.lognormal(0, 0.3, n)
+    paper['Collaboration_Ratio(%)'] = rng.uniform(20, 80, n)
+
+    # 특허
+    patent, scale, n = _base_frame(1, countries, years, hierarchy, docs_per_cell, country_weight, rng)
+    patents = np.maximum(1, rng.poisson(120 * scale)).astype(np.int32)
+    citations = (patents * (rng.pareto(1.8, n) + 1) * 2).astype(np.int64)
+    patent['total_papers_granted'] = patents
+    patent['total_citations'] = citations
+    patent['avg_citations'] = citations / patents
+    patent['h_index'] = (np.sqrt(citations) * rng.uniform(0.7, 1.1, n)).astype(np.int32)
+    patent['triadic_ratio'] = rng.beta(2, 12, n)
+    patent['foreign_filing_intensity'] = rng.uniform(1, 8, n)
+    patent['patent_impact'] = rng.lognormal(0, 0.4, n)
+
+    return pd.concat([paper, patent], ignore_index=True)
+
+
+def to_level_data(df, level_sizes=LEVEL_SIZES):
+    """합성 논문 데이터를 레벨별 데이터 사전(patent_sidebar 형식)으로 변환
+
+    레벨마다 국가 × 분류 논문 수 합계를 metadata로 만들고,
+    리프 레벨에는 상위 분류 컬럼(utils.hierarchy.PARENT_COLUMNS)을 붙입니다.
+    """
+    paper = df[df['구분'] == PAPER_KIND]
+    levels = list(level_sizes)
+    data = {}
+    for level in levels:
+        label_col = LEVEL_COLUMNS[level]
+        parent_cols = [LEVEL_COLUMNS[parent] for parent in levels[:-1]] if level == levels[-1] else []
+        metadata = paper.groupby(['Country', label_col] + parent_cols, observed=True)['Total_Papers'].sum().reset_index()
+        metadata = metadata.rename(columns={'Country': 'country', label_col: 'label', 'Total_Papers': 'total_papers'})
+        metadata = metadata.rename(columns={LEVEL_COLUMNS[parent]: f"label_{parent}" for parent in levels[:-1]})
+        metadata['country'] = metadata['country'].astype(str)
+        data[level] = {'metadata': metadata}
+    return data
+
+
+def write_synthetic_dataset(df, file_path, excel=True):
+    """합성 데이터를 엑셀과 연도 파티션 컬럼 캐시로 저장
+
+    엑셀 행 수 제한을 넘으면 엑셀은 건너뛰고 컬럼 캐시만 저장합니다.
+    엑셀을 쓴 경우에만 캐시에 원본 정보를 기록하므로 load_data가 캐시를 바로 사용합니다.
+
+    Returns:
+    --------
+    dict
+        {'excel': 엑셀 경로 또는 None, 'cache': 캐시 루트 경로}
+    """
+    # data_loader는 streamlit을 불러오므로 저장할 때만 가져옴
+    from utils.data_loader import get_cache_root, get_source_info
+
+    excel_path = None
+    if excel and len(df) < EXCEL_MAX_ROWS:
+        df.to_excel(file_path, index=False)
+        excel_path = file_path
+
+    cache_root = get_cache_root(file_path)
+    source = get_source_info(file_path) if excel_path else None
+    write_partitioned(df, cache_root, source=source)
+    return {'excel': excel_path, 'cache': cache_root}
+
+
+def main(argv=None):
+    """합성 데이터 생성 CLI"""
+    parser = argparse.ArgumentParser(description="부하/벤치마크용 합성 논문/특허 데이터 생성")
+    parser.add_argument('--rows', type=int, default=100_000, help="목표 전체 행 수")
+    parser.add_argument('--countries', type=int, default=200, help="국가 수")
+    parser.add_argument('--years', type=int, nargs=2, default=(2012, 2024), metavar=('START', 'END'))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='synthetic.xlsx', help="엑셀 파일 경로 (캐시는 같은 위치의 .ct_cache)")
+    parser.add_argument('--no-excel', action='store_true', help="컬럼 캐시만 저장")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    df = generate_synthetic_data(args.rows, args.countries, tuple(args.years), seed=args.seed)
+    print(f"생성: {len(df):,}행 ({time.perf_counter() - start:.1f}초)")
+
+    start = time.perf_counter()
+    paths = write_synthetic_dataset(df, os.path.abspath(args.output), excel=not args.no_excel)
+    print(f"저장: 엑셀={paths['excel']}, 캐시={paths['cache']} ({time.perf_counter() - start:.1f}초)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+# utils/telemetry.py
+# 재실행 성능 기록 (JSONL, 크기 기준 순환)
+#   기록: CT_TELEMETRY_PATH=logs/telemetry.jsonl streamlit run main.py
+#   요약: python -m utils.telemetry logs/telemetry.jsonl --hours 24 --top 10
+import argparse
+import glob
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from logging.handlers import RotatingFileHandler
+
+import pandas as pd
+import streamlit as st
+
+from utils.instrumentation import STAGES, session_key
+from utils.memory import current_rss, peak_rss
+
+# 기록 파일 경로 환경 변수 (없으면 기록하지 않음)
+TELEMETRY_PATH_ENV = 'CT_TELEMETRY_PATH'
+
+# 파일 하나의 최대 크기와 보관할 이전 파일 수
+TELEMETRY_MAX_BYTES = 16 * 1024 * 1024
+TELEMETRY_BACKUPS = 5
+
+
+def telemetry_path():
+    """기록 파일 경로 (기록하지 않으면 None)"""
+    return os.environ.get(TELEMETRY_PATH_ENV) or None
+
+
+@st.cache_resource(show_spinner=False)
+def get_telemetry_logger(path, max_bytes=TELEMETRY_MAX_BYTES, backups=TELEMETRY_BACKUPS):
+    """프로세스 전체에서 공유하는 순환 파일 로거 (세션 스레드에서 동시에 써도 안전)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    logger = logging.getLogger(f"ct_level.telemetry.{os.path.abspath(path)}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    return logger
+
+
+def _cache_counts(events, kind):
+    """항목 종류별 캐시 적중/디스크 적중/미적중 횟수"""
+    cache = events.loc[events['kind'] == kind, 'cache'].dropna()
+    return {result: int((cache == result).sum()) for result in ('hit', 'disk', 'miss')}
+
+
+def build_record(trace, filter_state, tab, paper_df, patent_df):
+    """재실행 한 번의 기록
+
+    Parameters:
+    -----------
+    trace : utils.instrumentation.RerunTrace
+        재실행 계측 기록
+    filter_state : utils.filter_state.FilterState
+        적용한 필터 상태
+    tab : str
+        선택한 탭
+    paper_df, patent_df : pandas.DataFrame
+        필터링 후 논문/특허 데이터
+
+    Returns:
+    --------
+    dict
+        JSON으로 직렬화할 수 있는 기록
+    """
+    events = trace.frame()
+    stages = trace.stage_summary()['seconds']
+    sections = events[events['kind'] == 'section'].groupby('name')['seconds'].sum()
+    return {
+        'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'session': session_key(),
+        'elapsed_s': round(trace.elapsed, 4),
+        'filter': filter_state.key,
+        'level': filter_state.level,
+        'countries': len(filter_state.countries),
+        'categories': None if filter_state.all_categories else len(filter_state.categories),
+        'tab': tab,
+        'rows': {
+            'paper': 0 if paper_df is None else len(paper_df),
+            'patent': 0 if patent_df is None else len(patent_df)
+        },
+        'stages': {stage: round(float(stages[STAGES[stage]]), 4) for stage in STAGES},
+        'sections': {name: round(float(seconds), 4) for name, seconds in sections.items()},
+        'cache': {
+            'aggregate': _cache_counts(events, 'aggregate'),
+            'figure': _cache_counts(events, 'figure')
+        },
+        'rss_bytes': current_rss(),
+        'peak_rss_bytes': peak_rss()
+    }
+
+
+def record_rerun(trace, filter_state, tab, paper_df, patent_df):
+    """기록이 켜져 있으면 재실행 기록 한 줄 추가 (기록 실패는 대시보드에 영향을 주지 않음)"""
+    path = telemetry_path()
+    if path is None:
+        return
+    try:
+        record = build_record(trace, filter_state, tab, paper_df, patent_df)
+        get_telemetry_logger(path).info(json.dumps(record, ensure_ascii=False))
+    except (OSError, ValueError, TypeError) as e:
+        st.sidebar.warning(f"성능 기록을 남기지 못했습니다: {e}")
+
+
+def load_records(path, since=None):
+    """기록 파일과 순환된 이전 파일을 읽어 데이터프레임으로 반환 (since 이후 기록만)"""
+    records = []
+    for file in sorted(glob.glob(glob.escape(path) + '*')):
+        if file != path and not file[len(path):].lstrip('.').isdigit():
+            continue
+        with open(file, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    if not records:
+        return pd.DataFrame()
+
+    df = pd.json_normalize(records)
+    df['ts'] = pd.to_datetime(df['ts'], utc=True)
+    if since is not None:
+        df = df[df['ts'] >= since]
+    return df.sort_values('ts', ignore_index=True)
+
+
+def _latency_table(df, keys, top):
+    """키별 재실행 수와 지연 분위수 (p95가 큰 순서)"""
+    grouped = df.groupby(keys, dropna=False)['elapsed_s']
+    table = pd.DataFrame({
+        'reruns': grouped.size(),
+        'p50_ms': grouped.median() * 1000,
+        'p95_ms': grouped.quantile(0.95) * 1000,
+        'max_ms': grouped.max() * 1000
+    })
+    return table.sort_values('p95_ms', ascending=False).head(top).round(1)
+
+
+def summarize(df, top=10):
+    """느린 화면(탭 × 분류 레벨)과 필터 패턴, 단계별 시간, 캐시 적중률 요약 문자열"""
+    lines = [f"재실행 {len(df):,}건, 세션 {df['session'].nunique():,}개, "
+             f"{df['ts'].min():%Y-%m-%d %H:%M} ~ {df['ts'].max():%Y-%m-%d %H:%M} (UTC)"]
+
+    lines += ["", "[느린 화면: 탭 × 분류 레벨]", _latency_table(df, ['tab', 'level'], top).to_string()]
+
+    # 같은 필터 지문은 같은 필터이므로 대표 조건(레벨, 국가 수, 기술 분야 수)을 함께 표시
+    patterns = df.assign(categories=df['categories'].fillna(-1).astype(int).replace(-1, 'all'))
+    table = _latency_table(patterns, ['filter'], top)
+    conditions = patterns.drop_duplicates('filter').set_index('filter')[['level', 'countries', 'categories']]
+    table = conditions.join(table, how='right')
+    table.index = table.index.str[:12]
+    lines += ["", "[느린 필터 패턴]", table.to_string()]
+
+    stage_cols = [f"stages.{stage}" for stage in STAGES if f"stages.{stage}" in df.columns]
+    stages = (df[stage_cols].mean() * 1000).round(1)
+    stages.index = [STAGES[col.split('.', 1)[1]] for col in stage_cols]
+    lines += ["", "[단계별 평균 시간 (ms)]", stages.to_string()]
+
+    lines += ["", "[캐시 적중률]"]
+    for kind in ('aggregate', 'figure'):
+        hits, misses = df.get(f"cache.{kind}.hit"), df.get(f"cache.{kind}.miss")
+        if hits is None or misses is None:
+            continue
+        # 디스크 적중은 이 항목이 생기기 전 기록에는 없음
+        disk = df.get(f"cache.{kind}.disk", pd.Series(0, index=df.index)).fillna(0)
+        total = hits.sum() + disk.sum() + misses.sum()
+        if total == 0:
+            continue
+        lines.append(f"{kind}: {(hits.sum() + disk.sum()) / total:.1%} "
+                     f"(적중 {int(hits.sum()):,}, 디스크 적중 {int(disk.sum()):,}, 미적중 {int(misses.sum()):,})")
+
+    # RSS를 잴 수 없는 환경(Windows)의 기록은 값이 없음
+    peak = df['peak_rss_bytes'].max() if 'peak_rss_bytes' in df else None
+    if pd.notna(peak):
+        lines += ["", f"최대 RSS: {peak / 1e6:,.1f} MB"]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """성능 기록 요약 CLI"""
+    parser = argparse.ArgumentParser(description="재실행 성능 기록(JSONL) 요약")
+    parser.add_argument('path', nargs='?', default=telemetry_path(), help=f"기록 파일 (기본값: ${TELEMETRY_PATH_ENV})")
+    parser.add_argument('--hours', type=float, default=24, help="최근 몇 시간의 기록을 볼지 (0이면 전체)")
+    parser.add_argument('--top', type=int, default=10, help="표마다 보여줄 행 수")
+    args = parser.parse_args(argv)
+
+    if args.path is None:
+        parser.error(f"기록 파일 경로를 지정하거나 {TELEMETRY_PATH_ENV}를 설정하세요.")
+
+    since = datetime.now(timezone.utc) - timedelta(hours=args.hours) if args.hours else None
+    df = load_records(args.path, since)
+    if df.empty:
+        print("기록이 없습니다.")
+        return
+    print(summarize(df, args.top))
+
+
+if __name__ == '__main__':
+    main()
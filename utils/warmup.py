@@ -0,0 +1,115 @@
+# utils/warmup.py
+# 기본 화면 캐시 예열
+#   서버 시작 시: CT_WARMUP=1 streamlit run main.py
+#                 (Streamlit에는 서버 시작 훅이 없으므로 프로세스의 첫 재실행에서 백그라운드로 한 번 시작)
+#   CLI: python -m utils.warmup --workers 4
+#        (데이터 파일이 있는 디렉터리에서 실행, 컬럼 캐시와 집계 디스크 캐시를 채워 다음 서버 시작에 사용)
+import argparse
+import importlib.util
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+# 서버 시작 시 예열 여부 환경 변수 (1이면 예열)
+WARMUP_ENV = 'CT_WARMUP'
+
+# 예열 작업자 수와 스레드 이름 접두사
+WARMUP_WORKERS = min(4, os.cpu_count() or 1)
+WARMUP_THREAD_PREFIX = 'warmup'
+
+# 대시보드 스크립트
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+
+
+class _WarmupThreadFilter(logging.Filter):
+    """예열 스레드의 'missing ScriptRunContext' 경고 제외 (세션 없이 섹션을 실행하므로 화면 출력은 버려짐)"""
+
+    def filter(self, record):
+        return not record.threadName.startswith(WARMUP_THREAD_PREFIX)
+
+
+logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').addFilter(_WarmupThreadFilter())
+
+
+def _run_job(name, job):
+    """작업 하나를 실행하고 (이름, 시간, 오류) 반환 (예열 실패는 대시보드에 영향을 주지 않음)"""
+    start = time.perf_counter()
+    try:
+        job()
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {'job': name, 'seconds': time.perf_counter() - start, 'error': error}
+
+
+def run_warmup_jobs(jobs, workers=WARMUP_WORKERS):
+    """(이름, 인자 없는 함수) 작업들을 스레드 풀에서 실행하고 작업별 결과 반환
+
+    섹션은 스크립트 실행 컨텍스트 없이 실행되므로 Streamlit 출력은 버려지고
+    st.cache_data, 집계 디스크 캐시, figure 캐시만 채워집니다.
+    """
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=WARMUP_THREAD_PREFIX) as executor:
+        futures = [executor.submit(_run_job, name, job) for name, job in jobs]
+        return pd.DataFrame([future.result() for future in futures], columns=['job', 'seconds', 'error'])
+
+
+def warmup_enabled():
+    """서버 시작 시 예열 여부"""
+    return os.environ.get(WARMUP_ENV) == '1'
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup(_warm):
+    """프로세스에서 한 번만 백그라운드 스레드로 예열 시작 (상태 사전 반환)
+
+    _warm은 workers 키워드 인자를 받아 run_warmup_jobs 결과를 반환하는 함수입니다.
+    """
+    status = {'started': time.time(), 'finished': None, 'results': None, 'error': None}
+
+    def run():
+        try:
+            status['results'] = _warm(workers=WARMUP_WORKERS)
+        except Exception as e:
+            status['error'] = f"{type(e).__name__}: {e}"
+        status['finished'] = time.time()
+
+    threading.Thread(target=run, name=f"{WARMUP_THREAD_PREFIX}-main", daemon=True).start()
+    return status
+
+
+def load_app(app_path=APP_PATH):
+    """대시보드 스크립트를 모듈로 불러옴 (main()은 실행하지 않음)"""
+    spec = importlib.util.spec_from_file_location('dashboard_app', app_path)
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    return app
+
+
+def main(argv=None):
+    """기본 화면 캐시 예열 CLI"""
+    parser = argparse.ArgumentParser(description="기본 화면(상위 20개국, 기술 분야 전체) 캐시 예열")
+    parser.add_argument('--data', default=None, help="데이터 파일 (기본값: main.py 파일 목록의 첫 항목)")
+    parser.add_argument('--workers', type=int, default=WARMUP_WORKERS, help="예열 작업자 수")
+    args = parser.parse_args(argv)
+
+    # 스크립트 실행 컨텍스트 없이 streamlit 함수를 부를 때 나오는 경고는 숨김
+    from streamlit import config as st_config
+    from streamlit import logger as st_logger
+    st_config.get_config_options()
+    st_logger.set_log_level('error')
+
+    start = time.perf_counter()
+    results = load_app().warm_default_views(args.data, args.workers)
+    results['ms'] = (results.pop('seconds') * 1000).round(1)
+    print(results.to_string(index=False))
+    print(f"예열 완료: {time.perf_counter() - start:.1f}초")
+    return 1 if results['error'].notna().any() else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+# utils/workbook.py
+import hashlib
+import json
+import os
+import posixpath
+import re
+import uuid
+import zipfile
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+
+from utils.partition_store import arrow_compatible
+
+# xlsx 내부 XML 네임스페이스
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+SHARED_STRINGS_PART = 'xl/sharedStrings.xml'
+
+# 시트별 캐시 목록 파일
+MANIFEST_FILE = 'manifest.json'
+
+# 이어 붙일 데이터 시트 이름 정규식 환경 변수 (예: CT_DATA_SHEETS='20\d\d', 없으면 첫 시트만 사용)
+SHEET_PATTERN_ENV = 'CT_DATA_SHEETS'
+
+
+def _shared_strings(archive):
+    """공유 문자열 목록 (시트 셀이 번호로 참조, 없으면 빈 목록)"""
+    if SHARED_STRINGS_PART not in archive.namelist():
+        return []
+    strings = []
+    with archive.open(SHARED_STRINGS_PART) as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag == f"{MAIN_NS}si":
+                strings.append(''.join(t.text or '' for t in elem.iter(f"{MAIN_NS}t")))
+                elem.clear()
+    return strings
+
+
+def _strings_digest(strings):
+    h = hashlib.blake2b(digest_size=16)
+    for value in strings:
+        h.update(value.encode('utf-8'))
+        h.update(b'\x1f')
+    return h.hexdigest()
+
+
+def sheet_signatures(path):
+    """시트별 서명 (시트 순서대로 name, part, crc)과 공유 문자열 목록
+
+    xlsx는 zip 파일이므로 시트 XML의 CRC만 보면 내용을 읽지 않고 바뀐 시트를 알 수 있습니다.
+    """
+    with zipfile.ZipFile(path) as archive:
+        workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+        rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f"{PKG_REL_NS}Relationship")}
+
+        sheets = []
+        for sheet in workbook.iter(f"{MAIN_NS}sheet"):
+            target = targets[sheet.get(f"{REL_NS}id")]
+            part = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+            sheets.append({'name': sheet.get('name'), 'part': part, 'crc': archive.getinfo(part).CRC})
+        return sheets, _shared_strings(archive)
+
+
+def read_manifest(cache_dir):
+    """시트별 캐시 목록 (없으면 None)"""
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def data_sheet_pattern():
+    """이어 붙일 데이터 시트 이름 정규식 (설정하지 않았으면 None)"""
+    return os.environ.get(SHEET_PATTERN_ENV) or None
+
+
+def select_data_sheets(sheets, pattern=None):
+    """데이터로 읽을 시트 (pattern이 없으면 첫 시트만, 있으면 이름이 정규식과 전부 일치하는 시트)"""
+    if pattern is None:
+        return sheets[:1]
+    selected = [sheet for sheet in sheets if re.fullmatch(pattern, sheet['name'])]
+    if not selected:
+        raise ValueError(f"'{pattern}'과 일치하는 시트가 없습니다: {', '.join(sheet['name'] for sheet in sheets)}")
+    return selected
+
+
+def _reusable(manifest, strings):
+    """이전에 읽은 시트를 그대로 쓸 수 있는지 (공유 문자열은 뒤에 추가만 되었어야 번호가 유효)"""
+    if manifest is None:
+        return False
+    count = manifest['strings']['count']
+    return len(strings) >= count and _strings_digest(strings[:count]) == manifest['strings']['digest']
+
+
+def read_workbook(path, cache_dir, sheet_pattern=None):
+    """바뀐 시트만 다시 읽어 데이터 시트를 이어 붙인 데이터프레임 반환
+
+    시트마다 읽은 결과를 cache_dir에 Parquet으로 보관하고, 다음 호출에서 시트 XML의 CRC가 같으면
+    엑셀을 다시 파싱하지 않고 보관한 결과를 씁니다. 기본값은 pd.read_excel처럼 첫 시트만 읽고,
+    sheet_pattern을 지정하면 이름이 일치하는 시트 중 첫 시트와 컬럼이 같은 시트를 시트 순서대로
+    이어 붙입니다 (연도별 자료를 시트로 추가하는 경우, 백업 시트가 중복 집계되지 않도록 명시적으로 지정).
+
+    Parameters:
+    -----------
+    path : str
+        엑셀 파일 경로
+    cache_dir : str
+        시트별 캐시 디렉터리
+    sheet_pattern : str, optional
+        이어 붙일 데이터 시트 이름 정규식 (None이면 첫 시트만)
+
+    Returns:
+    --------
+    tuple
+        (데이터프레임, {'parsed': 다시 읽은 시트 목록, 'reused': 재사용한 시트 목록})
+    """
+    sheets, strings = sheet_signatures(path)
+    sheets = select_data_sheets(sheets, sheet_pattern)
+    manifest = read_manifest(cache_dir)
+    previous = {}
+    if _reusable(manifest, strings):
+        previous = {(entry['part'], entry['crc']): entry for entry in manifest['sheets']}
+
+    changed = [sheet for sheet in sheets if (sheet['part'], sheet['crc']) not in previous]
+    parsed = pd.read_excel(path, sheet_name=[sheet['name'] for sheet in changed]) if changed else {}
+
+    os.makedirs(cache_dir, exist_ok=True)
+    entries = []
+    for sheet in sheets:
+        entry = previous.get((sheet['part'], sheet['crc']))
+        if entry is None:
+            df = parsed[sheet['name']]
+            entry = dict(sheet, file=f"{uuid.uuid4().hex}.parquet", columns=[str(col) for col in df.columns])
+            arrow_compatible(df).to_parquet(os.path.join(cache_dir, entry['file']), index=False)
+        entries.append(dict(entry, name=sheet['name']))
+
+    frames = []
+    for entry in entries:
+        if entry['columns'] == entries[0]['columns']:
+            frames.append(pd.read_parquet(os.path.join(cache_dir, entry['file'])))
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    # 목록을 원자적으로 교체한 뒤 더 이상 참조하지 않는 시트 파일 삭제
+    staging = os.path.join(cache_dir, f"{MANIFEST_FILE}.tmp-{os.getpid()}")
+    with open(staging, 'w', encoding='utf-8') as f:
+        json.dump({'sheets': entries, 'strings': {'count': len(strings), 'digest': _strings_digest(strings)}},
+                  f, ensure_ascii=False)
+    os.replace(staging, os.path.join(cache_dir, MANIFEST_FILE))
+    used = {entry['file'] for entry in entries}
+    for name in os.listdir(cache_dir):
+        if name.endswith('.parquet') and name not in used:
+            os.remove(os.path.join(cache_dir, name))
+
+    return df, {
+        'parsed': [sheet['name'] for sheet in changed],
+        'reused': [sheet['name'] for sheet in sheets if sheet not in changed]
+    }